@@ -0,0 +1,115 @@
+"""Vectorized analytics over a year of usage.
+
+Run directly for the full-size case: a year of minute-resolution sessions
+for 1,000 users (about 8 sessions a day each, ~2.9M spans), timing each
+metric and comparing the heatmap against the per-session Python loop in
+src/core/rollups.py on a slice of the data.
+
+    python -m benchmarks.bench_analytics --users 1000 --days 365
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+
+FIRST_DAY = 20454  # 2026-01-01 as an epoch day
+
+
+def make_spans(users, days, sessions_per_day=8, seed=0):
+    """Synthetic sessions with start times and lengths in whole minutes"""
+    from src.analytics.spans import UsageSpans
+    rng = np.random.default_rng(seed)
+    count = users * days * sessions_per_day
+    user_id = np.repeat(np.arange(1, users + 1, dtype=np.int64), days * sessions_per_day)
+    day = np.tile(np.repeat(np.arange(days, dtype=np.int64), sessions_per_day), users) + FIRST_DAY
+    start = day * 86400 + rng.integers(6 * 60, 23 * 60, count) * 60
+    screen = rng.integers(5, 120, count) * 60
+    breaks = rng.integers(0, 20, count) * 60
+    return UsageSpans(user_id, start, start + screen + breaks, breaks)
+
+
+def _metrics(spans, days):
+    from src.analytics import metrics
+    return {
+        "heatmap": lambda: metrics.hour_of_week_heatmap(spans),
+        "daily_totals": lambda: metrics.daily_totals(spans, FIRST_DAY, days),
+        "break_ratio_distribution": lambda: metrics.break_ratio_distribution(spans),
+    }
+
+
+@benchmark("analytics.heatmap_100u_90d", number=5)
+def bench_heatmap(ctx):
+    return _metrics(make_spans(100, 90), 90)["heatmap"]
+
+
+@benchmark("analytics.daily_totals_100u_90d", number=5)
+def bench_daily_totals(ctx):
+    return _metrics(make_spans(100, 90), 90)["daily_totals"]
+
+
+@benchmark("analytics.streaks_rolling_100u_365d", number=20)
+def bench_streaks_rolling(ctx):
+    from src.analytics import metrics
+    daily = np.random.default_rng(0).integers(0, 6 * 3600, (100, 365))
+
+    def run():
+        metrics.streaks(daily <= 2 * 3600)
+        metrics.rolling_mean(daily, 7)
+    return run
+
+
+def _python_heatmap(spans, limit):
+    # Reference: the per-session loop the rollups use
+    from datetime import timedelta
+    from src.analytics.spans import EPOCH
+    from src.core.rollups import session_deltas
+    rows = [(int(u), EPOCH + timedelta(seconds=int(s)), int(e - s - b) // 60, int(b) // 60)
+            for u, s, e, b in zip(spans.user_id[:limit], spans.start[:limit], spans.end[:limit],
+                                  spans.break_seconds[:limit])]
+    return session_deltas(rows)
+
+
+def run(users, days):
+    from src.analytics import metrics
+
+    started = time.perf_counter()
+    spans = make_spans(users, days)
+    results = {"users": users, "days": days, "spans": len(spans),
+               "generate_s": round(time.perf_counter() - started, 3)}
+
+    timings = {}
+    for name, fn in _metrics(spans, days).items():
+        started = time.perf_counter()
+        output = fn()
+        timings[name] = time.perf_counter() - started
+        if name == "daily_totals":
+            daily = output[1]
+    started = time.perf_counter()
+    metrics.streaks(daily <= 2 * 3600)
+    timings["streaks"] = time.perf_counter() - started
+    started = time.perf_counter()
+    metrics.rolling_mean(daily, 7)
+    timings["rolling_mean_7d"] = time.perf_counter() - started
+    results.update({f"{k}_s": round(v, 4) for k, v in timings.items()})
+
+    limit = min(len(spans), 200000)
+    started = time.perf_counter()
+    _python_heatmap(spans, limit)
+    python_s = (time.perf_counter() - started) * len(spans) / limit
+    results["python_loop_heatmap_s_estimated"] = round(python_s, 2)
+    results["heatmap_speedup"] = round(python_s / timings["heatmap"], 1)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(json.dumps(run(args.users, args.days), indent=2))
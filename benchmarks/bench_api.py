@@ -0,0 +1,96 @@
+"""Load test for the local HTTP API on loopback.
+
+Generates a workload, starts the API server in-process and drives it with
+keep-alive clients, one thread each, reporting requests/sec and latency
+for full stats responses, conditional (304) stats requests and session
+listings.
+
+    python -m benchmarks.bench_api --scale 500 --clients 8 --requests 500
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCENARIOS = ("stats", "stats_conditional", "sessions")
+
+
+def client(port, scenario, requests, scale, seed, latencies, errors):
+    from benchmarks.workload import username
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    etags = {}
+    for _ in range(requests):
+        user = username(rng.randrange(scale))
+        path = f"/api/users/{user}/sessions?limit=50" if scenario == "sessions" else f"/api/users/{user}/stats?days=30"
+        headers = {}
+        if scenario == "stats_conditional" and user in etags:
+            headers["If-None-Match"] = etags[user]
+        started = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        if response.status not in (200, 304):
+            errors.append(response.status)
+        if response.getheader("ETag"):
+            etags[user] = response.getheader("ETag")
+    conn.close()
+
+
+def run_scenario(port, scenario, clients, requests, scale):
+    latencies, errors = [], []
+    # Conditional requests only pay off once clients hold ETags; warm them up first
+    if scenario == "stats_conditional":
+        requests *= 2
+    threads = [threading.Thread(target=client, args=(port, scenario, requests, min(scale, 50), i, latencies, errors))
+               for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def run(scale, clients, requests):
+    from benchmarks import workload
+    from src.api.server import ApiServer
+
+    workload.generate_users(scale)
+    workload.generate_sessions(scale, 20)
+    workload.generate_rollups()
+
+    server = ApiServer(port=0)
+    server.start_background()
+    port = server.server_address[1]
+    try:
+        return {s: run_scenario(port, s, clients, requests, scale) for s in SCENARIOS}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="requests per client")
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="momapp-api-"))
+    print(json.dumps(run(args.scale, args.clients, args.requests), indent=2))
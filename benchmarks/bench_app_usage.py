@@ -0,0 +1,80 @@
+"""Per-app usage sampling cost and how well a day compresses.
+
+Run directly to simulate a working day of 5 s samples with realistic focus
+switching and print how many span rows it produces, and how the time in
+those rows compares with the time an app actually had focus.
+
+    python -m benchmarks.bench_app_usage
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.harness import benchmark, measure
+
+SAMPLE_INTERVAL = 5
+DAY_HOURS = 10
+APPS = ["firefox", "code", "slack", "zoom", "terminal", "spotify"]
+
+
+def _pids():
+    # Real pids so name lookups exercise /proc
+    return [int(p) for p in os.listdir("/proc") if p.isdigit()][:len(APPS)] or [os.getpid()]
+
+
+@benchmark("app_usage.sample", number=20000)
+def bench_sample(ctx):
+    from src.core.app_usage import AppUsageSampler, FakeWindowProvider
+    pids = _pids()
+    provider = FakeWindowProvider(pids[0])
+    sampler = AppUsageSampler(provider, store=lambda spans: None)
+    rng = random.Random(3)
+
+    def step():
+        if rng.random() < 0.02:
+            provider.focus(rng.choice(pids))
+        sampler.sample()
+    return step
+
+
+def simulate_day(seed=0):
+    from src.core.app_usage import AppUsageSampler, FakeWindowProvider
+
+    rng = random.Random(seed)
+    written = []
+    pids = _pids()
+    provider = FakeWindowProvider()
+    sampler = AppUsageSampler(provider, store=written.extend, interval=SAMPLE_INTERVAL)
+    now = datetime(2026, 1, 5, 8, 0)
+    end = now + timedelta(hours=DAY_HOURS)
+    focused = 0
+    while now < end:
+        # Focus changes on average every couple of minutes
+        if provider.pid is None or rng.random() < SAMPLE_INTERVAL / 120:
+            provider.focus(rng.choice(pids) if rng.random() > 0.02 else None)
+        if sampler.sample(now) is not None:
+            focused += SAMPLE_INTERVAL
+        now += timedelta(seconds=SAMPLE_INTERVAL)
+    sampler.flush(close=True)
+    return sampler, written, focused
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.core.app_usage import FakeWindowProvider, AppUsageSampler
+
+    sampler, spans, focused = simulate_day()
+    tracked = sum((span["end_time"] - span["start_time"]).total_seconds() for span in spans)
+    provider = FakeWindowProvider(_pids()[0])
+    result = measure(AppUsageSampler(provider, store=lambda spans: None).sample, 20000, 5)
+    print(json.dumps({
+        "samples": sampler.samples,
+        "span_rows": len(spans),
+        "compression": round(sampler.samples / max(len(spans), 1), 1),
+        "focused_seconds": focused,
+        "tracked_seconds": tracked,
+        "name_cache_hit_rate": round(sampler.names.hits / max(sampler.names.hits + sampler.names.misses, 1), 4),
+        "sample_us": round(result["min"] * 1e6, 2),
+    }, indent=2))
@@ -0,0 +1,46 @@
+"""Authentication and user data benchmarks."""
+import itertools
+import random
+
+from benchmarks.harness import benchmark
+from benchmarks.workload import PASSWORD, username, make_user_content
+
+
+@benchmark("auth.authenticate_user", number=200)
+def bench_authenticate(ctx):
+    from src.core.auth import authenticate_user
+    rng = random.Random(1)
+    scale = ctx["scale"]
+    return lambda: authenticate_user(username(rng.randrange(scale)), PASSWORD)
+
+
+@benchmark("auth.authenticate_user_miss", number=200)
+def bench_authenticate_miss(ctx):
+    from src.core.auth import authenticate_user
+    return lambda: authenticate_user("no_such_user", PASSWORD)
+
+
+@benchmark("auth.register_user", number=100)
+def bench_register(ctx):
+    from src.core.auth import register_user
+    counter = itertools.count()
+    return lambda: register_user(f"bench_new_{next(counter)}", PASSWORD, age=30)
+
+
+@benchmark("auth.get_user_data", number=500)
+def bench_get_user_data(ctx):
+    from src.core.auth import get_user_data
+    rng = random.Random(2)
+    scale = ctx["scale"]
+    return lambda: get_user_data(username(rng.randrange(scale)))
+
+
+@benchmark("main.save_user_data", number=50)
+def bench_save_user_data(ctx):
+    from src.main import MainApplication
+    # Skip __init__ so no QApplication is created; only the save path is timed
+    app = MainApplication.__new__(MainApplication)
+    app.user_data = {"username": username(0)}
+    app.user_content = make_user_content(ctx["content_items"])
+    app.user_preferences = {"theme": "light", "notifications": True, "language": "en"}
+    return app.save_user_data
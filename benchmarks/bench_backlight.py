@@ -0,0 +1,66 @@
+"""Brightness ramps against a fake /sys/class/backlight tree.
+
+Ramps a fake 0-``--max`` backlight from 20% to 80% over ``--duration``
+seconds with a caller stepping at ``--hz``, on a simulated clock, and
+counts sysfs writes for a naive ramp (write every step) and for
+BacklightController (rate-limited, change-only). Also checks that both
+end on the target and that asking for the current level writes nothing.
+
+    python -m benchmarks.bench_backlight --hz 60 --duration 2
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def naive_ramp(backlight, start, target, steps):
+    for i in range(1, steps + 1):
+        backlight.write(round(start + (target - start) * i / steps))
+
+
+def run(max_brightness, hz, duration, min_interval):
+    from src.core.backlight import BacklightController, create_fake_sysfs, find_backlight
+
+    root = tempfile.mkdtemp(prefix="momapp-backlight-")
+    create_fake_sysfs(root, max_brightness=max_brightness, brightness=max_brightness // 5)
+    results = {}
+
+    naive = find_backlight(root)
+    steps = int(hz * duration)
+    started = time.perf_counter()
+    naive_ramp(naive, naive.read(), naive.to_raw(80), steps)
+    results["naive"] = {"writes": naive.writes, "seconds": round(time.perf_counter() - started, 4),
+                        "final": naive.read()}
+
+    naive.write(max_brightness // 5)
+    now = [0.0]
+    backlight = find_backlight(root)
+    controller = BacklightController(backlight, min_interval=min_interval, clock=lambda: now[0])
+    started = time.perf_counter()
+    controller.set_target(80, duration)
+    while controller.active:
+        now[0] += 1.0 / hz
+        controller.step()
+    results["controller"] = {"writes": backlight.writes, "seconds": round(time.perf_counter() - started, 4),
+                             "skipped_steps": controller.skipped, "final": backlight.read()}
+
+    before = backlight.writes
+    controller.set_target(80, duration)
+    results["unchanged_target_writes"] = backlight.writes - before
+    results["target"] = backlight.to_raw(80)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max", type=int, default=1000, help="max_brightness of the fake device")
+    parser.add_argument("--hz", type=float, default=60)
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--min-interval", type=float, default=0.1)
+    args = parser.parse_args()
+    print(json.dumps(run(args.max, args.hz, args.duration, args.min_interval), indent=2))
@@ -0,0 +1,106 @@
+"""Qt-thread cost of usage charts: rendering inline versus through ChartService.
+
+Builds a user with 90 days of sessions, then times (a) rendering each
+chart directly on the calling thread, which is what the UI would block
+on, and (b) ChartService.request(), which only computes the cache key and
+submits the job. The event loop keeps a 16 ms timer running throughout
+and the worst gap between its ticks shows whether the overlay would
+stutter.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_charts
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHARTS = ("daily", "heatmap", "break_ratio")
+
+
+def build_db(days=90, per_day=8, seed=0):
+    from src.core.database import engine, ensure_schema
+    from src.core.models import SessionRecord, User
+    from src.core.rollups import rebuild
+
+    ensure_schema()
+    rng = random.Random(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": 1, "username": "chart_user", "password_hash": "x", "age": 30}])
+        conn.execute(SessionRecord.__table__.insert(), [
+            {"user_id": 1, "start_time": today - timedelta(days=d) + timedelta(minutes=rng.randrange(7 * 60, 22 * 60)),
+             "screen_time": rng.randrange(5, 120), "break_time": rng.randrange(0, 20)}
+            for d in range(days) for _ in range(per_day)
+        ])
+        rebuild(conn)
+
+
+def run():
+    from PyQt5.QtCore import QCoreApplication, QElapsedTimer, QTimer
+    from src.analytics.charts import render_chart
+    from src.core.chart_service import ChartService, EPOCH_DAY
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    build_db()
+    first_day = (datetime.now().date() - EPOCH_DAY).days - 29
+
+    inline = {}
+    for chart in CHARTS:
+        started = time.perf_counter()
+        render_chart(1, chart, first_day, 30)
+        inline[chart] = round((time.perf_counter() - started) * 1000, 1)
+
+    service = ChartService()
+    # Let the worker finish starting up before timing requests
+    for future in service.warm():
+        future.result(timeout=60)
+    received = []
+    service.chartReady.connect(lambda chart, image, fmt: received.append((chart, len(image))))
+    service.chartFailed.connect(lambda chart, message: received.append((chart, message)))
+
+    ticks = QElapsedTimer()
+    ticks.start()
+    worst_gap = [0]
+
+    def tick():
+        worst_gap[0] = max(worst_gap[0], ticks.restart())
+    frame_timer = QTimer()
+    frame_timer.timeout.connect(tick)
+    frame_timer.start(16)
+
+    request_ms = {}
+    for chart in CHARTS:
+        started = time.perf_counter()
+        service.request(1, chart)
+        request_ms[chart] = round((time.perf_counter() - started) * 1000, 2)
+
+    started = time.perf_counter()
+    deadline = time.monotonic() + 60
+    while len(received) < len(CHARTS) and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    delivered_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    started = time.perf_counter()
+    service.request(1, "daily")
+    cached_ms = round((time.perf_counter() - started) * 1000, 2)
+    service.shutdown()
+
+    return {
+        "inline_render_ms": inline,
+        "service_request_ms": request_ms,
+        "service_all_delivered_ms": delivered_ms,
+        "cached_request_ms": cached_ms,
+        "worst_frame_gap_ms": worst_gap[0],
+        "results": received,
+    }
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp(prefix="momapp-charts-"))
+    print(json.dumps(run(), indent=2))
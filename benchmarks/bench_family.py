@@ -0,0 +1,112 @@
+"""Family dashboard: one aggregated query against a query per child.
+
+Creates ``--families`` families of one parent and ``--children`` child
+accounts, each child with ``--days`` days of sessions folded into the
+usage rollups, then times the parent's dashboard for a 30-day and a
+365-day range two ways: family.dashboard (one grouped query) and the
+per-child approach of calling rollups.screen_time for every figure.
+Reports milliseconds, SQL statements per dashboard and whether both
+give the same totals.
+
+    python -m benchmarks.bench_family --families 5 --children 20 --days 365
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(families, children, days, sessions_per_day):
+    from benchmarks.workload import generate_rollups, generate_sessions, generate_users
+    from sqlalchemy import select
+    from src.core import family
+    from src.core.database import engine, ensure_schema
+    from src.core.models import User
+
+    ensure_schema()
+    generate_users(families * (children + 1))
+    with engine.connect() as conn:
+        ids = list(conn.execute(select(User.id).order_by(User.id)).scalars())
+    generate_sessions(len(ids), days * sessions_per_day, days=days)
+    generate_rollups()
+    parents = []
+    for f in range(families):
+        parent, *kids = ids[f * (children + 1):(f + 1) * (children + 1)]
+        for child in kids:
+            family.link(parent, child)
+        parents.append(parent)
+    return parents
+
+
+def per_child_dashboard(parent_id, start, end, today):
+    from src.core import family, rollups
+    rows = []
+    for child in family.children(parent_id):
+        totals = rollups.screen_time(child["id"], start, end)
+        rows.append(dict(child,
+                         screen_seconds=totals["screen_seconds"],
+                         break_seconds=totals["break_seconds"],
+                         sessions=totals["sessions"],
+                         today_seconds=rollups.screen_time(child["id"], today, today)["screen_seconds"],
+                         week_seconds=rollups.screen_time(child["id"], today - timedelta(days=6), today)[
+                             "screen_seconds"]))
+    return rows
+
+
+def timed(func, parents, repeat, counter):
+    timings = []
+    statements = counter[0]
+    for _ in range(repeat):
+        for parent in parents:
+            started = time.perf_counter()
+            func(parent)
+            timings.append(time.perf_counter() - started)
+    statements = (counter[0] - statements) / (repeat * len(parents))
+    return {"median_ms": round(statistics.median(timings) * 1000, 2),
+            "p95_ms": round(sorted(timings)[int(len(timings) * 0.95) - 1] * 1000, 2),
+            "statements": statements}
+
+
+def run(families, children, days, sessions_per_day, repeat):
+    from sqlalchemy import event
+    from src.core import family
+    from src.core.database import engine
+
+    started = time.perf_counter()
+    parents = seed(families, children, days, sessions_per_day)
+    results = {"seed_seconds": round(time.perf_counter() - started, 1)}
+
+    counter = [0]
+    event.listen(engine, "before_cursor_execute", lambda *args: counter.__setitem__(0, counter[0] + 1))
+    keys = ("id", "screen_seconds", "break_seconds", "sessions", "today_seconds", "week_seconds")
+    today = date.today()
+    for range_days in (30, days):
+        start = today - timedelta(days=range_days - 1)
+        single = lambda parent: family.dashboard(parent, start, today, today=today)
+        per_child = lambda parent: per_child_dashboard(parent, start, today, today)
+        same = all([{k: row[k] for k in keys} for row in single(p)] ==
+                   [{k: row[k] for k in keys} for row in per_child(p)] for p in parents)
+        results[f"{range_days}_days"] = {
+            "aggregated": timed(single, parents, repeat, counter),
+            "per_child": timed(per_child, parents, repeat, counter),
+            "same_totals": same,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--families", type=int, default=5)
+    parser.add_argument("--children", type=int, default=20)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sessions-per-day", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="momapp-family-"))
+    print(json.dumps(run(args.families, args.children, args.days, args.sessions_per_day, args.repeat), indent=2))
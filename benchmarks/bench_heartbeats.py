@@ -0,0 +1,80 @@
+"""Heartbeat ingestion throughput.
+
+Run directly to replay heartbeats from many sources (one per second each,
+with occasional app switches) through the pipeline into a real SQLite
+store and report sustained heartbeats/sec on one core; the target is
+10,000/sec.
+
+    python -m benchmarks.bench_heartbeats --heartbeats 200000 --sources 50
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import benchmark
+
+TARGET_PER_SEC = 10000
+APPS = ["firefox", "code", "slack", "zoom", "terminal", "spotify", "steam", "discord"]
+
+
+def make_heartbeats(count, sources, seed=0):
+    """(app, timestamp, source) tuples, each source beating once a second"""
+    rng = random.Random(seed)
+    current = [rng.choice(APPS) for _ in range(sources)]
+    base = time.time() - count // sources
+    beats = []
+    for i in range(count):
+        source = i % sources
+        if rng.random() < 0.01:
+            current[source] = rng.choice(APPS)
+        beats.append((current[source], base + i // sources, f"source{source}"))
+    return beats
+
+
+@benchmark("heartbeats.ingest", number=50000)
+def bench_ingest(ctx):
+    from src.core.heartbeats import HeartbeatPipeline
+    pipeline = HeartbeatPipeline(lambda spans: None)
+    beats = iter(make_heartbeats(50000 * 6, 50) * 2)
+
+    def step():
+        app, ts, source = next(beats)
+        pipeline.heartbeat(app, ts, source)
+    return step
+
+
+def run(count, sources):
+    from src.core.database import ensure_schema
+    from src.core.app_usage import save_spans
+    from src.core.heartbeats import HeartbeatPipeline
+
+    ensure_schema()
+    beats = make_heartbeats(count, sources)
+    pipeline = HeartbeatPipeline(save_spans)
+    heartbeat = pipeline.heartbeat
+
+    started = time.perf_counter()
+    for app, ts, source in beats:
+        heartbeat(app, ts, source)
+    pipeline.flush(close=True)
+    elapsed = time.perf_counter() - started
+
+    stats = pipeline.stats()
+    stats["heartbeats_per_sec"] = count / elapsed
+    stats["meets_target"] = stats["heartbeats_per_sec"] >= TARGET_PER_SEC
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--heartbeats", type=int, default=200000)
+    parser.add_argument("--sources", type=int, default=50)
+    args = parser.parse_args()
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.chdir(tempfile.mkdtemp(prefix="momapp-heartbeats-"))
+    print(json.dumps(run(args.heartbeats, args.sources), indent=2))
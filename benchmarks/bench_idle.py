@@ -0,0 +1,49 @@
+"""Per-sample cost of idle detection.
+
+The detector samples every 5 s, so its CPU overhead is the per-sample cost
+divided by 5 s; run this module directly to print that percentage.
+
+    python -m benchmarks.bench_idle
+"""
+import json
+
+from benchmarks.harness import benchmark, measure
+
+SAMPLE_INTERVAL = 5.0
+
+
+def _interrupt_source():
+    from src.core.idle import InputInterruptSource
+    try:
+        return InputInterruptSource()
+    except OSError:
+        # No input IRQs (VM/CI): match every line for a worst-case parse cost
+        return InputInterruptSource(devices=("",))
+
+
+@benchmark("idle.sample_interrupts", number=2000)
+def bench_sample_interrupts(ctx):
+    from src.core.idle import IdleDetector
+    detector = IdleDetector(_interrupt_source())
+    return detector.sample
+
+
+@benchmark("idle.sample_fake", number=20000)
+def bench_sample_fake(ctx):
+    from src.core.idle import IdleDetector, FakeIdleSource
+    detector = IdleDetector(FakeIdleSource())
+    return detector.sample
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.core.idle import IdleDetector
+
+    result = measure(IdleDetector(_interrupt_source()).sample, 2000, 5)
+    print(json.dumps({
+        "sample_us": round(result["min"] * 1e6, 2),
+        "interval_s": SAMPLE_INTERVAL,
+        "cpu_overhead_percent": round(result["min"] / SAMPLE_INTERVAL * 100, 5),
+    }, indent=2))
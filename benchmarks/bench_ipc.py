@@ -0,0 +1,136 @@
+"""Microbenchmark of the daemon's binary IPC protocol against JSON lines.
+
+Three measurements, each for the binary framing in src/daemon/protocol.py
+and for newline-delimited JSON carrying the same messages:
+
+    codec     encode + decode of state events in memory, messages/sec
+    stream    state events pushed through a Unix socketpair to a reader
+              thread, messages/sec and bytes per message
+    rpc       request/reply round trips to a real DaemonServer over its
+              Unix socket, calls/sec and p50/p99 latency (binary only)
+
+    python -m benchmarks.bench_ipc --messages 200000 --calls 20000
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STATE = {"phase": "running", "main_ms": 3723000, "break_ms": 0, "total_break_ms": 905000,
+         "auto_paused": False, "at": 1760860800123}
+EVENT = {"event": "state", "state": STATE}
+
+
+class JsonCodec:
+    """The newline-delimited JSON framing the daemon used before"""
+
+    @staticmethod
+    def encode(message):
+        return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    class Decoder:
+        def __init__(self):
+            self.buffer = b""
+
+        def feed(self, data):
+            self.buffer += data
+            *lines, self.buffer = self.buffer.split(b"\n")
+            return [json.loads(line) for line in lines if line]
+
+
+class BinaryCodec:
+    from src.daemon.protocol import Decoder, encode
+    encode = staticmethod(encode)
+
+
+CODECS = {"binary": BinaryCodec, "json": JsonCodec}
+
+
+def bench_codec(codec, messages):
+    decoder = codec.Decoder()
+    started = time.perf_counter()
+    for i in range(messages):
+        event = {"event": "state", "state": dict(STATE, main_ms=i, at=STATE["at"] + i)}
+        decoder.feed(codec.encode(event))
+    elapsed = time.perf_counter() - started
+    return {"messages_per_sec": round(messages / elapsed), "bytes_per_message": len(codec.encode(EVENT))}
+
+
+def bench_stream(codec, messages, batch=64):
+    writer, reader = socket.socketpair()
+    received = [0]
+
+    def read():
+        decoder = codec.Decoder()
+        while received[0] < messages:
+            data = reader.recv(65536)
+            if not data:
+                break
+            received[0] += len(decoder.feed(data))
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    started = time.perf_counter()
+    for i in range(0, messages, batch):
+        # The daemon writes every event queued in one loop iteration together
+        writer.sendall(b"".join(codec.encode({"event": "state", "state": dict(STATE, main_ms=i + j)})
+                                for j in range(min(batch, messages - i))))
+    thread.join()
+    elapsed = time.perf_counter() - started
+    writer.close()
+    reader.close()
+    return {"messages_per_sec": round(received[0] / elapsed), "received": received[0]}
+
+
+def bench_rpc(calls):
+    from src.daemon.client import DaemonClient
+    from src.daemon.server import DaemonServer
+    from src.daemon.tracker import Tracker
+
+    path = os.path.join(tempfile.mkdtemp(prefix="momapp-ipc-"), "daemon.sock")
+    server = DaemonServer(Tracker(), path)
+    server.listen()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    client = DaemonClient(path)
+    latencies = []
+    try:
+        commands = ("start", "state", "pause", "state")
+        started = time.perf_counter()
+        for i in range(calls):
+            t0 = time.perf_counter()
+            client.call(commands[i % len(commands)])
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+    finally:
+        client.close()
+        server.stop()
+        thread.join()
+        server.close()
+    latencies.sort()
+    return {
+        "calls_per_sec": round(calls / elapsed),
+        "p50_us": round(latencies[len(latencies) // 2] * 1e6, 1),
+        "p99_us": round(latencies[int(len(latencies) * 0.99) - 1] * 1e6, 1),
+    }
+
+
+def run(messages, calls):
+    results = {name: {"codec": bench_codec(codec, messages), "stream": bench_stream(codec, messages)}
+               for name, codec in CODECS.items()}
+    results["binary"]["rpc"] = bench_rpc(calls)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.messages, args.calls), indent=2))
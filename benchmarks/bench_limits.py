@@ -0,0 +1,64 @@
+"""Per-tick cost of the screen-time limits engine.
+
+The app ticks the engine once a second; the rules are compiled into a
+plan that knows when the next threshold is due, so the cost of a tick
+should not grow with the number of rules. Run this module directly to
+compare tick cost for a handful of rules against a thousand.
+
+    python -m benchmarks.bench_limits
+"""
+import json
+
+from benchmarks.harness import benchmark, measure
+
+RULE_COUNTS = (4, 100, 1000)
+
+
+def _rules(count):
+    rules = [
+        {"type": "daily_cap", "minutes": 120, "warn_at": [0.75, 0.9]},
+        {"type": "bedtime", "start": "21:00", "end": "07:00"},
+        {"type": "break_cadence", "every_minutes": 45, "break_minutes": 15},
+    ]
+    rules += [{"type": "app_cap", "app": f"app{i}", "minutes": 30 + i % 90} for i in range(count - len(rules))]
+    return rules
+
+
+def _running_engine(count):
+    from src.core.limits import LimitsEngine
+    now = [1760860800.0]
+    engine = LimitsEngine(_rules(count), clock=lambda: now[0])
+    engine.update_state({"phase": "running", "main_ms": 0, "break_ms": 0, "total_break_ms": 0,
+                         "auto_paused": False, "at": int(now[0] * 1000)})
+    engine.set_app("app1")
+
+    def tick():
+        now[0] += 1.0
+        engine.tick()
+    return engine, tick
+
+
+@benchmark("limits.tick", number=20000)
+def bench_tick(ctx):
+    return _running_engine(RULE_COUNTS[0])[1]
+
+
+@benchmark("limits.tick_1000_rules", number=20000)
+def bench_tick_many(ctx):
+    return _running_engine(RULE_COUNTS[-1])[1]
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    results = {}
+    for count in RULE_COUNTS:
+        engine, tick = _running_engine(count)
+        result = measure(tick, 20000, 5)
+        results[count] = {
+            "tick_us": round(result["min"] * 1e6, 3),
+            "evaluations_per_1000_ticks": round(engine.evaluations / engine.ticks * 1000, 2),
+        }
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,134 @@
+"""Fan-out latency of the live timer WebSocket feed.
+
+Starts a LiveServer, connects ``--clients`` WebSocket clients to it over
+loopback from a separate process, publishes timer transitions from another
+thread (standing in for the Qt thread) and measures publish-to-receive
+latency across all clients. A second run adds clients that never read, to
+show that they are resynced or dropped instead of slowing the rest down.
+
+    python -m benchmarks.bench_live --clients 1000 --messages 50
+"""
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import socket
+import struct
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def connect(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write((f"GET /live HTTP/1.1\r\nHost: 127.0.0.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode("ascii"))
+    await writer.drain()
+    response = await reader.readuntil(b"\r\n\r\n")
+    if b" 101 " not in response.split(b"\r\n", 1)[0]:
+        raise ConnectionError(response.decode("latin-1"))
+    return reader, writer
+
+
+async def read_message(reader):
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    return json.loads(await reader.readexactly(length))
+
+
+async def consume(reader, last_seq, latencies):
+    while True:
+        message = await read_message(reader)
+        sent = message["state"].get("sent")
+        if sent is not None and message["type"] == "delta":
+            # perf_counter is CLOCK_MONOTONIC, comparable across processes
+            latencies.append(time.perf_counter() - sent)
+        if message["seq"] >= last_seq:
+            return
+
+
+async def clients_main(port, clients, stalled, last_seq, conn):
+    connections = [await connect(port) for _ in range(clients)]
+    stalled_connections = [await connect(port) for _ in range(stalled)]
+    for _, writer in stalled_connections:
+        # A phone on a bad network: tiny receive window, never reads
+        writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    for reader, _ in connections:
+        await read_message(reader)  # initial snapshot
+    conn.send("ready")
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(consume(reader, last_seq, latencies) for reader, _ in connections))
+    elapsed = time.perf_counter() - started
+    for _, writer in connections + stalled_connections:
+        writer.close()
+    conn.send((latencies, elapsed))
+
+
+def client_process(port, clients, stalled, last_seq, conn):
+    asyncio.run(clients_main(port, clients, stalled, last_seq, conn))
+
+
+def scenario(server, clients, messages, interval, stalled=0, payload_bytes=0):
+    last_seq = server.seq + messages
+    parent, child = multiprocessing.Pipe()
+    proc = multiprocessing.Process(target=client_process,
+                                   args=(server.port, clients, stalled, last_seq, child))
+    proc.start()
+    parent.recv()  # clients connected and holding their snapshots
+
+    resyncs_before = server.stats()["resyncs"]
+    for i in range(messages):
+        state = {"phase": "running" if i % 2 else "break", "main_ms": i * 1000,
+                 "at": int(time.time() * 1000), "sent": time.perf_counter()}
+        if payload_bytes:
+            state["pad"] = str(i).ljust(payload_bytes, "x")
+        server.publish(state)
+        time.sleep(interval)
+
+    latencies, elapsed = parent.recv()
+    resyncs = server.stats()["resyncs"] - resyncs_before
+    proc.join()
+    latencies.sort()
+    return {
+        "clients": clients,
+        "stalled_clients": stalled,
+        "messages": messages,
+        "deliveries": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "latency_p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "latency_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "latency_max_ms": round(latencies[-1] * 1000, 2),
+        "resyncs": resyncs,
+    }
+
+
+def run(clients, messages):
+    from src.api.live import LiveServer
+    server = LiveServer(port=0)
+    server.start_background()
+    try:
+        return {
+            "fanout": scenario(server, clients, messages, 0.2),
+            # Large messages so the stalled clients' socket buffers fill up quickly
+            "with_stalled_clients": scenario(server, clients // 10, 200, 0.05,
+                                             stalled=clients // 20, payload_bytes=65536),
+        }
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.clients, args.messages), indent=2))
@@ -0,0 +1,66 @@
+"""Count geometry updates during a scripted drag and resize of the Tk login card.
+
+Synthetic pointer events are fed straight into ModernMomApp's handlers at
+``--rate`` events per second while the Tk event loop keeps running, so the
+numbers show how many ``root.geometry()`` calls the motion coalescing lets
+through. Needs an X display (e.g. ``xvfb-run``).
+
+    python -m benchmarks.bench_login_drag --seconds 2 --rate 500
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def scripted_motion(app, start, move, stop, seconds, rate):
+    """Drive start/move/stop handlers along a diagonal pointer path."""
+    x0, y0 = app._win_x + app._win_width - 2, app._win_y + app._win_height - 2
+    start(SimpleNamespace(x_root=x0, y_root=y0, x=0, y=0))
+    app.geometry_updates = 0
+    events = 0
+    interval = 1.0 / rate
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        offset = events % 200
+        move(SimpleNamespace(x_root=x0 + offset, y_root=y0 + offset, x=0, y=0))
+        events += 1
+        app.root.update()
+        time.sleep(interval)
+    stop(SimpleNamespace(x_root=x0, y_root=y0, x=0, y=0))
+    elapsed = time.perf_counter() - started
+    return {
+        "motion_events": events,
+        "geometry_calls": app.geometry_updates,
+        "motion_events_per_sec": round(events / elapsed, 1),
+        "geometry_calls_per_sec": round(app.geometry_updates / elapsed, 1),
+    }
+
+
+def run(seconds, rate):
+    # Importing the login window pulls in auth, which opens app.db in the cwd
+    os.chdir(tempfile.mkdtemp(prefix="momapp-bench-"))
+    from src.core.login_window import ModernMomApp
+
+    app = ModernMomApp()
+    app.root.update()
+    results = {
+        "drag": scripted_motion(app, app.start_drag, app.drag_window, app.stop_drag, seconds, rate),
+        "resize": scripted_motion(app, app.start_resize, app.do_resize, app.stop_resize, seconds, rate),
+    }
+    app.root.destroy()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--rate", type=int, default=500, help="synthetic motion events per second")
+    args = parser.parse_args()
+    print(json.dumps(run(args.seconds, args.rate), indent=2))
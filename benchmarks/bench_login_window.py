@@ -0,0 +1,129 @@
+"""Compare startup time and peak RSS of the Qt and Tk login windows.
+
+Each variant runs in a fresh interpreter that builds and shows the login
+card, then reports elapsed wall time and ``ru_maxrss``. The ``tk`` variant
+mirrors the old startup path, where the Qt application already existed
+when the Tk login window was created, so both toolkits were loaded.
+
+Tk needs an X display. Without one the script runs under ``xvfb-run`` if
+it is installed; otherwise ``tk`` is reported as unavailable and only
+``tk_import`` runs. That variant imports login_window and starts a Tcl
+interpreter on top of the Qt application, a lower bound on what the old
+path paid for the second toolkit before it drew anything. ``baseline``
+only creates the QApplication, and every other variant also reports what
+it adds on top of that. The auth module both windows import is loaded in
+every variant, baseline included.
+
+Every run uses the same scratch directory, migrated once up front, so the
+real app.db is never touched and first-run migrations aren't counted.
+
+    python -m benchmarks.bench_login_window --repeat 5
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROLOGUE = """
+import resource, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+import resources_rc
+from src.utils.styles import load_stylesheet
+import src.core.auth  # both login windows import it; keep it out of the per-variant cost
+app = QApplication(sys.argv)
+app.setStyleSheet(load_stylesheet())
+"""
+
+VARIANTS = {
+    "baseline": "",
+    "qt": """
+from src.core.qt_login_window import QtLoginWindow
+window = QtLoginWindow()
+window.show()
+app.processEvents()
+""",
+    "tk": """
+from src.core.login_window import ModernMomApp
+window = ModernMomApp()
+window.root.update()
+""",
+    "tk_import": """
+import tkinter
+interpreter = tkinter.Tcl()
+from src.core import login_window
+""",
+}
+NEEDS_DISPLAY = {"tk"}
+
+EPILOGUE = """
+elapsed = time.perf_counter() - started
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def prepare_scratch():
+    """A scratch directory with an up-to-date app.db, so the auth import never touches the real one"""
+    directory = tempfile.mkdtemp(prefix="momapp-bench-")
+    code = f"import sys; sys.path.insert(0, {PROJECT_ROOT!r}); from src.core.database import ensure_schema; ensure_schema()"
+    subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True, check=True)
+    return directory
+
+
+def launcher():
+    """(command prefix, environment) for running the variants, and whether Tk can open a window"""
+    env = dict(os.environ)
+    if env.get("DISPLAY"):
+        return [], env, True
+    if shutil.which("xvfb-run"):
+        return ["xvfb-run", "-a"], env, True
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    return [], env, False
+
+
+def measure(variant, repeat, cwd, prefix, env):
+    code = PROLOGUE.format(root=PROJECT_ROOT) + VARIANTS[variant] + EPILOGUE
+    times, rss = [], []
+    for _ in range(repeat):
+        result = subprocess.run(prefix + [sys.executable, "-c", code], cwd=cwd, env=env,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            return {"error": lines[-1] if lines else f"exit status {result.returncode}"}
+        elapsed, maxrss = result.stdout.split()[-2:]
+        times.append(float(elapsed))
+        rss.append(int(maxrss))
+    return {
+        "startup_ms_median": round(statistics.median(times) * 1000, 1),
+        "max_rss_kb_median": int(statistics.median(rss)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scratch = prepare_scratch()
+    prefix, env, has_display = launcher()
+    results = {}
+    for variant in VARIANTS:
+        if variant in NEEDS_DISPLAY and not has_display:
+            results[variant] = {"error": "no X display and xvfb-run isn't installed"}
+            continue
+        results[variant] = measure(variant, args.repeat, scratch, prefix, env)
+    baseline = results["baseline"]
+    for variant, result in results.items():
+        if variant != "baseline" and "error" not in result and "error" not in baseline:
+            result["over_baseline"] = {
+                "startup_ms": round(result["startup_ms_median"] - baseline["startup_ms_median"], 1),
+                "max_rss_kb": result["max_rss_kb_median"] - baseline["max_rss_kb_median"],
+            }
+    print(json.dumps(results, indent=2))
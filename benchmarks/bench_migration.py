@@ -0,0 +1,92 @@
+"""Benchmark upgrading a large legacy users table to the current schema.
+
+Builds a pre-migration ``users`` table (id, username, password_hash) with
+``--rows`` rows, runs ``alembic upgrade head`` against it and, at the same
+time, keeps a writer inserting into the database the way the running app
+would. The writer's worst-case wait shows how long the upgrade holds the
+SQLite write lock in one go.
+
+    python -m benchmarks.bench_migration --rows 1000000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def build_legacy_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE users (id INTEGER NOT NULL, username VARCHAR(50) NOT NULL, "
+        "password_hash VARCHAR(128) NOT NULL, PRIMARY KEY (id), UNIQUE (username))"
+    )
+    conn.execute("CREATE TABLE probe (id INTEGER PRIMARY KEY, ts REAL)")
+    conn.executemany(
+        "INSERT INTO users (id, username, password_hash) VALUES (?, ?, ?)",
+        ((i, f"user{i}", "0" * 64) for i in range(1, rows + 1)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def probe_writer(path, stop, latencies):
+    conn = sqlite3.connect(path, timeout=60)
+    while not stop.is_set():
+        started = time.perf_counter()
+        conn.execute("INSERT INTO probe (ts) VALUES (?)", (time.time(),))
+        conn.commit()
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.005)
+    conn.close()
+
+
+def run(rows):
+    workdir = tempfile.mkdtemp(prefix="momapp-migration-")
+    db_path = os.path.join(workdir, "app.db")
+
+    started = time.perf_counter()
+    build_legacy_db(db_path, rows)
+    build_seconds = time.perf_counter() - started
+
+    cfg = Config(ALEMBIC_INI)
+    cfg.set_main_option("sqlalchemy.url", f"sqlite:///{db_path}")
+
+    stop = threading.Event()
+    latencies = []
+    writer = threading.Thread(target=probe_writer, args=(db_path, stop, latencies))
+    writer.start()
+
+    started = time.perf_counter()
+    command.upgrade(cfg, "head")
+    upgrade_seconds = time.perf_counter() - started
+
+    stop.set()
+    writer.join()
+
+    latencies.sort()
+    return {
+        "rows": rows,
+        "build_seconds": round(build_seconds, 3),
+        "upgrade_seconds": round(upgrade_seconds, 3),
+        "writer_commits": len(latencies),
+        "writer_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2) if latencies else None,
+        "writer_max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows), indent=2))
@@ -0,0 +1,59 @@
+"""TimeOverlay per-tick cost on the offscreen Qt platform."""
+import os
+
+from benchmarks.harness import benchmark
+
+_app = None
+
+
+def _qt_app():
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    _app = QApplication.instance() or QApplication([])
+    return _app
+
+
+def _overlay():
+    _qt_app()
+    from src.core.overlays import TimeOverlay
+    from src.utils.fonts import get_font
+    shared_settings = {"color": "white", "opacity": 1.0, "font": get_font()}
+    return TimeOverlay(shared_settings)
+
+
+@benchmark("overlay.main_tick", number=1000)
+def bench_main_tick(ctx):
+    overlay = _overlay()
+    overlay.startTimer()
+
+    def tick():
+        overlay.updateMainDisplay()
+        _app.processEvents()
+    return tick
+
+
+@benchmark("overlay.break_tick", number=1000)
+def bench_break_tick(ctx):
+    overlay = _overlay()
+    overlay.startTimer()
+    overlay.pauseTimer()
+
+    def tick():
+        overlay.updateBreakDisplay()
+        _app.processEvents()
+    return tick
+
+
+@benchmark("overlay.paint_tick", number=1000)
+def bench_paint_tick(ctx):
+    overlay = _overlay()
+    texts = [f"00:{m:02d}:{sec:02d}" for m in range(60) for sec in range(60)]
+    state = {"i": 0}
+
+    def tick():
+        state["i"] = (state["i"] + 1) % len(texts)
+        overlay.clockFace.setText(texts[state["i"]])
+        # Deliver the queued partial repaint
+        _app.processEvents()
+    return tick
@@ -0,0 +1,90 @@
+"""Recommendation table: equivalence with the old if/else chain, and batch cost.
+
+Checks that the table in resources/recommendations.json gives exactly the
+answers SettingsWindow.calculate_recommendations and calculate_break_time
+gave when they were hard-coded, for every age 0-120 and every session
+length up to 10 hours, through both lookup() and evaluate(). Then times
+``--ages`` ages evaluated one call at a time against one evaluate().
+
+    python -m benchmarks.bench_recommendations --ages 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def legacy_recommendations(user_age):
+    # SettingsWindow.calculate_recommendations before the table
+    if user_age < 2:
+        return 0, 50
+    elif user_age <= 5:
+        return 1, 60
+    elif user_age <= 17:
+        return 2, 70
+    else:
+        return 4, 80
+
+
+def legacy_break_time(total_time):
+    return (total_time // 60) * 15
+
+
+def check(table):
+    ages = list(range(121))
+    batch = table.evaluate(ages)
+    mismatches = []
+    for i, age in enumerate(ages):
+        expected = legacy_recommendations(age)
+        recommendation = table.lookup(age)
+        if (recommendation.screen_hours, recommendation.brightness) != expected:
+            mismatches.append({"age": age, "lookup": [recommendation.screen_hours, recommendation.brightness]})
+        if (batch["screen_hours"][i], batch["brightness"][i]) != expected:
+            mismatches.append({"age": age, "evaluate": [int(batch["screen_hours"][i]), int(batch["brightness"][i])]})
+        for total in range(0, 601, 7):
+            if recommendation.break_minutes(total) != legacy_break_time(total):
+                mismatches.append({"age": age, "total_minutes": total})
+    return mismatches
+
+
+def run(count):
+    from src.core.recommendations import RecommendationTable
+
+    started = time.perf_counter()
+    table = RecommendationTable.load()
+    load_ms = (time.perf_counter() - started) * 1000
+    mismatches = check(table)
+
+    rng = random.Random(0)
+    ages = [rng.randrange(0, 90) for _ in range(count)]
+    started = time.perf_counter()
+    legacy = [legacy_recommendations(age) for age in ages]
+    legacy_s = time.perf_counter() - started
+    started = time.perf_counter()
+    single = [table.lookup(age) for age in ages[:count // 10]]
+    lookup_s = (time.perf_counter() - started) * 10
+    started = time.perf_counter()
+    batch = table.evaluate(ages)
+    batch_s = time.perf_counter() - started
+    same = [(int(h), int(b)) for h, b in zip(batch["screen_hours"], batch["brightness"])] == legacy
+    return {
+        "version": table.version,
+        "load_ms": round(load_ms, 2),
+        "equivalent": not mismatches and same and len(single) == count // 10,
+        "mismatches": mismatches[:10],
+        "ages": count,
+        "legacy_if_else_ms": round(legacy_s * 1000, 1),
+        "lookup_per_call_ms": round(lookup_s * 1000, 1),
+        "evaluate_batch_ms": round(batch_s * 1000, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ages", type=int, default=1000000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.ages), indent=2))
@@ -0,0 +1,53 @@
+"""Usage report queries: rollup tables versus scanning sessions."""
+import random
+from datetime import date, datetime, timedelta
+
+from benchmarks.harness import benchmark
+
+
+@benchmark("rollups.screen_time_week", number=500)
+def bench_screen_time_week(ctx):
+    from src.core.rollups import screen_time
+    rng = random.Random(4)
+    scale = ctx["scale"]
+    today = date.today()
+    return lambda: screen_time(rng.randrange(1, scale + 1), today - timedelta(days=6), today)
+
+
+@benchmark("rollups.scan_sessions_week", number=500)
+def bench_scan_sessions_week(ctx):
+    # What screen_time() replaces: aggregate the raw session rows
+    from sqlalchemy import func, select
+    from src.core.database import engine
+    from src.core.models import SessionRecord
+    rng = random.Random(4)
+    scale = ctx["scale"]
+    since = datetime.now() - timedelta(days=7)
+
+    def scan():
+        query = (select(func.sum(SessionRecord.screen_time), func.sum(SessionRecord.break_time), func.count())
+                 .where(SessionRecord.user_id == rng.randrange(1, scale + 1), SessionRecord.start_time >= since))
+        with engine.connect() as conn:
+            return conn.execute(query).one()
+    return scan
+
+
+@benchmark("rollups.hour_of_week", number=200)
+def bench_hour_of_week(ctx):
+    from src.core.rollups import hour_of_week_usage
+    rng = random.Random(5)
+    scale = ctx["scale"]
+    return lambda: hour_of_week_usage(rng.randrange(1, scale + 1))
+
+
+@benchmark("rollups.record_session", number=200)
+def bench_record_session(ctx):
+    from src.core.database import engine
+    from src.core.rollups import record_session
+    rng = random.Random(6)
+    scale = ctx["scale"]
+
+    def record():
+        with engine.begin() as conn:
+            record_session(conn, rng.randrange(1, scale + 1), datetime.now(), rng.randrange(5, 240), 10)
+    return record
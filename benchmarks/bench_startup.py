@@ -0,0 +1,30 @@
+"""Cold start cost, measured in fresh interpreter processes."""
+import os
+import subprocess
+import sys
+
+from benchmarks.harness import benchmark
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _python(code):
+    pythonpath = os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=pythonpath, QT_QPA_PLATFORM="offscreen")
+    return lambda: subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+@benchmark("startup.interpreter", number=1, repeat=5)
+def bench_interpreter(ctx):
+    return _python("pass")
+
+
+@benchmark("startup.import_auth", number=1, repeat=5)
+def bench_import_auth(ctx):
+    return _python("import src.core.auth")
+
+
+@benchmark("startup.import_main", number=1, repeat=5)
+def bench_import_main(ctx):
+    return _python("import src.main")
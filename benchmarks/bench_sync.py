@@ -0,0 +1,137 @@
+"""Sync 100k records between two replicas through the local sync server.
+
+Device A starts with ``--records`` records (mostly sessions, plus
+preferences and content sections for ``--users`` people) and pushes them
+to the server; device B starts empty and pulls everything. Then both
+devices edit ``--edit`` records, with ``--conflicts`` of them edited on
+both, and sync again. Reports time, round trips and bytes on the wire
+(compressed and uncompressed) for each phase, and checks that the two
+devices end up identical.
+
+    python -m benchmarks.bench_sync --records 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class CountingTransport:
+    """Wraps a transport to add up uncompressed sizes as well"""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.raw_bytes = 0
+
+    def exchange(self, data):
+        reply = self.transport.exchange(data)
+        self.raw_bytes += len(zlib.decompress(data)) + len(zlib.decompress(reply))
+        return reply
+
+
+def seed(replica, records, users, rng):
+    from benchmarks.workload import username
+    from src.sync import sources
+
+    per_user = 20
+    documents = users * per_user
+    sessions = []
+    start = datetime(2025, 1, 1, 8)
+    for i in range(records - documents):
+        user = username(i % users)
+        when = start + timedelta(minutes=37 * (i // users))
+        sessions.append((sources.session_key(user, when),
+                         {"screen_time": rng.randrange(5, 90), "break_time": rng.randrange(0, 20)}))
+    replica.put_many(sources.SESSIONS, sessions)
+    for u in range(users):
+        user = username(u)
+        replica.put_many(sources.PREFERENCES, [(f"{user}/pref_{p}", rng.random()) for p in range(per_user // 2)])
+        replica.put_many(sources.USER_CONTENT, [(f"{user}/section_{p}", [f"item {n}" for n in range(rng.randrange(5))])
+                                                for p in range(per_user // 2)])
+
+
+def timed_sync(replica, transport, page):
+    counting = CountingTransport(transport)
+    started = time.perf_counter()
+    stats = replica.sync(counting, limit=page)
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["raw_bytes"] = counting.raw_bytes
+    stats["compression"] = round(counting.raw_bytes / max(stats["bytes_sent"] + stats["bytes_received"], 1), 1)
+    return stats
+
+
+def edit(replica, keys, rng):
+    from src.sync import sources
+    by_collection = {}
+    for collection, key in keys:
+        by_collection.setdefault(collection, []).append(key)
+    for collection, names in by_collection.items():
+        if collection == sources.SESSIONS:
+            replica.put_many(collection, [(k, {"screen_time": rng.randrange(5, 90), "break_time": 0}) for k in names])
+        else:
+            replica.put_many(collection, [(k, rng.random()) for k in names])
+
+
+def snapshot(replica):
+    from sqlalchemy import select
+    from src.core.models import SyncRecord
+    with replica.engine.connect() as conn:
+        return set(conn.execute(select(SyncRecord.collection, SyncRecord.key, SyncRecord.hlc,
+                                       SyncRecord.deleted, SyncRecord.payload)).all())
+
+
+def run(records, users, edits, conflicts, page):
+    from sqlalchemy import select
+    from src.core.models import SyncRecord
+    from src.sync.replica import Replica
+    from src.sync.server import HttpTransport, SyncServer, open_store
+
+    rng = random.Random(7)
+    server = SyncServer(Replica(open_store("server.db"), node_id="server"), port=0)
+    server.start_background()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    device_a = Replica(open_store("device_a.db"), node_id="device-a")
+    device_b = Replica(open_store("device_b.db"), node_id="device-b")
+    transport_a, transport_b = HttpTransport(url), HttpTransport(url)
+    results = {}
+    try:
+        seed(device_a, records, users, rng)
+        results["initial_push"] = timed_sync(device_a, transport_a, page)
+        results["initial_pull"] = timed_sync(device_b, transport_b, page)
+        results["noop"] = timed_sync(device_b, transport_b, page)
+
+        with device_a.engine.connect() as conn:
+            keys = conn.execute(select(SyncRecord.collection, SyncRecord.key)).all()
+        shared = rng.sample(keys, edits * 2 - conflicts)
+        edit(device_a, shared[:edits], rng)
+        edit(device_b, shared[edits - conflicts:], rng)
+        results["edits_push_a"] = timed_sync(device_a, transport_a, page)
+        results["edits_sync_b"] = timed_sync(device_b, transport_b, page)
+        results["edits_pull_a"] = timed_sync(device_a, transport_a, page)
+        results["converged"] = snapshot(device_a) == snapshot(device_b)
+        results["records"] = len(keys)
+    finally:
+        transport_a.close()
+        transport_b.close()
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--edit", type=int, default=1000, help="records edited on each device after the first sync")
+    parser.add_argument("--conflicts", type=int, default=200, help="edited records that both devices changed")
+    parser.add_argument("--page", type=int, default=5000, help="records per exchange")
+    args = parser.parse_args()
+    os.chdir(tempfile.mkdtemp(prefix="momapp-sync-"))
+    print(json.dumps(run(args.records, args.users, args.edit, args.conflicts, args.page), indent=2))
@@ -0,0 +1,148 @@
+"""Check that a SIGKILLed session is recovered from the timer journal.
+
+Each round starts a child process that runs a real TimeOverlay on the
+offscreen Qt platform with a TimerJournal attached, as the app does. The
+child starts the timer, pauses into breaks and resumes at random, and
+drives the overlay's tick handlers every few milliseconds instead of once
+a second. It reports every checkpoint once append() has returned. The
+parent SIGKILLs the child at a random point, which sometimes lands in the
+middle of a compaction.
+
+Recovery then follows MainApplication.restore_timer_session. The last
+checkpoint is read from the journal and restored into a fresh TimeOverlay
+with restoreSnapshot(). The check passes when the restored screen and
+break totals are no older than the last checkpoint the child reported,
+and the journal keeps recording once it is reattached.
+
+    python -m benchmarks.check_kill_recover --rounds 30
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from src.core.timer_journal import TimerJournal
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ReportingJournal(TimerJournal):
+    """Prints each checkpoint after it has been written and flushed"""
+
+    def append(self, state):
+        super().append(state)
+        print(state['main_ms'], state['total_break_ms'], flush=True)
+
+
+def _overlay():
+    from src.core.overlays import TimeOverlay
+    from src.utils.fonts import get_font
+    return TimeOverlay({"color": "white", "opacity": 1.0, "font": get_font()})
+
+
+def child(path, compact_after, seed):
+    """Run the timer until killed"""
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication([])
+    rng = random.Random(seed)
+    overlay = _overlay()
+    overlay.attachJournal(ReportingJournal(path, compact_after=compact_after))
+    overlay.startTimer()
+
+    def step():
+        if rng.random() < 0.05:
+            if overlay.running:
+                overlay.pauseTimer()
+            else:
+                overlay.endBreak()
+        # What the overlay's one-second timers do, run much faster
+        overlay.updateMainDisplay()
+        overlay.updateBreakDisplay()
+
+    timer = QTimer()
+    timer.timeout.connect(step)
+    timer.start(2)
+    app.exec_()
+
+
+def run_round(directory, rng, compact_after):
+    path = os.path.join(directory, "user_timer.journal")
+    if os.path.exists(path):
+        os.remove(path)
+    proc = subprocess.Popen([sys.executable, "-m", "benchmarks.check_kill_recover", "--child", path,
+                             "--compact-after", str(compact_after), "--seed", str(rng.randrange(1 << 30))],
+                            cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True)
+    acknowledged = (0, 0)
+    for _ in range(rng.randrange(1, compact_after * 4)):
+        line = proc.stdout.readline()
+        if not line:
+            break
+        acknowledged = tuple(int(field) for field in line.split())
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+    proc.stdout.close()
+
+    # The same steps as MainApplication.restore_timer_session
+    journal = TimerJournal(path)
+    state = journal.recover() or {}
+    overlay = _overlay()
+    overlay.restoreSnapshot(state)
+    overlay.attachJournal(journal)
+    restored = (overlay.mainElapsedTime, overlay.totalBreakTime)
+    overlay.mainTimer.stop()
+    overlay.breakTimer.stop()
+    overlay.updateMainElapsedTime()
+    overlay.checkpoint()
+    resumed = journal.recover()
+    journal.close()
+    overlay.close()
+    return {
+        "acknowledged": acknowledged,
+        "restored": restored,
+        "ok": (restored[0] >= acknowledged[0] and restored[1] >= acknowledged[1]
+               and resumed is not None and resumed['main_ms'] >= restored[0]
+               and resumed['total_break_ms'] == restored[1]),
+    }
+
+
+def run(rounds, compact_after, seed=0):
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(seed)
+    directory = tempfile.mkdtemp(prefix="momapp-kill-")
+    results = [run_round(directory, rng, compact_after) for _ in range(rounds)]
+    app.processEvents()
+    failures = [result for result in results if not result["ok"]]
+    return {
+        "rounds": rounds,
+        "failures": len(failures),
+        "examples": failures[:5],
+        "breaks_recovered": sum(1 for result in results if result["restored"][1]),
+        "max_main_lead_ms": max(result["restored"][0] - result["acknowledged"][0] for result in results),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--compact-after", type=int, default=100,
+                        help="small values make kills during compaction likely")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--child", metavar="JOURNAL", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.compact_after, args.seed)
+    result = run(args.rounds, args.compact_after, args.seed)
+    print(json.dumps(result, indent=2))
+    sys.exit(1 if result["failures"] else 0)
@@ -0,0 +1,65 @@
+"""Minimal timeit-based benchmark registry and result comparison."""
+import statistics
+import sys
+import timeit
+from collections import OrderedDict
+
+# name -> (function, number, repeat); filled in by the @benchmark decorator
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(name, number=100, repeat=5):
+    """Register ``fn(ctx)`` as a benchmark; it returns the callable to time.
+
+    The outer function does the setup and receives the shared workload
+    context, the returned zero-argument callable is what gets timed.
+    """
+    def decorator(fn):
+        BENCHMARKS[name] = (fn, number, repeat)
+        return fn
+    return decorator
+
+
+def measure(func, number, repeat):
+    """Time ``func`` and return per-call statistics in seconds."""
+    timer = timeit.Timer(func)
+    runs = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    mean = statistics.mean(runs)
+    return {
+        "mean": mean,
+        "min": min(runs),
+        "stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "ops_per_sec": 1.0 / mean if mean > 0 else None,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(ctx, only=None):
+    results = OrderedDict()
+    for name, (fn, number, repeat) in BENCHMARKS.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        try:
+            results[name] = measure(fn(ctx), number, repeat)
+        except ImportError as e:
+            # A missing optional dependency shouldn't sink the whole run; anything else is a broken benchmark
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+    return results
+
+
+def compare(current, baseline, threshold=0.10):
+    """Return ``(name, baseline_min, current_min, ratio, regressed)`` rows.
+
+    ``min`` is compared rather than ``mean`` because it is the least noisy
+    estimate of the true cost on a shared machine.
+    """
+    rows = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["min"]
+        after = result["min"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio, ratio > 1.0 + threshold))
+    return rows
@@ -0,0 +1,113 @@
+"""Run the benchmark suite against a synthetic workload.
+
+    python -m benchmarks.run --scale 1000 --output bench.json
+    python -m benchmarks.run --compare bench.json --only auth overlay
+
+Each run happens in a scratch directory, so the real ``app.db`` and
+``data/`` are never touched. Results are written as JSON keyed by
+benchmark name; ``--compare`` reports the ratio against an earlier file
+and exits non-zero when anything regressed past ``--threshold``.
+
+Heavier one-off scenarios (e.g. ``benchmarks.bench_migration``) are
+standalone scripts with their own command line.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.harness import run_benchmarks, compare
+
+BENCH_MODULES = [
+    "benchmarks.bench_auth",
+    "benchmarks.bench_overlay",
+    "benchmarks.bench_startup",
+    "benchmarks.bench_idle",
+    "benchmarks.bench_app_usage",
+    "benchmarks.bench_heartbeats",
+    "benchmarks.bench_rollups",
+    "benchmarks.bench_analytics",
+    "benchmarks.bench_limits",
+]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_modules():
+    for name in BENCH_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MomApp benchmark suite")
+    parser.add_argument("--scale", type=int, default=1000, help="synthetic users to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="benchmark name prefixes to run")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a benchmark counts as regressed")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="momapp-bench-")
+    os.chdir(workdir)
+    load_modules()
+
+    from benchmarks import workload
+    started = time.perf_counter()
+    ctx = workload.generate(args.scale, args.seed)
+    ctx["workload_seconds"] = time.perf_counter() - started
+
+    results = run_benchmarks(ctx, args.only)
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "workload": ctx,
+        },
+        "results": results,
+    }
+
+    for name, result in results.items():
+        print(f"{name:32s} {result['min'] * 1e6:12.1f} us  ({result['ops_per_sec']:,.0f} ops/s)")
+
+    if args.output:
+        path = args.output if os.path.isabs(args.output) else os.path.join(PROJECT_ROOT, args.output)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        path = args.compare if os.path.isabs(args.compare) else os.path.join(PROJECT_ROOT, args.compare)
+        with open(path) as f:
+            baseline = json.load(f)["results"]
+        regressed = False
+        print()
+        for name, before, after, ratio, slower in compare(results, baseline, args.threshold):
+            flag = "  REGRESSED" if slower else ""
+            print(f"{name:32s} {before * 1e6:10.1f} -> {after * 1e6:10.1f} us  x{ratio:.2f}{flag}")
+            regressed = regressed or slower
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Synthetic workload generator for the benchmark suite.
+
+Everything is written relative to the current directory (``app.db``,
+``data/`` and ``logs/``), the same layout the app uses, so callers should
+``chdir`` into a scratch directory first.
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+PASSWORD = "bench-password"
+
+
+def username(i):
+    return f"bench_user_{i}"
+
+
+def generate_users(count):
+    from src.core.provision import provision_users
+    records = ({"username": username(i), "password": PASSWORD, "age": 6 + i % 60} for i in range(count))
+    return provision_users(records, workers=0)["rows"]
+
+
+def generate_sessions(user_count, sessions_per_user, days=30, seed=0):
+    """Insert SessionRecord rows spread over the last ``days`` days."""
+    from src.core.database import engine
+    from src.core.models import SessionRecord, User
+
+    rng = random.Random(seed)
+    now = datetime.now()
+    with engine.begin() as conn:
+        ids = [row[0] for row in conn.execute(User.__table__.select().with_only_columns(User.__table__.c.id))]
+        rows = []
+        for user_id in ids[:user_count]:
+            for _ in range(sessions_per_user):
+                rows.append({
+                    "user_id": user_id,
+                    "start_time": now - timedelta(minutes=rng.randrange(days * 24 * 60)),
+                    "screen_time": rng.randrange(5, 240),
+                    "break_time": rng.randrange(0, 45),
+                })
+        if rows:
+            conn.execute(SessionRecord.__table__.insert(), rows)
+    return len(rows)
+
+
+def generate_rollups():
+    """Fill the usage rollups from the generated sessions."""
+    from src.core.database import engine
+    from src.core.rollups import rebuild
+    with engine.begin() as conn:
+        return rebuild(conn)
+
+
+def generate_activity_log(user_count, entries, seed=0):
+    """Append login lines in the format written by MainApplication.log_user_activity."""
+    rng = random.Random(seed)
+    os.makedirs("logs", exist_ok=True)
+    start = datetime.now() - timedelta(days=30)
+    with open("logs/user_activity.log", "a") as log_file:
+        for i in range(entries):
+            stamp = (start + timedelta(seconds=i * 37)).strftime("%Y-%m-%d %H:%M:%S")
+            log_file.write(f"[{stamp}] User {username(rng.randrange(user_count))} logged in successfully\n")
+    return entries
+
+
+def make_user_content(items, seed=0):
+    rng = random.Random(seed)
+    return {
+        "tasks": [{"title": f"Task {i}", "done": rng.random() < 0.5} for i in range(items)],
+        "calendar_events": [{"title": f"Event {i}", "day": i % 28 + 1} for i in range(items)],
+        "notes": [f"Note {i} " + "x" * rng.randrange(10, 200) for i in range(items)],
+        "family_members": [f"member_{i}" for i in range(items // 10)],
+    }
+
+
+def generate_user_content(user_count, items, seed=0):
+    """Write data/<username>_data.json files like MainApplication.save_user_data."""
+    os.makedirs("data", exist_ok=True)
+    for i in range(user_count):
+        with open(f"data/{username(i)}_data.json", "w") as f:
+            json.dump(make_user_content(items, seed + i), f, indent=2)
+    return user_count
+
+
+def generate(scale=1000, seed=0):
+    """Build a workload with ``scale`` users and return a summary context."""
+    sessions_per_user = 20
+    content_users = min(scale, 100)
+    return {
+        "scale": scale,
+        "users": generate_users(scale),
+        "sessions": generate_sessions(scale, sessions_per_user, seed=seed),
+        "rollup_sessions": generate_rollups(),
+        "log_entries": generate_activity_log(scale, scale * 10, seed=seed),
+        "content_users": generate_user_content(content_users, 50, seed=seed),
+        "content_items": 50,
+    }
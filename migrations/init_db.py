@@ -18,39 +18,24 @@ try:
         print(f"Removed existing database: {db_path}")
     
     # Import after removing the database
-    from src.core.database import engine, Session
-    from src.core.models import Base, User
+    from src.core.database import ensure_schema
+    from src.core.provision import provision_users
     
     print("Creating new database...")
     
-    # Create all tables
-    Base.metadata.create_all(engine)
+    # Create all tables at the current schema revision
+    ensure_schema()
     
     print("Database created successfully!")
     
-    # Create a test user
-    session = Session()
-    try:
-        # Create test user
-        user = User(username="test", age=25)
-        user.set_password("test123")
-        session.add(user)
-        
-        # Create another demo user
-        demo_user = User(username="demo", age=30)
-        demo_user.set_password("demo123")
-        session.add(demo_user)
-        
-        session.commit()
-        print("\nTest users created:")
-        print("1. username='test', password='test123'")
-        print("2. username='demo', password='demo123'")
-        
-    except Exception as e:
-        print(f"Error creating test users: {e}")
-        session.rollback()
-    finally:
-        session.close()
+    # Create the test and demo users
+    provision_users([
+        {"username": "test", "password": "test123", "age": 25},
+        {"username": "demo", "password": "demo123", "age": 30},
+    ], workers=0)
+    print("\nTest users created:")
+    print("1. username='test', password='test123'")
+    print("2. username='demo', password='demo123'")
         
 except Exception as e:
     print(f"Error resetting database: {e}")
@@ -0,0 +1,101 @@
+"""initial schema
+
+Creates the users and sessions tables from src/core/models.py. Databases
+created before migrations existed already have a bare users table; for those
+the missing columns are added in place and created_at is backfilled in
+small committed chunks so the app can keep writing during the upgrade.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows updated per committed backfill transaction
+BACKFILL_CHUNK = 20000
+# Pause between chunks so a waiting writer's busy handler can grab the lock
+BACKFILL_PAUSE = 0.02
+
+
+def _backfill_created_at() -> None:
+    """Stamp legacy rows with the migration time, one short transaction per chunk."""
+    bind = op.get_bind()
+    bounds = bind.execute(sa.text("SELECT MIN(id), MAX(id) FROM users")).first()
+    if bounds is None or bounds[0] is None:
+        return
+
+    low, high = bounds
+    with op.get_context().autocommit_block():
+        for start in range(low, high + 1, BACKFILL_CHUNK):
+            bind.execute(
+                sa.text(
+                    "UPDATE users SET created_at = CURRENT_TIMESTAMP "
+                    "WHERE id >= :start AND id < :stop AND created_at IS NULL"
+                ),
+                {"start": start, "stop": start + BACKFILL_CHUNK},
+            )
+            time.sleep(BACKFILL_PAUSE)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if 'users' not in tables:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=50), nullable=False),
+            sa.Column('password_hash', sa.String(length=128), nullable=False),
+            sa.Column('age', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('last_login', sa.DateTime(), nullable=True),
+            sa.Column('preferences', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('username'),
+        )
+    else:
+        # Plain ADD COLUMN only touches the schema in SQLite; a batch
+        # move-and-copy would rewrite (and lock) the whole table.
+        existing = {c['name'] for c in inspector.get_columns('users')}
+        if 'age' not in existing:
+            op.add_column('users', sa.Column('age', sa.Integer(), nullable=False, server_default='18'))
+        if 'created_at' not in existing:
+            op.add_column('users', sa.Column('created_at', sa.DateTime(), nullable=True))
+        if 'last_login' not in existing:
+            op.add_column('users', sa.Column('last_login', sa.DateTime(), nullable=True))
+        if 'preferences' not in existing:
+            op.add_column('users', sa.Column('preferences', sa.Text(), nullable=True))
+        if 'created_at' not in existing:
+            _backfill_created_at()
+
+    if 'sessions' not in tables:
+        op.create_table(
+            'sessions',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('start_time', sa.DateTime(), nullable=True),
+            sa.Column('screen_time', sa.Integer(), nullable=True),
+            sa.Column('break_time', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sessions')
+    op.drop_table('users')
@@ -0,0 +1,133 @@
+"""usage rollups
+
+Adds the usage_daily and usage_hourly tables and fills them from the
+sessions already recorded.
+
+The backfill is a frozen copy of src/core/rollups.py as of this revision,
+so later changes to the app can't change what this migration does.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from collections import defaultdict
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'usage_daily',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('screen_seconds', sa.Integer(), nullable=False),
+        sa.Column('break_seconds', sa.Integer(), nullable=False),
+        sa.Column('sessions', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+    )
+    op.create_table(
+        'usage_hourly',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('hour_of_week', sa.Integer(), nullable=False),
+        sa.Column('screen_seconds', sa.Integer(), nullable=False),
+        sa.Column('break_seconds', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'week_start', 'hour_of_week'),
+    )
+    _backfill(op.get_bind())
+
+
+def _split_session(start, screen_seconds, break_seconds):
+    """(hour, screen_seconds, break_seconds) for each clock hour the session covers"""
+    total = screen_seconds + break_seconds
+    if total <= 0:
+        return []
+    end = start + timedelta(seconds=total)
+    buckets = []
+    cursor = start
+    done_screen = done_break = 0
+    while cursor < end:
+        hour = cursor.replace(minute=0, second=0, microsecond=0)
+        seg_end = min(hour + timedelta(hours=1), end)
+        elapsed = (seg_end - start).total_seconds()
+        screen = round(screen_seconds * elapsed / total) - done_screen
+        brk = round(break_seconds * elapsed / total) - done_break
+        done_screen += screen
+        done_break += brk
+        buckets.append((hour, screen, brk))
+        cursor = seg_end
+    return buckets
+
+
+def _backfill(conn):
+    sessions = sa.table(
+        'sessions',
+        sa.column('user_id', sa.Integer()),
+        sa.column('start_time', sa.DateTime()),
+        sa.column('screen_time', sa.Integer()),
+        sa.column('break_time', sa.Integer()),
+    )
+    usage_daily = sa.table(
+        'usage_daily',
+        sa.column('user_id', sa.Integer()),
+        sa.column('day', sa.Date()),
+        sa.column('screen_seconds', sa.Integer()),
+        sa.column('break_seconds', sa.Integer()),
+        sa.column('sessions', sa.Integer()),
+    )
+    usage_hourly = sa.table(
+        'usage_hourly',
+        sa.column('user_id', sa.Integer()),
+        sa.column('week_start', sa.Date()),
+        sa.column('hour_of_week', sa.Integer()),
+        sa.column('screen_seconds', sa.Integer()),
+        sa.column('break_seconds', sa.Integer()),
+    )
+
+    daily = defaultdict(lambda: [0, 0, 0])
+    hourly = defaultdict(lambda: [0, 0])
+    rows = conn.execute(
+        sa.select(sessions.c.user_id, sessions.c.start_time, sessions.c.screen_time, sessions.c.break_time)
+        .where(sessions.c.start_time.is_not(None))
+        .execution_options(yield_per=5000))
+    for user_id, start, screen_minutes, break_minutes in rows:
+        daily[(user_id, start.date())][2] += 1
+        for hour, screen, brk in _split_session(start, (screen_minutes or 0) * 60, (break_minutes or 0) * 60):
+            day_totals = daily[(user_id, hour.date())]
+            day_totals[0] += screen
+            day_totals[1] += brk
+            week = hour.date() - timedelta(days=hour.weekday())
+            hour_totals = hourly[(user_id, week, hour.weekday() * 24 + hour.hour)]
+            hour_totals[0] += screen
+            hour_totals[1] += brk
+
+    if daily:
+        conn.execute(sa.insert(usage_daily), [
+            {'user_id': user_id, 'day': day, 'screen_seconds': s, 'break_seconds': b, 'sessions': n}
+            for (user_id, day), (s, b, n) in daily.items()
+        ])
+    if hourly:
+        conn.execute(sa.insert(usage_hourly), [
+            {'user_id': user_id, 'week_start': week, 'hour_of_week': how, 'screen_seconds': s, 'break_seconds': b}
+            for (user_id, week, how), (s, b) in hourly.items()
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('usage_hourly')
+    op.drop_table('usage_daily')
@@ -0,0 +1,51 @@
+"""sync
+
+Adds the sync_records and sync_state tables used by src/sync to replicate
+sessions, preferences and user content between devices.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sync_records',
+        sa.Column('collection', sa.String(length=32), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('hlc', sa.BigInteger(), nullable=False),
+        sa.Column('node', sa.String(length=32), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('collection', 'key'),
+    )
+    with op.batch_alter_table('sync_records', schema=None) as batch_op:
+        batch_op.create_index('ix_sync_records_hlc', ['hlc'], unique=False)
+    op.create_table(
+        'sync_state',
+        sa.Column('name', sa.String(length=128), nullable=False),
+        sa.Column('value', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sync_state')
+    with op.batch_alter_table('sync_records', schema=None) as batch_op:
+        batch_op.drop_index('ix_sync_records_hlc')
+    op.drop_table('sync_records')
@@ -0,0 +1,43 @@
+"""family links
+
+Adds the family_links table relating parent accounts to the child
+accounts whose usage they can see.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'family_links',
+        sa.Column('parent_id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['parent_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['child_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('parent_id', 'child_id'),
+    )
+    with op.batch_alter_table('family_links', schema=None) as batch_op:
+        batch_op.create_index('ix_family_links_child', ['child_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('family_links', schema=None) as batch_op:
+        batch_op.drop_index('ix_family_links_child')
+    op.drop_table('family_links')
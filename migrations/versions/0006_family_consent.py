@@ -0,0 +1,35 @@
+"""family link consent
+
+Adds family_links.status so a link only takes effect once the child
+account approves it (or an administrator creates it with the CLI).
+Links made before this revision were never approved by the child, so
+they start out pending.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('family_links', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=10), nullable=False, server_default='pending'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('family_links', schema=None) as batch_op:
+        batch_op.drop_column('status')
@@ -23632,7 +23632,7 @@ qt_resource_data = b"\
 \x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\
 \x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\
 \x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\
-\x00\x00\x07\x07\
+\x00\x00\x10\x9d\
 \x2f\
 \x2a\x20\x4d\x61\x69\x6e\x20\x41\x70\x70\x6c\x69\x63\x61\x74\x69\
 \x6f\x6e\x20\x53\x74\x79\x6c\x69\x6e\x67\x20\x2a\x2f\x0d\x0a\x51\
@@ -23746,7 +23746,160 @@ qt_resource_data = b"\
 \x67\x20\x51\x4c\x61\x62\x65\x6c\x2c\x20\x51\x4d\x65\x73\x73\x61\
 \x67\x65\x42\x6f\x78\x20\x51\x4c\x61\x62\x65\x6c\x20\x7b\x0d\x0a\
 \x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x66\x66\x66\x66\
-\x66\x66\x3b\x0d\x0a\x7d\
+\x66\x66\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\x4c\x6f\x67\
+\x69\x6e\x20\x77\x69\x6e\x64\x6f\x77\x20\x28\x73\x72\x63\x2f\x63\
+\x6f\x72\x65\x2f\x71\x74\x5f\x6c\x6f\x67\x69\x6e\x5f\x77\x69\x6e\
+\x64\x6f\x77\x2e\x70\x79\x29\x20\x2a\x2f\x0d\x0a\x23\x6c\x6f\x67\
+\x69\x6e\x57\x69\x6e\x64\x6f\x77\x20\x7b\x0d\x0a\x20\x20\x20\x20\
+\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\
+\x3a\x20\x23\x31\x61\x31\x61\x31\x61\x3b\x0d\x0a\x20\x20\x20\x20\
+\x66\x6f\x6e\x74\x2d\x66\x61\x6d\x69\x6c\x79\x3a\x20\x22\x53\x65\
+\x67\x6f\x65\x20\x55\x49\x22\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\
+\x6c\x6f\x67\x69\x6e\x54\x69\x74\x6c\x65\x42\x61\x72\x2c\x20\x23\
+\x6c\x6f\x67\x69\x6e\x54\x69\x74\x6c\x65\x49\x63\x6f\x6e\x2c\x20\
+\x23\x6c\x6f\x67\x69\x6e\x54\x69\x74\x6c\x65\x54\x65\x78\x74\x20\
+\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\
+\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x31\x61\x31\x61\x31\x61\
+\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x54\x69\
+\x74\x6c\x65\x54\x65\x78\x74\x20\x7b\x0d\x0a\x20\x20\x20\x20\x63\
+\x6f\x6c\x6f\x72\x3a\x20\x23\x62\x30\x62\x30\x62\x30\x3b\x0d\x0a\
+\x20\x20\x20\x20\x66\x6f\x6e\x74\x2d\x73\x69\x7a\x65\x3a\x20\x39\
+\x70\x74\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\
+\x54\x69\x74\x6c\x65\x49\x63\x6f\x6e\x20\x7b\x0d\x0a\x20\x20\x20\
+\x20\x66\x6f\x6e\x74\x2d\x73\x69\x7a\x65\x3a\x20\x31\x32\x70\x74\
+\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x4d\x69\
+\x6e\x69\x6d\x69\x7a\x65\x42\x75\x74\x74\x6f\x6e\x2c\x20\x23\x6c\
+\x6f\x67\x69\x6e\x43\x6c\x6f\x73\x65\x42\x75\x74\x74\x6f\x6e\x20\
+\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\
+\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x31\x61\x31\x61\x31\x61\
+\x3b\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x62\
+\x30\x62\x30\x62\x30\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\
+\x65\x72\x3a\x20\x6e\x6f\x6e\x65\x3b\x0d\x0a\x20\x20\x20\x20\x62\
+\x6f\x72\x64\x65\x72\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x30\x70\
+\x78\x3b\x0d\x0a\x20\x20\x20\x20\x6d\x69\x6e\x2d\x77\x69\x64\x74\
+\x68\x3a\x20\x30\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\x70\x61\x64\
+\x64\x69\x6e\x67\x3a\x20\x34\x70\x78\x20\x31\x32\x70\x78\x3b\x0d\
+\x0a\x20\x20\x20\x20\x66\x6f\x6e\x74\x2d\x73\x69\x7a\x65\x3a\x20\
+\x31\x30\x70\x74\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\
+\x69\x6e\x4d\x69\x6e\x69\x6d\x69\x7a\x65\x42\x75\x74\x74\x6f\x6e\
+\x3a\x68\x6f\x76\x65\x72\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\
+\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\
+\x23\x66\x66\x63\x31\x30\x37\x3b\x0d\x0a\x20\x20\x20\x20\x63\x6f\
+\x6c\x6f\x72\x3a\x20\x62\x6c\x61\x63\x6b\x3b\x0d\x0a\x7d\x0d\x0a\
+\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x43\x6c\x6f\x73\x65\x42\x75\x74\
+\x74\x6f\x6e\x3a\x68\x6f\x76\x65\x72\x20\x7b\x0d\x0a\x20\x20\x20\
+\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\
+\x72\x3a\x20\x23\x64\x63\x33\x35\x34\x35\x3b\x0d\x0a\x20\x20\x20\
+\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x77\x68\x69\x74\x65\x3b\x0d\x0a\
+\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x4e\x6f\x74\x69\x66\
+\x69\x63\x61\x74\x69\x6f\x6e\x20\x7b\x0d\x0a\x20\x20\x20\x20\x63\
+\x6f\x6c\x6f\x72\x3a\x20\x77\x68\x69\x74\x65\x3b\x0d\x0a\x20\x20\
+\x20\x20\x66\x6f\x6e\x74\x2d\x73\x69\x7a\x65\x3a\x20\x39\x70\x74\
+\x3b\x0d\x0a\x20\x20\x20\x20\x70\x61\x64\x64\x69\x6e\x67\x3a\x20\
+\x38\x70\x78\x20\x31\x30\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\x62\
+\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\
+\x20\x23\x34\x32\x39\x39\x65\x31\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\
+\x23\x6c\x6f\x67\x69\x6e\x4e\x6f\x74\x69\x66\x69\x63\x61\x74\x69\
+\x6f\x6e\x5b\x6b\x69\x6e\x64\x3d\x22\x73\x75\x63\x63\x65\x73\x73\
+\x22\x5d\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\
+\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x34\x38\x62\
+\x62\x37\x38\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\
+\x6e\x4e\x6f\x74\x69\x66\x69\x63\x61\x74\x69\x6f\x6e\x5b\x6b\x69\
+\x6e\x64\x3d\x22\x65\x72\x72\x6f\x72\x22\x5d\x20\x7b\x0d\x0a\x20\
+\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\
+\x6c\x6f\x72\x3a\x20\x23\x66\x35\x36\x35\x36\x35\x3b\x0d\x0a\x7d\
+\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x4e\x6f\x74\x69\x66\x69\
+\x63\x61\x74\x69\x6f\x6e\x5b\x6b\x69\x6e\x64\x3d\x22\x77\x61\x72\
+\x6e\x69\x6e\x67\x22\x5d\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\
+\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\
+\x23\x65\x64\x38\x39\x33\x36\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\
+\x6c\x6f\x67\x69\x6e\x43\x61\x72\x64\x20\x7b\x0d\x0a\x20\x20\x20\
+\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\
+\x72\x3a\x20\x23\x32\x64\x32\x64\x32\x64\x3b\x0d\x0a\x20\x20\x20\
+\x20\x62\x6f\x72\x64\x65\x72\x3a\x20\x31\x70\x78\x20\x73\x6f\x6c\
+\x69\x64\x20\x23\x34\x30\x34\x30\x34\x30\x3b\x0d\x0a\x7d\x0d\x0a\
+\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x46\x6f\x72\x6d\x73\x2c\x20\x23\
+\x6c\x6f\x67\x69\x6e\x46\x6f\x72\x6d\x2c\x20\x23\x6c\x6f\x67\x69\
+\x6e\x54\x69\x74\x6c\x65\x2c\x20\x23\x6c\x6f\x67\x69\x6e\x53\x75\
+\x62\x74\x69\x74\x6c\x65\x2c\x20\x23\x6c\x6f\x67\x69\x6e\x46\x69\
+\x65\x6c\x64\x4c\x61\x62\x65\x6c\x20\x7b\x0d\x0a\x20\x20\x20\x20\
+\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\
+\x3a\x20\x23\x32\x64\x32\x64\x32\x64\x3b\x0d\x0a\x7d\x0d\x0a\x0d\
+\x0a\x23\x6c\x6f\x67\x69\x6e\x54\x69\x74\x6c\x65\x20\x7b\x0d\x0a\
+\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x36\x36\x37\x65\
+\x65\x61\x3b\x0d\x0a\x20\x20\x20\x20\x66\x6f\x6e\x74\x2d\x73\x69\
+\x7a\x65\x3a\x20\x32\x34\x70\x74\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\
+\x23\x6c\x6f\x67\x69\x6e\x53\x75\x62\x74\x69\x74\x6c\x65\x20\x7b\
+\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x62\x30\
+\x62\x30\x62\x30\x3b\x0d\x0a\x20\x20\x20\x20\x66\x6f\x6e\x74\x2d\
+\x73\x69\x7a\x65\x3a\x20\x31\x30\x70\x74\x3b\x0d\x0a\x7d\x0d\x0a\
+\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x54\x61\x62\x73\x20\x7b\x0d\x0a\
+\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\
+\x6f\x6c\x6f\x72\x3a\x20\x23\x34\x30\x34\x30\x34\x30\x3b\x0d\x0a\
+\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x54\x61\x62\x20\x7b\
+\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\
+\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x34\x30\x34\x30\x34\x30\x3b\
+\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x62\x30\
+\x62\x30\x62\x30\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\
+\x72\x3a\x20\x6e\x6f\x6e\x65\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\
+\x72\x64\x65\x72\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x30\x70\x78\
+\x3b\x0d\x0a\x20\x20\x20\x20\x6d\x69\x6e\x2d\x77\x69\x64\x74\x68\
+\x3a\x20\x30\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\x70\x61\x64\x64\
+\x69\x6e\x67\x3a\x20\x38\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\x66\
+\x6f\x6e\x74\x2d\x73\x69\x7a\x65\x3a\x20\x31\x30\x70\x74\x3b\x0d\
+\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x54\x61\x62\x5b\
+\x61\x63\x74\x69\x76\x65\x3d\x22\x74\x72\x75\x65\x22\x5d\x20\x7b\
+\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\
+\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x32\x64\x32\x64\x32\x64\x3b\
+\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x36\x36\
+\x37\x65\x65\x61\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\
+\x69\x6e\x46\x69\x65\x6c\x64\x4c\x61\x62\x65\x6c\x20\x7b\x0d\x0a\
+\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x66\x66\x66\x66\
+\x66\x66\x3b\x0d\x0a\x20\x20\x20\x20\x66\x6f\x6e\x74\x2d\x73\x69\
+\x7a\x65\x3a\x20\x31\x30\x70\x74\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\
+\x23\x6c\x6f\x67\x69\x6e\x46\x69\x65\x6c\x64\x20\x7b\x0d\x0a\x20\
+\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\
+\x6c\x6f\x72\x3a\x20\x23\x33\x61\x33\x61\x33\x61\x3b\x0d\x0a\x20\
+\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x66\x66\x66\x66\x66\
+\x66\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x3a\x20\
+\x31\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\x23\x34\x30\x34\x30\x34\
+\x30\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x2d\x72\
+\x61\x64\x69\x75\x73\x3a\x20\x30\x70\x78\x3b\x0d\x0a\x20\x20\x20\
+\x20\x70\x61\x64\x64\x69\x6e\x67\x3a\x20\x31\x30\x70\x78\x20\x31\
+\x35\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\x66\x6f\x6e\x74\x2d\x73\
+\x69\x7a\x65\x3a\x20\x31\x30\x70\x74\x3b\x0d\x0a\x7d\x0d\x0a\x0d\
+\x0a\x23\x6c\x6f\x67\x69\x6e\x46\x69\x65\x6c\x64\x3a\x66\x6f\x63\
+\x75\x73\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\
+\x3a\x20\x32\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\x23\x36\x36\x37\
+\x65\x65\x61\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\
+\x6e\x50\x72\x69\x6d\x61\x72\x79\x42\x75\x74\x74\x6f\x6e\x20\x7b\
+\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\
+\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x36\x36\x37\x65\x65\x61\x3b\
+\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x77\x68\x69\
+\x74\x65\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x3a\
+\x20\x6e\x6f\x6e\x65\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\
+\x65\x72\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x30\x70\x78\x3b\x0d\
+\x0a\x20\x20\x20\x20\x70\x61\x64\x64\x69\x6e\x67\x3a\x20\x31\x32\
+\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\x66\x6f\x6e\x74\x2d\x73\x69\
+\x7a\x65\x3a\x20\x31\x31\x70\x74\x3b\x0d\x0a\x20\x20\x20\x20\x66\
+\x6f\x6e\x74\x2d\x77\x65\x69\x67\x68\x74\x3a\x20\x62\x6f\x6c\x64\
+\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\x50\x72\
+\x69\x6d\x61\x72\x79\x42\x75\x74\x74\x6f\x6e\x3a\x68\x6f\x76\x65\
+\x72\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\
+\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x35\x61\x36\x66\
+\x64\x38\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\
+\x4c\x69\x6e\x6b\x42\x75\x74\x74\x6f\x6e\x20\x7b\x0d\x0a\x20\x20\
+\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\
+\x6f\x72\x3a\x20\x74\x72\x61\x6e\x73\x70\x61\x72\x65\x6e\x74\x3b\
+\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x36\x36\
+\x37\x65\x65\x61\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\
+\x72\x3a\x20\x6e\x6f\x6e\x65\x3b\x0d\x0a\x20\x20\x20\x20\x6d\x69\
+\x6e\x2d\x77\x69\x64\x74\x68\x3a\x20\x30\x70\x78\x3b\x0d\x0a\x20\
+\x20\x20\x20\x66\x6f\x6e\x74\x2d\x73\x69\x7a\x65\x3a\x20\x31\x30\
+\x70\x74\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x23\x6c\x6f\x67\x69\x6e\
+\x4c\x69\x6e\x6b\x42\x75\x74\x74\x6f\x6e\x3a\x68\x6f\x76\x65\x72\
+\x20\x7b\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\
+\x35\x61\x36\x66\x64\x38\x3b\x0d\x0a\x7d\x0d\x0a\
 "
 
 qt_resource_name = b"\
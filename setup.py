@@ -4,4 +4,9 @@ setup(
     name="MomApp",
     version="0.1",
     packages=find_packages(),
+    entry_points={
+        "console_scripts": [
+            "momapp-daemon=src.daemon.server:main",
+        ],
+    },
 )
\ No newline at end of file
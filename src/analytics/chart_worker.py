@@ -0,0 +1,8 @@
+# chart_worker.py - Entry module for ChartService's worker processes
+"""
+Spawned workers import their parent's __main__ before running anything.
+For the app that is src.main, which pulls in PyQt5, OpenAI and the rest of
+the UI, so ChartService presents this module as __main__ while it starts
+workers and they only import what rendering needs.
+"""
+from src.analytics.charts import init_worker, render_chart  # noqa: F401
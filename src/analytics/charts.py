@@ -0,0 +1,95 @@
+# charts.py - Render usage charts to PNG/SVG bytes; runs in ChartService's worker processes
+import io
+from datetime import timedelta
+
+import numpy as np
+
+from src.analytics import metrics
+from src.analytics.spans import EPOCH, load_sessions
+
+CHART_TYPES = ("daily", "heatmap", "break_ratio")
+FORMATS = ("png", "svg")
+
+BACKGROUND = "#333333"
+FOREGROUND = "white"
+ACCENT = "#4a9eff"
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def init_worker():
+    """Pool initializer: pin the headless backend before anything touches matplotlib"""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _figure(width=5.0, height=3.0):
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+    except ImportError:
+        raise RuntimeError("matplotlib is required for usage charts")
+
+    # Figure + Agg canvas directly, no pyplot global state
+    figure = Figure(figsize=(width, height), dpi=100, facecolor=BACKGROUND)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111, facecolor=BACKGROUND)
+    for spine in ax.spines.values():
+        spine.set_color(FOREGROUND)
+    ax.tick_params(colors=FOREGROUND, labelsize=8)
+    return figure, ax
+
+
+def _daily(ax, spans, user_id, first_day, days):
+    _, daily = metrics.daily_totals(spans, first_day, days, users=np.array([user_id]))
+    hours = daily[0] / 3600
+    x = np.arange(days)
+    ax.bar(x, hours, color=ACCENT, width=0.8, label="Screen time")
+    ax.plot(x, metrics.rolling_mean(hours, 7), color="orange", linewidth=1.5, label="7-day average")
+    labels = [(EPOCH + timedelta(days=first_day + i)).strftime("%m/%d") for i in range(days)]
+    step = max(days // 7, 1)
+    ax.set_xticks(x[::step])
+    ax.set_xticklabels(labels[::step])
+    ax.set_ylabel("Hours", color=FOREGROUND)
+    ax.legend(fontsize=7, facecolor=BACKGROUND, labelcolor=FOREGROUND, frameon=False)
+
+
+def _heatmap(ax, spans, user_id):
+    _, matrix = metrics.hour_of_week_heatmap(spans, users=np.array([user_id]))
+    ax.imshow(matrix[0].reshape(7, 24) / 60, aspect="auto", cmap="magma")
+    ax.set_yticks(range(7))
+    ax.set_yticklabels(WEEKDAYS)
+    ax.set_xticks(range(0, 24, 3))
+    ax.set_xlabel("Hour", color=FOREGROUND)
+
+
+def _break_ratio(ax, spans):
+    dist = metrics.break_ratio_distribution(spans)
+    edges = dist["edges"]
+    ax.bar(edges[:-1] * 100, dist["counts"], width=np.diff(edges) * 100, align="edge", color=ACCENT)
+    ax.axvline(dist["p50"] * 100, color="orange", linewidth=1.5)
+    ax.set_xlabel("Break share of session (%)", color=FOREGROUND)
+    ax.set_ylabel("Sessions", color=FOREGROUND)
+
+
+def render_chart(user_id: int, chart_type: str, first_day: int, days: int, fmt: str = "png") -> bytes:
+    """Load the user's sessions for the range and return the chart as image bytes"""
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Unknown chart type: {chart_type}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown image format: {fmt}")
+
+    since = EPOCH + timedelta(days=first_day)
+    spans = load_sessions([user_id], since=since, until=since + timedelta(days=days))
+
+    figure, ax = _figure()
+    if chart_type == "daily":
+        _daily(ax, spans, user_id, first_day, days)
+    elif chart_type == "heatmap":
+        _heatmap(ax, spans, user_id)
+    else:
+        _break_ratio(ax, spans)
+    figure.tight_layout()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt, facecolor=BACKGROUND)
+    return buffer.getvalue()
@@ -0,0 +1,152 @@
+# metrics.py - Vectorized usage statistics over UsageSpans
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.analytics.spans import SECONDS_PER_DAY, UsageSpans
+
+HOURS_PER_WEEK = 168
+SECONDS_PER_HOUR = 3600
+# 1970-01-01 was a Thursday; shifting by 3 days makes Monday weekday 0
+_WEEKDAY_SHIFT = 3
+
+
+def split_into_buckets(spans: UsageSpans, width: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cut every span at multiples of ``width`` seconds.
+
+    Returns (span_index, bucket, seconds) with one entry per piece, where
+    ``bucket`` is ``timestamp // width``. Spans that fit in one bucket (the
+    common case) are passed through without being expanded.
+    """
+    start, end = spans.start, spans.end
+    valid = end > start
+    first = start // width
+    last = (end - 1) // width
+    counts = np.where(valid, last - first + 1, 0)
+
+    single = counts == 1
+    index = np.flatnonzero(single)
+    buckets = first[single]
+    seconds = (end - start)[single]
+
+    multi = np.flatnonzero(counts > 1)
+    if len(multi):
+        multi_counts = counts[multi]
+        piece_span = np.repeat(multi, multi_counts)
+        # Position of each piece within its span: 0, 1, ..., count-1
+        offsets = np.arange(len(piece_span)) - np.repeat(np.cumsum(multi_counts) - multi_counts, multi_counts)
+        piece_bucket = first[piece_span] + offsets
+        piece_start = np.maximum(start[piece_span], piece_bucket * width)
+        piece_end = np.minimum(end[piece_span], (piece_bucket + 1) * width)
+        index = np.concatenate([index, piece_span])
+        buckets = np.concatenate([buckets, piece_bucket])
+        seconds = np.concatenate([seconds, piece_end - piece_start])
+    return index, buckets, seconds
+
+
+def _screen_weights(spans: UsageSpans, index: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    """Screen seconds in each piece, sharing a span's breaks out in proportion"""
+    duration = spans.duration[index]
+    screen = spans.screen_seconds[index]
+    return seconds * (screen / np.maximum(duration, 1))
+
+
+def _user_index(spans: UsageSpans, users: Optional[np.ndarray]):
+    if users is None:
+        users = spans.users()
+    users = np.asarray(users, dtype=np.int64)
+    row = np.searchsorted(users, spans.user_id)
+    row = np.minimum(row, max(len(users) - 1, 0))
+    known = (users[row] == spans.user_id) if len(users) else np.zeros(len(spans), dtype=bool)
+    return users, row, known
+
+
+def hour_of_week_heatmap(spans: UsageSpans, users: Optional[np.ndarray] = None):
+    """Screen seconds per hour of the week (0 = Monday 00:00) for each user.
+
+    Returns (users, matrix) where ``matrix`` has shape (len(users), 168).
+    ``users`` must be sorted; it defaults to every user in ``spans``.
+    """
+    users, row, known = _user_index(spans, users)
+    index, hours, seconds = split_into_buckets(spans, SECONDS_PER_HOUR)
+    keep = known[index]
+    index, hours, seconds = index[keep], hours[keep], seconds[keep]
+
+    weekday = (hours // 24 + _WEEKDAY_SHIFT) % 7
+    hour_of_week = weekday * 24 + hours % 24
+    cells = row[index] * HOURS_PER_WEEK + hour_of_week
+    matrix = np.bincount(cells, weights=_screen_weights(spans, index, seconds),
+                         minlength=len(users) * HOURS_PER_WEEK)
+    return users, matrix.reshape(len(users), HOURS_PER_WEEK)
+
+
+def daily_totals(spans: UsageSpans, first_day: int, days: int, users: Optional[np.ndarray] = None):
+    """Screen seconds per user per day for ``days`` days from epoch day ``first_day``.
+
+    Returns (users, matrix) with shape (len(users), days); use
+    ``to_epoch(date) // 86400`` for ``first_day``.
+    """
+    users, row, known = _user_index(spans, users)
+    index, day, seconds = split_into_buckets(spans, SECONDS_PER_DAY)
+    col = day - first_day
+    keep = known[index] & (col >= 0) & (col < days)
+    index, col, seconds = index[keep], col[keep], seconds[keep]
+
+    matrix = np.bincount(row[index] * days + col, weights=_screen_weights(spans, index, seconds),
+                         minlength=len(users) * days)
+    return users, matrix.reshape(len(users), days)
+
+
+def streaks(hit: np.ndarray) -> Dict[str, np.ndarray]:
+    """Longest and current (ending on the last day) runs of True per row.
+
+    ``hit`` is a (users, days) boolean matrix, e.g. ``daily <= limit`` for
+    days kept under a screen-time limit.
+    """
+    hit = np.atleast_2d(np.asarray(hit, dtype=bool))
+    rows, days = hit.shape
+    padded = np.zeros((rows, days + 2), dtype=np.int8)
+    padded[:, 1:-1] = hit
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    # Padding keeps every run inside its own row
+    longest = np.zeros(rows, dtype=np.int64)
+    np.maximum.at(longest, starts // (days + 2), ends - starts)
+
+    misses = ~hit[:, ::-1]
+    current = np.where(misses.any(axis=1), misses.argmax(axis=1), days)
+    return {"longest": longest, "current": current}
+
+
+def rolling_mean(values: np.ndarray, window: int = 7) -> np.ndarray:
+    """Trailing moving average along the last axis.
+
+    The first ``window - 1`` columns average over the days available so far
+    rather than being dropped.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    csum = np.cumsum(values, axis=-1)
+    shifted = np.zeros_like(csum)
+    shifted[..., window:] = csum[..., :-window]
+    counts = np.minimum(np.arange(1, values.shape[-1] + 1), window)
+    return (csum - shifted) / counts
+
+
+def break_ratios(spans: UsageSpans) -> np.ndarray:
+    """Fraction of each session spent on break"""
+    duration = spans.duration
+    valid = duration > 0
+    return spans.break_seconds[valid] / duration[valid]
+
+
+def break_ratio_distribution(spans: UsageSpans, bins: int = 20) -> Dict[str, np.ndarray]:
+    """Histogram and summary percentiles of per-session break ratios"""
+    ratios = break_ratios(spans)
+    counts, edges = np.histogram(ratios, bins=bins, range=(0.0, 1.0))
+    if len(ratios):
+        p10, p50, p90 = np.percentile(ratios, [10, 50, 90])
+        mean = ratios.mean()
+    else:
+        p10 = p50 = p90 = mean = 0.0
+    return {"counts": counts, "edges": edges, "mean": mean, "p10": p10, "p50": p50, "p90": p90}
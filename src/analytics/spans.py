@@ -0,0 +1,109 @@
+# spans.py - Columnar (NumPy) view of recorded usage for the analytics functions
+"""
+Timestamps are int64 seconds since 1970-01-01 in the same naive local time
+the app stores, so hour and weekday arithmetic needs no timezone handling:
+``ts // 86400`` is the local day and ``ts % 86400 // 3600`` the local hour.
+"""
+from datetime import date, datetime
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+
+from src.core.database import engine
+
+SECONDS_PER_DAY = 86400
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(moment) -> int:
+    """Naive datetime/date to app-local epoch seconds"""
+    if isinstance(moment, date) and not isinstance(moment, datetime):
+        moment = datetime(moment.year, moment.month, moment.day)
+    return int((moment - EPOCH).total_seconds())
+
+
+class UsageSpans:
+    """Parallel int64 arrays, one entry per span of screen use.
+
+    ``start``/``end`` bound the wall-clock span and ``break_seconds`` is the
+    part of it spent on breaks (always 0 for app usage spans).
+    """
+
+    def __init__(self, user_id, start, end, break_seconds=None):
+        self.user_id = np.asarray(user_id, dtype=np.int64)
+        self.start = np.asarray(start, dtype=np.int64)
+        self.end = np.asarray(end, dtype=np.int64)
+        self.break_seconds = (np.zeros_like(self.start) if break_seconds is None
+                              else np.asarray(break_seconds, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.start)
+
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end - self.start
+
+    @property
+    def screen_seconds(self) -> np.ndarray:
+        return self.duration - self.break_seconds
+
+    def users(self) -> np.ndarray:
+        return np.unique(self.user_id)
+
+    def select(self, mask) -> "UsageSpans":
+        return UsageSpans(self.user_id[mask], self.start[mask], self.end[mask], self.break_seconds[mask])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[int]]) -> "UsageSpans":
+        """Build from (user_id, start, end, break_seconds) tuples"""
+        data = np.array(list(rows), dtype=np.int64).reshape(-1, 4)
+        return cls(data[:, 0], data[:, 1], data[:, 2], data[:, 3])
+
+
+def _where(user_ids, since, until, column):
+    clauses, params = [], {}
+    if user_ids is not None:
+        ids = [int(u) for u in user_ids]
+        clauses.append(f"user_id IN ({','.join(str(u) for u in ids) or 'NULL'})")
+    if since is not None:
+        clauses.append(f"{column} >= :since")
+        params["since"] = str(since)  # same text format SQLAlchemy stores
+    if until is not None:
+        clauses.append(f"{column} < :until")
+        params["until"] = str(until)
+    return (" AND " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _fetch(sql, params, conn=None) -> UsageSpans:
+    if conn is None:
+        with engine.connect() as conn:
+            return _fetch(sql, params, conn)
+    return UsageSpans.from_rows(conn.execute(text(sql), params))
+
+
+def load_sessions(user_ids: Optional[Iterable[int]] = None, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None, conn=None) -> UsageSpans:
+    """Timer sessions from the sessions table; a session is screen time then break time"""
+    where, params = _where(user_ids, since, until, "start_time")
+    # strftime('%s') reads the stored naive timestamp as UTC, which is exactly
+    # the app-local epoch described above, and keeps the parsing in SQLite
+    sql = (
+        "SELECT user_id, CAST(strftime('%s', start_time) AS INTEGER) AS start, "
+        "CAST(strftime('%s', start_time) AS INTEGER) + (COALESCE(screen_time, 0) + COALESCE(break_time, 0)) * 60, "
+        "COALESCE(break_time, 0) * 60 "
+        "FROM sessions WHERE start_time IS NOT NULL AND user_id IS NOT NULL" + where + " ORDER BY start"
+    )
+    return _fetch(sql, params, conn)
+
+
+def load_app_usage(user_ids: Optional[Iterable[int]] = None, since: Optional[datetime] = None,
+                   until: Optional[datetime] = None, conn=None) -> UsageSpans:
+    """Focused-application spans from the app_usage table"""
+    where, params = _where(user_ids, since, until, "start_time")
+    sql = (
+        "SELECT user_id, CAST(strftime('%s', start_time) AS INTEGER) AS start, "
+        "CAST(strftime('%s', end_time) AS INTEGER), 0 "
+        "FROM app_usage WHERE user_id IS NOT NULL" + where + " ORDER BY start"
+    )
+    return _fetch(sql, params, conn)
@@ -0,0 +1,289 @@
+# live.py - Push live timer state to WebSocket clients (phones, second monitors)
+"""
+Clients connect to ``ws://<host>:<port>/live`` and first receive a
+snapshot of the timer, then one small delta message per state transition:
+
+    {"type": "snapshot", "seq": 1, "state": {"phase": "running", "main_ms": 0, ...}}
+    {"type": "delta", "seq": 2, "state": {"phase": "break", "main_ms": 61250, "at": ...}}
+
+Ticks are not sent; while ``phase`` is "running" a client shows
+``main_ms + (now - at)``. Each message is encoded once and shared by every
+connection. Each client has a small bounded queue; a client that falls
+behind has its backlog replaced by a single fresh snapshot, and one that
+stops reading for SEND_TIMEOUT seconds is disconnected, so a slow phone
+can't grow the server's memory or hold up everyone else.
+
+Only the server side of RFC 6455 needed here is implemented: text frames
+out, close/ping handling in, no extensions or fragmentation.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from src.utils.helpers import is_loopback
+
+DEFAULT_PORT = 8766
+QUEUE_SIZE = 16
+SEND_TIMEOUT = 10.0
+WRITE_HIGH_WATER = 64 * 1024
+MAX_HEADER_BYTES = 8192
+MAX_CLIENT_FRAME = 65536
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+_RESYNC = object()  # queue marker: send the current snapshot instead of the backlog
+
+
+def encode_frame(payload: bytes, opcode: int = OP_TEXT) -> bytes:
+    """Unmasked, unfragmented server frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """Read one client frame; returns (opcode, unmasked payload)"""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if length > MAX_CLIENT_FRAME:
+        raise ValueError("Client frame too large")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1(key.encode("ascii") + WS_GUID).digest()).decode("ascii")
+
+
+class LiveClient:
+    def __init__(self, writer):
+        self.writer = writer
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def offer(self, frame) -> bool:
+        """Queue a frame; returns False if the backlog had to be collapsed"""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            # Deltas are cumulative, so a fresh snapshot supersedes the backlog
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESYNC)
+            return False
+
+
+class LiveServer:
+    """Asyncio WebSocket server running on its own thread.
+
+    ``publish`` may be called from any thread (normally the Qt thread via
+    TimeOverlay.stateChanged); it works out which fields changed and hands
+    one encoded frame to the event loop for fan-out.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, token: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.token = token or os.environ.get("MOMAPP_API_TOKEN")
+        if not self.token and not is_loopback(host):
+            raise ValueError(f"A token is required to serve the live feed on {host}; set MOMAPP_API_TOKEN")
+        self.clients = set()
+        self.state: Dict = {}
+        self.seq = 0
+        self.messages_published = 0
+        self.disconnects = 0
+        self.resyncs = 0
+        self._lock = threading.Lock()
+        self._snapshot_frame = None
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stopping = None
+
+    # -- publishing (any thread) ---------------------------------------------
+
+    def publish(self, state: Dict):
+        """Broadcast whatever changed in ``state`` since the last call"""
+        with self._lock:
+            delta = {k: v for k, v in state.items() if self.state.get(k, _RESYNC) != v}
+            if not delta or set(delta) == {"at"}:
+                return
+            if "at" in state:
+                delta["at"] = state["at"]  # clients extrapolate the clock from it
+            self.state.update(delta)
+            self.seq += 1
+            frame = encode_frame(json.dumps({"type": "delta", "seq": self.seq, "state": delta}).encode("utf-8"))
+            self._snapshot_frame = None
+        self.messages_published += 1
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._fanout, frame)
+
+    def snapshot_frame(self) -> bytes:
+        with self._lock:
+            if self._snapshot_frame is None:
+                message = {"type": "snapshot", "seq": self.seq, "state": self.state}
+                self._snapshot_frame = encode_frame(json.dumps(message).encode("utf-8"))
+            return self._snapshot_frame
+
+    def _fanout(self, frame):
+        for client in self.clients:
+            if not client.offer(frame):
+                self.resyncs += 1
+
+    # -- connections (event loop thread) --------------------------------------
+
+    async def _handshake(self, reader, writer) -> bool:
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return False
+        lines = request.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        url = urlsplit(parts[1] if len(parts) > 1 else "")
+        token = parse_qs(url.query).get("token", [None])[0]
+        bearer = headers.get("authorization", "")
+        if url.path.rstrip("/") != "/live" or "websocket" not in headers.get("upgrade", "").lower() \
+                or "sec-websocket-key" not in headers:
+            status = "404 Not Found" if url.path.rstrip("/") != "/live" else "400 Bad Request"
+        elif self.token and token != self.token and bearer != f"Bearer {self.token}":
+            status = "401 Unauthorized"
+        else:
+            writer.write(
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept_key(headers['sec-websocket-key'])}\r\n\r\n".encode("ascii"))
+            return True
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode("ascii"))
+        return False
+
+    async def _send_loop(self, client):
+        writer = client.writer
+        queue = client.queue
+        while True:
+            frames = [await queue.get()]
+            while not queue.empty():
+                frames.append(queue.get_nowait())
+            writer.write(b"".join(self.snapshot_frame() if f is _RESYNC else f for f in frames))
+            # Only wait (and pay for the timeout machinery) once the socket is backed up
+            if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                await asyncio.wait_for(writer.drain(), SEND_TIMEOUT)
+
+    async def _receive_loop(self, reader, client):
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == OP_CLOSE:
+                client.writer.write(encode_frame(payload[:2], OP_CLOSE))
+                return
+            if opcode == OP_PING:
+                client.writer.write(encode_frame(payload, OP_PONG))
+
+    async def _handle(self, reader, writer):
+        client = None
+        tasks = ()
+        try:
+            if not await self._handshake(reader, writer):
+                return
+            client = LiveClient(writer)
+            client.offer(_RESYNC)  # new clients start from a snapshot
+            self.clients.add(client)
+            tasks = (asyncio.ensure_future(self._send_loop(client)),
+                     asyncio.ensure_future(self._receive_loop(reader, client)))
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.exception()  # consumed: disconnects are routine, not errors
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError,
+                asyncio.CancelledError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Collect the cancelled loops so their exceptions aren't reported as never retrieved
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if client is not None:
+                self.clients.discard(client)
+                self.disconnects += 1
+            writer.close()
+
+    # -- lifecycle ------------------------------------------------------------
+
+    async def _serve(self):
+        self._stopping = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        await self._stopping.wait()
+
+        self._server.close()
+        handlers = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def start_background(self):
+        """Run the server's event loop on a daemon thread; returns once it is listening"""
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._serve())
+            except OSError as e:
+                print(f"Live server error: {e}", file=sys.stderr)
+                self._ready.set()
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="momapp-live", daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        if self._server is None:
+            raise OSError(f"Could not listen on {self.host}:{self.port}")
+        return self._thread
+
+    def stop(self):
+        if self._loop is not None and self._server is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stopping.set)
+            except RuntimeError:
+                pass  # loop already finished
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def stats(self) -> Dict:
+        return {
+            "clients": len(self.clients),
+            "messages_published": self.messages_published,
+            "resyncs": self.resyncs,
+            "disconnects": self.disconnects,
+        }
@@ -0,0 +1,320 @@
+# server.py - Local HTTP API for usage data
+"""
+Serves a user's sessions, breaks, preferences and stats as JSON so other
+devices on the network (or scripts) can read what the desktop app records;
+``family`` gives a parent account the same totals for each linked child.
+
+    python -m src.api.server --port 8765
+    curl http://127.0.0.1:8765/api/users/alice/stats?days=7
+
+Requests run on a thread per connection and share the pooled engine from
+src.core.database. Stats responses carry an ETag built from the user's
+rollup data version, so a client that sends it back in If-None-Match gets
+a 304 without the stats queries being run. Set MOMAPP_API_TOKEN to require
+``Authorization: Bearer <token>`` on every request; a token is mandatory
+when binding anything other than a loopback address. PUT can change any
+user's preferences (limits included), so it is refused without a token
+even on loopback, and never touches device settings such as the API's
+own host and token.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from datetime import date, timedelta
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core import family, rollups
+from src.core.database import engine, ensure_schema
+from src.core.models import SessionRecord, User
+from src.sync.sources import LOCAL_PREFERENCES
+from src.utils.helpers import is_loopback
+
+DEFAULT_PORT = 8765
+MAX_LIMIT = 1000
+MAX_BODY_BYTES = 1024 * 1024
+PREFERENCES_DIR = "data"
+# Serialises PUTs: each one is a read-modify-write of the whole file
+_preferences_lock = threading.Lock()
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of ``etag`` against an If-None-Match header"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+@lru_cache(maxsize=1024)
+def _user_id(username):
+    # Usernames never change once registered, so the id can be cached
+    with engine.connect() as conn:
+        user_id = conn.execute(select(User.id).where(User.username == username)).scalar()
+    if user_id is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"No such user: {username}")
+    return user_id
+
+
+def _int_param(query, name, default, low=1, high=MAX_LIMIT):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer")
+    return min(max(value, low), high)
+
+
+def _sessions(user_id, query, breaks_only=False):
+    limit = _int_param(query, "limit", 100)
+    stmt = (select(SessionRecord.id, SessionRecord.start_time, SessionRecord.screen_time, SessionRecord.break_time)
+            .where(SessionRecord.user_id == user_id)
+            .order_by(SessionRecord.start_time.desc())
+            .limit(limit))
+    if breaks_only:
+        stmt = stmt.where(SessionRecord.break_time > 0)
+    with engine.connect() as conn:
+        rows = conn.execute(stmt).all()
+    return [
+        {
+            "id": row.id,
+            "start_time": row.start_time.isoformat() if row.start_time else None,
+            "screen_minutes": row.screen_time,
+            "break_minutes": row.break_time,
+        }
+        for row in rows
+    ]
+
+
+def get_sessions(user_id, query):
+    return {"sessions": _sessions(user_id, query)}
+
+
+def get_breaks(user_id, query):
+    breaks = _sessions(user_id, query, breaks_only=True)
+    return {
+        "breaks": [{"session_id": b["id"], "start_time": b["start_time"], "minutes": b["break_minutes"]}
+                   for b in breaks],
+        "total_minutes": sum(b["break_minutes"] for b in breaks),
+    }
+
+
+def get_stats(user_id, query):
+    days = _int_param(query, "days", 7, high=366)
+    end = date.today()
+    start = end - timedelta(days=days - 1)
+    return {
+        "range": {"start": start.isoformat(), "end": end.isoformat(), "days": days},
+        "totals": rollups.screen_time(user_id, start, end),
+        "daily": [dict(row, day=row["day"].isoformat()) for row in rollups.daily_usage(user_id, start, end)],
+    }
+
+
+def get_family(user_id, query):
+    days = _int_param(query, "days", 7, high=366)
+    end = date.today()
+    start = end - timedelta(days=days - 1)
+    children = family.dashboard(user_id, start, end, today=end)
+    for child in children:
+        child["last_active"] = child["last_active"] and child["last_active"].isoformat()
+    return {
+        "range": {"start": start.isoformat(), "end": end.isoformat(), "days": days},
+        "children": children,
+    }
+
+
+def stats_etag(user_id, query):
+    days = _int_param(query, "days", 7, high=366)
+    return f'"{user_id}-{days}-{date.today().isoformat()}-{rollups.data_version(user_id)}"'
+
+
+def _preferences_path(username):
+    # Same file MainApplication.load_user_preferences reads
+    return os.path.join(PREFERENCES_DIR, f"{username}_preferences.json")
+
+
+def get_preferences(username):
+    try:
+        with open(_preferences_path(username), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def put_preferences(username, body):
+    if not isinstance(body, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Preferences must be a JSON object")
+    local = sorted(LOCAL_PREFERENCES.intersection(body))
+    if local:
+        raise ApiError(HTTPStatus.FORBIDDEN, f"Device settings can't be changed over the API: {', '.join(local)}")
+    with _preferences_lock:
+        preferences = get_preferences(username)
+        preferences.update(body)
+        os.makedirs(PREFERENCES_DIR, exist_ok=True)
+        tmp_path = _preferences_path(username) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(preferences, f, indent=2)
+        os.replace(tmp_path, _preferences_path(username))
+    return preferences
+
+
+USER_ROUTE = re.compile(r"^/api/users/(?P<username>[^/]+)/(?P<resource>sessions|breaks|stats|family|preferences)/?$")
+GET_HANDLERS = {"sessions": get_sessions, "breaks": get_breaks, "stats": get_stats, "family": get_family}
+ETAGS = {"stats": stats_etag}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so load tests and phones reuse connections
+    server_version = "MomAppAPI/1.0"
+    # Headers and body go out in separate writes; without TCP_NODELAY each
+    # keep-alive response stalls on delayed ACK for ~40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_not_modified(self, etag):
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def route(self):
+        token = self.server.token
+        if token and self.headers.get("Authorization") != f"Bearer {token}":
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Missing or invalid API token")
+        url = urlsplit(self.path)
+        match = USER_ROUTE.match(url.path)
+        if not match:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No route for {url.path}")
+        return match.group("username"), match.group("resource"), parse_qs(url.query)
+
+    def handle_request(self, method):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_BYTES:
+            # The body isn't read, so the connection can't be reused
+            self.close_connection = True
+            status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0 else HTTPStatus.BAD_REQUEST
+            self.send_json(status, {"error": "Request too large" if length > 0 else "Invalid Content-Length"})
+            return
+        # Always drain the body so an error reply doesn't desync the keep-alive stream
+        raw_body = self.rfile.read(length)
+        try:
+            username, resource, query = self.route()
+            user_id = _user_id(username)
+
+            if method == "PUT":
+                if resource != "preferences":
+                    raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"PUT not supported on {resource}")
+                if not self.server.token:
+                    # route() has already checked the token when one is set
+                    raise ApiError(HTTPStatus.FORBIDDEN, "Changing preferences needs an API token; set MOMAPP_API_TOKEN")
+                try:
+                    body = json.loads(raw_body or b"null")
+                except ValueError:
+                    raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+                self.send_json(HTTPStatus.OK, put_preferences(username, body))
+                return
+
+            if resource == "preferences":
+                self.send_json(HTTPStatus.OK, get_preferences(username))
+                return
+
+            headers = {}
+            if resource in ETAGS:
+                etag = ETAGS[resource](user_id, query)
+                if etag_matches(self.headers.get("If-None-Match") or "", etag):
+                    self.send_not_modified(etag)
+                    return
+                headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            self.send_json(HTTPStatus.OK, GET_HANDLERS[resource](user_id, query), headers)
+
+        except ApiError as e:
+            self.send_json(e.status, {"error": str(e)})
+        except SQLAlchemyError as e:
+            print(f"API database error: {e}", file=sys.stderr)
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Database unavailable"})
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, verbose=False, token=None):
+        token = token or os.environ.get("MOMAPP_API_TOKEN")
+        if not token and not is_loopback(host):
+            raise ValueError(f"An API token is required to serve on {host}; set MOMAPP_API_TOKEN")
+        super().__init__((host, port), ApiHandler)
+        self.verbose = verbose
+        self.token = token
+
+    def start_background(self):
+        """Serve from a daemon thread (used when the desktop app hosts the API)"""
+        thread = threading.Thread(target=self.serve_forever, name="momapp-api", daemon=True)
+        thread.start()
+        return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve MomApp usage data over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: loopback only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    ensure_schema()
+    try:
+        server = ApiServer(args.host, args.port, args.verbose)
+    except (OSError, ValueError) as e:
+        print(f"Error starting API server: {e}", file=sys.stderr)
+        return 1
+    print(f"Serving MomApp API on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
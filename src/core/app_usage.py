@@ -0,0 +1,222 @@
+# app_usage.py - Attribute screen time to the application that has focus
+import ctypes
+import ctypes.util
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+
+from src.core.database import engine
+from src.core.heartbeats import HeartbeatPipeline
+from src.core.models import AppUsageSpan
+
+UNKNOWN_APP = "unknown"
+
+
+class ActiveWindowProvider:
+    """Reports the pid of the process owning the focused window"""
+
+    name = "base"
+
+    def active_pid(self) -> Optional[int]:
+        """Pid of the focused window's process, or None if nothing has focus"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class X11ActiveWindowProvider(ActiveWindowProvider):
+    """Reads _NET_ACTIVE_WINDOW from the root window, then its _NET_WM_PID"""
+
+    name = "x11"
+
+    XA_WINDOW = 33
+    XA_CARDINAL = 6
+
+    def __init__(self):
+        xlib_path = ctypes.util.find_library("X11")
+        if not xlib_path or not os.environ.get("DISPLAY"):
+            raise OSError("X11 not available")
+
+        xlib = self._xlib = ctypes.CDLL(xlib_path)
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XInternAtom.restype = ctypes.c_ulong
+        xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        xlib.XGetWindowProperty.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long,
+            ctypes.c_int, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte))]
+        xlib.XFree.argtypes = [ctypes.c_void_p]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+
+        self._display = xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("Cannot open X display")
+        self._root = xlib.XDefaultRootWindow(self._display)
+        # Atoms are interned once; every sample is then two property reads
+        self._active_atom = xlib.XInternAtom(self._display, b"_NET_ACTIVE_WINDOW", True)
+        self._pid_atom = xlib.XInternAtom(self._display, b"_NET_WM_PID", True)
+        if not self._active_atom or not self._pid_atom:
+            self.close()
+            raise OSError("Window manager does not publish _NET_ACTIVE_WINDOW")
+
+        # Out-parameters reused across calls
+        self._type = ctypes.c_ulong()
+        self._format = ctypes.c_int()
+        self._nitems = ctypes.c_ulong()
+        self._after = ctypes.c_ulong()
+        self._data = ctypes.POINTER(ctypes.c_ubyte)()
+
+    def _read_long(self, window, atom, prop_type):
+        status = self._xlib.XGetWindowProperty(
+            self._display, window, atom, 0, 1, False, prop_type,
+            ctypes.byref(self._type), ctypes.byref(self._format), ctypes.byref(self._nitems),
+            ctypes.byref(self._after), ctypes.byref(self._data))
+        if status != 0 or not self._data:
+            return None
+        try:
+            if self._nitems.value == 0:
+                return None
+            # 32-bit format properties come back as C longs
+            return ctypes.cast(self._data, ctypes.POINTER(ctypes.c_ulong))[0]
+        finally:
+            self._xlib.XFree(self._data)
+            self._data = ctypes.POINTER(ctypes.c_ubyte)()
+
+    def active_pid(self):
+        window = self._read_long(self._root, self._active_atom, self.XA_WINDOW)
+        if not window:
+            return None
+        return self._read_long(window, self._pid_atom, self.XA_CARDINAL) or None
+
+    def close(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+class FakeWindowProvider(ActiveWindowProvider):
+    """Scripted focus changes for tests and benchmarks"""
+
+    name = "fake"
+
+    def __init__(self, pid: Optional[int] = None):
+        self.pid = pid
+
+    def focus(self, pid: Optional[int]):
+        self.pid = pid
+
+    def active_pid(self):
+        return self.pid
+
+
+def create_window_provider() -> Optional[ActiveWindowProvider]:
+    """Return the active-window provider for this desktop, if any"""
+    try:
+        return X11ActiveWindowProvider()
+    except (OSError, AttributeError):
+        return None
+
+
+class ProcessNameCache:
+    """pid -> process name from /proc/<pid>/comm, cached so samples rarely touch /proc.
+
+    Entries expire after ``ttl`` seconds so a recycled pid is picked up again.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 1024, proc_root: str = "/proc"):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.proc_root = proc_root
+        self._names: Dict[int, Tuple[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, pid: int, now: Optional[float] = None) -> str:
+        now = time.monotonic() if now is None else now
+        cached = self._names.get(pid)
+        if cached is not None and cached[1] > now:
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        try:
+            with open(f"{self.proc_root}/{pid}/comm", "rb") as f:
+                name = f.read().decode("utf-8", "replace").strip() or UNKNOWN_APP
+        except OSError:
+            name = UNKNOWN_APP
+        if len(self._names) >= self.max_entries:
+            self._names.clear()
+        self._names[pid] = (name, now + self.ttl)
+        return name
+
+
+class AppUsageSampler:
+    """Turns focus samples into heartbeats for the span pipeline.
+
+    Consecutive samples in the same application merge into one span (see
+    HeartbeatPipeline); a span is closed when focus moves to another app,
+    nothing has focus, or samples stop for longer than ``max_gap`` seconds.
+    Each sample counts for ``interval`` seconds, the time until the next one.
+    """
+
+    SOURCE = "window"
+
+    def __init__(self, provider: ActiveWindowProvider, user_id: Optional[int] = None,
+                 names: Optional[ProcessNameCache] = None, max_gap: float = 15.0, interval: float = 5.0,
+                 batch_size: int = 50, store=None, pipeline: Optional[HeartbeatPipeline] = None):
+        self.provider = provider
+        self.user_id = user_id
+        self.names = names or ProcessNameCache()
+        self.pipeline = pipeline or HeartbeatPipeline(store or save_spans, pulsetime=max_gap,
+                                                      batch_size=batch_size, flush_interval=300.0,
+                                                      duration=interval)
+        self.samples = 0
+
+    @property
+    def spans_written(self) -> int:
+        return self.pipeline.rows_written
+
+    def sample(self, now: Optional[datetime] = None) -> Optional[str]:
+        """Record which app has focus right now; returns its name"""
+        self.samples += 1
+        pid = self.provider.active_pid()
+        if pid is None:
+            self.pause()
+            return None
+
+        app = self.names.lookup(pid)
+        self.pipeline.heartbeat(app, now.timestamp() if now else None, self.SOURCE, self.user_id)
+        return app
+
+    def pause(self):
+        """Close the open span, e.g. while the session timer isn't running"""
+        self.pipeline.close(self.SOURCE, self.user_id)
+
+    def flush(self, close: bool = False) -> bool:
+        """Write closed spans; with ``close`` the open span is ended first"""
+        return self.pipeline.flush(close=close)
+
+
+def save_spans(spans: List[Dict]):
+    """Insert a batch of spans in one executemany"""
+    with engine.begin() as conn:
+        conn.execute(insert(AppUsageSpan.__table__), spans)
+
+
+def usage_by_app(user_id: int, since: datetime) -> Dict[str, float]:
+    """Focus seconds per application from stored spans, counting only time after ``since``"""
+    query = (select(AppUsageSpan.app, AppUsageSpan.start_time, AppUsageSpan.end_time)
+             .where(AppUsageSpan.user_id == user_id, AppUsageSpan.end_time > since))
+    totals: Dict[str, float] = {}
+    with engine.connect() as conn:
+        for app, start, end in conn.execute(query):
+            totals[app] = totals.get(app, 0.0) + (end - max(start, since)).total_seconds()
+    return totals
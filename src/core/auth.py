@@ -4,20 +4,17 @@ import json
 import os
 from datetime import datetime
 import sqlite3
+import sys
 from typing import Optional, Dict, Any
 
 try:
-    from .database import Session, init_db
+    from sqlalchemy.exc import SQLAlchemyError
+    from .database import Session, ensure_schema
     from .models import User
     USE_SQLALCHEMY = True
-    # Initialize database tables if needed
-    try:
-        init_db()
-    except:
-        pass  # Database might already be initialized
 except ImportError:
     USE_SQLALCHEMY = False
-    print("Using file-based authentication")
+    print("Using file-based authentication", file=sys.stderr)
 
 class AuthManager:
     """Handles user authentication and registration"""
@@ -27,13 +24,22 @@ class AuthManager:
         self.db_file = "data/users.db"
         self.ensure_data_directory()
         
-        if not USE_SQLALCHEMY:
+        if USE_SQLALCHEMY:
+            self.init_database()
+        else:
             self.init_file_storage()
     
     def ensure_data_directory(self):
         """Create data directory if it doesn't exist"""
         os.makedirs("data", exist_ok=True)
     
+    def init_database(self):
+        """Migrate the database only if its schema version is out of date"""
+        try:
+            ensure_schema()
+        except (SQLAlchemyError, ValueError) as e:
+            print(f"Database schema check failed: {e}", file=sys.stderr)
+    
     def init_file_storage(self):
         """Initialize file-based storage if not using database"""
         if not os.path.exists(self.users_file):
@@ -147,6 +153,7 @@ class AuthManager:
                 user = session.query(User).filter_by(username=username).first()
                 if user:
                     user_data = {
+                        'id': user.id,
                         'username': user.username,
                         'age': user.age
                     }
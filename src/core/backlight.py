@@ -0,0 +1,155 @@
+# backlight.py - Apply the recommended display brightness through /sys/class/backlight
+"""
+Brightness changes are ramped rather than jumped: BacklightController
+moves from the current level to the target over a couple of seconds,
+but writes to sysfs at most once per ``min_interval`` and only when the
+raw value actually differs from the last one written, so a ramp across
+a 0-1000 range costs a few dozen writes instead of hundreds.
+
+Writing the brightness file needs permission, usually a udev rule giving
+the video group write access; without it find_backlight() returns None.
+create_fake_sysfs() builds the same layout in a scratch directory for
+tests and benchmarks.
+"""
+import os
+import time
+from typing import Callable, Optional
+
+SYSFS_ROOT = "/sys/class/backlight"
+# Same preference order as systemd-backlight: firmware interfaces know the panel best
+TYPE_PRIORITY = {"firmware": 0, "platform": 1, "raw": 2}
+
+
+class Backlight:
+    """One device under /sys/class/backlight"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.max_brightness = int(self._read("max_brightness"))
+        if self.max_brightness <= 0:
+            raise OSError(f"{self.name} reports no brightness range")
+        self.writes = 0
+
+    def _read(self, attribute: str) -> str:
+        with open(os.path.join(self.path, attribute), "r") as f:
+            return f.read().strip()
+
+    @property
+    def type(self) -> str:
+        try:
+            return self._read("type")
+        except OSError:
+            return "raw"
+
+    def read(self) -> int:
+        # actual_brightness is what the hardware is showing; brightness is the last request
+        try:
+            return int(self._read("actual_brightness"))
+        except OSError:
+            return int(self._read("brightness"))
+
+    def write(self, raw: int):
+        with open(os.path.join(self.path, "brightness"), "w") as f:
+            f.write(str(raw))
+        self.writes += 1
+
+    def writable(self) -> bool:
+        return os.access(os.path.join(self.path, "brightness"), os.W_OK)
+
+    def to_raw(self, percent: float) -> int:
+        raw = round(max(0.0, min(100.0, percent)) / 100 * self.max_brightness)
+        # Never turn the panel off: some drivers treat 0 as backlight off
+        return max(1, raw) if percent > 0 else 0
+
+    def to_percent(self, raw: int) -> float:
+        return raw * 100.0 / self.max_brightness
+
+
+def find_backlight(root: str = SYSFS_ROOT) -> Optional[Backlight]:
+    """The preferred writable backlight device, or None"""
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return None
+    devices = []
+    for name in names:
+        try:
+            device = Backlight(os.path.join(root, name))
+        except (OSError, ValueError):
+            continue
+        if device.writable():
+            devices.append(device)
+    if not devices:
+        return None
+    return min(devices, key=lambda device: TYPE_PRIORITY.get(device.type, len(TYPE_PRIORITY)))
+
+
+def create_fake_sysfs(root: str, name: str = "intel_backlight", max_brightness: int = 1000,
+                      brightness: int = 500, device_type: str = "raw") -> str:
+    """Lay out a fake /sys/class/backlight/<name> under ``root``; returns the device path"""
+    path = os.path.join(root, name)
+    os.makedirs(path, exist_ok=True)
+    for attribute, value in (("max_brightness", max_brightness), ("brightness", brightness),
+                             ("type", device_type)):
+        with open(os.path.join(path, attribute), "w") as f:
+            f.write(f"{value}\n")
+    return path
+
+
+class BacklightController:
+    """Ramps a Backlight to a target with rate-limited, change-only writes
+
+    Call set_target(), then step() until it returns None; each call
+    returns the seconds to wait before the next one.
+    """
+
+    def __init__(self, backlight: Backlight, min_interval: float = 0.1,
+                 clock: Callable[[], float] = time.monotonic):
+        self.backlight = backlight
+        self.min_interval = min_interval
+        self.clock = clock
+        self.current = None  # raw value last written or read
+        self.last_write = -float("inf")
+        self.ramp = None  # (start raw, target raw, start time, duration)
+        self.skipped = 0
+
+    def set_target(self, percent: float, duration: float = 2.0, now: Optional[float] = None) -> Optional[float]:
+        now = self.clock() if now is None else now
+        # Someone may have used the brightness keys since our last write
+        self.current = self.backlight.read()
+        target = self.backlight.to_raw(percent)
+        if target == self.current:
+            self.ramp = None
+            return None
+        self.ramp = (self.current, target, now, max(duration, 0.0))
+        return self.step(now)
+
+    @property
+    def active(self) -> bool:
+        return self.ramp is not None
+
+    def position(self, now: float) -> int:
+        start, target, started, duration = self.ramp
+        if duration <= 0 or now >= started + duration:
+            return target
+        return round(start + (target - start) * (now - started) / duration)
+
+    def step(self, now: Optional[float] = None) -> Optional[float]:
+        """Write the ramp's current value if it's due; seconds until the next step, None when done"""
+        if self.ramp is None:
+            return None
+        now = self.clock() if now is None else now
+        wait = self.last_write + self.min_interval - now
+        if wait > 0:
+            self.skipped += 1
+            return wait
+        value = self.position(now)
+        if value != self.current:
+            self.backlight.write(value)
+            self.current = value
+            self.last_write = now
+        if value == self.ramp[1]:
+            self.ramp = None
+            return None
+        return self.min_interval
@@ -0,0 +1,114 @@
+# chart_service.py - Render usage charts off the Qt thread and cache the images
+import multiprocessing
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from src.analytics import chart_worker
+from src.analytics.chart_worker import init_worker, render_chart
+from src.core.rollups import data_version
+
+EPOCH_DAY = date(1970, 1, 1)
+
+
+@contextmanager
+def _worker_main():
+    """Have workers spawned in this block import chart_worker as __main__ instead of the app.
+
+    This swaps the process-wide sys.modules entry, so anything else that
+    looks up __main__ meanwhile sees chart_worker. ChartService only enters
+    it once, from warm() on the Qt thread while the app starts up.
+    """
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = chart_worker
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class ChartService(QObject):
+    """Renders charts in a process pool and delivers them through signals.
+
+    Results are cached on (user, range, chart type, format, data version),
+    so asking again after nothing new was recorded is answered from memory
+    and a duplicate request for a chart already rendering is not resubmitted.
+    """
+
+    chartReady = pyqtSignal(str, bytes, str)  # chart_type, image bytes, format
+    chartFailed = pyqtSignal(str, str)  # chart_type, error message
+    _finished = pyqtSignal(object, object, object)  # key, image bytes, exception
+
+    def __init__(self, workers=1, cache_size=32):
+        super().__init__()
+        # spawn: forking a process that has a running Qt event loop is unsafe
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.pending = set()
+        self.workers = workers
+        self._warmup = None
+        # Queued back onto the Qt thread from the executor's callback thread
+        self._finished.connect(self._onFinished)
+
+    def warm(self):
+        """Start every worker process now; returns one future per worker.
+
+        The pool only spawns processes inside submit() while it has fewer
+        than ``workers`` of them, so filling it here means later requests
+        never start a process and never touch __main__.
+        """
+        if self._warmup is None:
+            with _worker_main():
+                self._warmup = [self.pool.submit(init_worker) for _ in range(self.workers)]
+        return self._warmup
+
+    def request(self, user_id, chart_type, days=30, end=None, fmt="png"):
+        """Ask for a chart covering the ``days`` days up to ``end`` (default today)"""
+        end = end or date.today()
+        first_day = (end - EPOCH_DAY).days - days + 1
+        try:
+            version = data_version(user_id)
+        except Exception as e:
+            self.chartFailed.emit(chart_type, str(e))
+            return
+        key = (user_id, first_day, days, chart_type, fmt, version)
+
+        image = self.cache.get(key)
+        if image is not None:
+            self.cache.move_to_end(key)
+            self.chartReady.emit(chart_type, image, fmt)
+            return
+        if key in self.pending:
+            return
+
+        self.pending.add(key)
+        self.warm()
+        future = self.pool.submit(render_chart, user_id, chart_type, first_day, days, fmt)
+        future.add_done_callback(lambda f, key=key: self._onDone(key, f))
+
+    def _onDone(self, key, future):
+        # Runs on the executor's thread; only hands the result over
+        if future.cancelled():
+            return
+        error = future.exception()
+        self._finished.emit(key, None if error else future.result(), error)
+
+    def _onFinished(self, key, image, error):
+        self.pending.discard(key)
+        chart_type, fmt = key[3], key[4]
+        if error is not None:
+            self.chartFailed.emit(chart_type, str(error))
+            return
+        self.cache[key] = image
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        self.chartReady.emit(chart_type, image, fmt)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
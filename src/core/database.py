@@ -1,11 +1,23 @@
+import os
+import re
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from src.core.models import Base, User, SessionRecord, AppUsageSpan, FamilyLink, UsageDaily, UsageHourly, SyncRecord, SyncState
+
 # Database configuration
 DATABASE_URL = "sqlite:///app.db"  
 
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MIGRATIONS_DIR = os.path.join(PROJECT_ROOT, "migrations", "versions")
+# Revision files are named after their zero-padded revision id: 0006_family_consent.py
+REVISION_FILE = re.compile(r"^(\d{4})_\w+\.py$")
+
+# Create engine; one pool shared by the app, the local API server and CLIs.
+# The timeout lets readers wait out a writer instead of failing with "database is locked".
+engine = create_engine(DATABASE_URL, echo=False, pool_size=8, max_overflow=16,
+                       connect_args={"timeout": 15})
 
 # Create session factory
 Session = sessionmaker(bind=engine)
@@ -16,6 +28,64 @@ def init_db():
     Base.metadata.create_all(engine)
     print("Database initialized successfully")
 
+_schema_checked = False
+
+def get_schema_version():
+    """Return the schema version stamped in the database file"""
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+def _alembic_config():
+    from alembic.config import Config
+
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", DATABASE_URL)
+    return config
+
+def head_revision():
+    """The newest revision in migrations/versions as a number, for PRAGMA user_version.
+
+    Read from the file names rather than through Alembic so the startup
+    check stays a directory listing and one PRAGMA.
+    """
+    revisions = [int(match.group(1)) for match in map(REVISION_FILE.match, os.listdir(MIGRATIONS_DIR)) if match]
+    if not revisions:
+        raise ValueError(f"No migration revisions found in {MIGRATIONS_DIR}")
+    return max(revisions)
+
+def run_migrations():
+    """Upgrade the database to the head Alembic revision; ValueError if Alembic can't"""
+    from alembic import command
+    from alembic.util import CommandError
+
+    try:
+        command.upgrade(_alembic_config(), "head")
+    except CommandError as e:
+        raise ValueError(f"Migration failed: {e}") from e
+
+def ensure_schema():
+    """Run migrations only when the stamped schema version is out of date.
+
+    The head revision is taken from the migration file names and compared
+    with PRAGMA user_version, where it is mirrored once the upgrade has run;
+    Alembic is only imported when they differ. The result is cached for
+    the lifetime of the process. Returns True if migrations were run.
+    """
+    global _schema_checked
+    if _schema_checked:
+        return False
+
+    expected = head_revision()
+    migrated = False
+    if get_schema_version() != expected:
+        run_migrations()
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {expected}")
+        migrated = True
+
+    _schema_checked = True
+    return migrated
+
 def get_db_session():
     """Get a new database session"""
     return Session()
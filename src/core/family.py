@@ -0,0 +1,220 @@
+# family.py - Parent/child account links and the family usage dashboard
+"""
+A parent account sees the usage of the child accounts linked to it in
+family_links. Naming a child in family_members only requests the link;
+it takes effect once the child approves it at their next login. The
+``link`` command below is the administrator's shortcut and approves the
+link directly. The dashboard reads every child's totals from the
+usage_daily rollup in one grouped query, so it costs one round trip
+whether the family has one child or twenty.
+
+    python -m src.core.family link alice bobby
+    python -m src.core.family unlink alice bobby
+    python -m src.core.family dashboard alice --days 30
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import and_, case, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from src.core.database import engine, ensure_schema
+from src.core.models import FamilyLink, UsageDaily, User
+from src.core.recommendations import get_table
+
+
+PENDING, APPROVED, DECLINED = "pending", "approved", "declined"
+
+
+def _check_reverse(conn, parent_id: int, child_id: int):
+    # Only an approved link counts: a pending claim in the other direction mustn't block the real parent
+    if parent_id == child_id:
+        raise ValueError("An account can't be its own parent")
+    reverse = conn.execute(select(FamilyLink.parent_id).where(
+        FamilyLink.parent_id == child_id, FamilyLink.child_id == parent_id,
+        FamilyLink.status == APPROVED)).first()
+    if reverse is not None:
+        raise ValueError("The child account is already a parent of this account")
+
+
+def link(parent_id: int, child_id: int) -> bool:
+    """Administrator link: let ``parent_id`` see ``child_id``'s usage without asking; False if already linked"""
+    with engine.begin() as conn:
+        _check_reverse(conn, parent_id, child_id)
+        stmt = insert(FamilyLink.__table__).values(parent_id=parent_id, child_id=child_id, status=APPROVED)
+        result = conn.execute(stmt.on_conflict_do_update(
+            index_elements=['parent_id', 'child_id'], set_={'status': APPROVED},
+            where=FamilyLink.__table__.c.status != APPROVED))
+        conn.execute(delete(FamilyLink).where(FamilyLink.parent_id == child_id, FamilyLink.child_id == parent_id))
+    return result.rowcount > 0
+
+
+def request_link(parent_id: int, child_id: int) -> bool:
+    """Ask ``child_id`` to share their usage with ``parent_id``; False if already requested, linked or declined"""
+    with engine.begin() as conn:
+        _check_reverse(conn, parent_id, child_id)
+        result = conn.execute(insert(FamilyLink.__table__).on_conflict_do_nothing(),
+                              {'parent_id': parent_id, 'child_id': child_id, 'status': PENDING})
+    return result.rowcount > 0
+
+
+def respond(child_id: int, parent_id: int, approve: bool) -> bool:
+    """The child's answer to a pending request; returns False if there was none"""
+    with engine.begin() as conn:
+        if approve:
+            _check_reverse(conn, parent_id, child_id)
+        result = conn.execute(update(FamilyLink)
+                              .where(FamilyLink.parent_id == parent_id, FamilyLink.child_id == child_id,
+                                     FamilyLink.status == PENDING)
+                              .values(status=APPROVED if approve else DECLINED))
+        if approve and result.rowcount:
+            # The two accounts can't both be the other's parent
+            conn.execute(delete(FamilyLink).where(FamilyLink.parent_id == child_id,
+                                                  FamilyLink.child_id == parent_id))
+    return result.rowcount > 0
+
+
+def pending_requests(child_id: int) -> List[Dict]:
+    """Accounts waiting for ``child_id`` to approve a link"""
+    query = (select(User.id, User.username)
+             .join(FamilyLink, FamilyLink.parent_id == User.id)
+             .where(FamilyLink.child_id == child_id, FamilyLink.status == PENDING)
+             .order_by(User.username))
+    with engine.connect() as conn:
+        return [dict(row._mapping) for row in conn.execute(query)]
+
+
+def unlink(parent_id: int, child_id: int) -> bool:
+    with engine.begin() as conn:
+        result = conn.execute(delete(FamilyLink).where(FamilyLink.parent_id == parent_id,
+                                                       FamilyLink.child_id == child_id))
+    return result.rowcount > 0
+
+
+def children(parent_id: int) -> List[Dict]:
+    query = (select(User.id, User.username, User.age)
+             .join(FamilyLink, FamilyLink.child_id == User.id)
+             .where(FamilyLink.parent_id == parent_id, FamilyLink.status == APPROVED)
+             .order_by(User.username))
+    with engine.connect() as conn:
+        return [dict(row._mapping) for row in conn.execute(query)]
+
+
+def parents(child_id: int) -> List[int]:
+    with engine.connect() as conn:
+        return list(conn.execute(select(FamilyLink.parent_id).where(
+            FamilyLink.child_id == child_id, FamilyLink.status == APPROVED)).scalars())
+
+
+def request_members(parent_id: int, members: Iterable) -> int:
+    """Request links to the registered accounts named in a user_content['family_members'] list; returns new requests"""
+    names = {member.get('username') if isinstance(member, dict) else member for member in members}
+    names = [name for name in names if isinstance(name, str) and name]
+    if not names:
+        return 0
+    with engine.connect() as conn:
+        ids = list(conn.execute(select(User.id).where(User.username.in_(names), User.id != parent_id)).scalars())
+    linked = 0
+    for child_id in ids:
+        try:
+            linked += request_link(parent_id, child_id)
+        except ValueError as e:
+            print(f"Skipping family member {child_id}: {e}")
+    return linked
+
+
+def dashboard(parent_id: int, start: date, end: date, today: Optional[date] = None) -> List[Dict]:
+    """Usage for each of the parent's children over start..end inclusive, plus today and the last 7 days
+
+    Each row also carries the child's recommended daily screen time,
+    evaluated for all children at once from the recommendation table.
+
+    One query: the children are left-joined to their usage_daily rows and
+    every figure is a conditional sum in the same GROUP BY, so children
+    with no recorded usage still get a row of zeros.
+    """
+    today = today or date.today()
+    week_start = today - timedelta(days=6)
+    day = UsageDaily.day
+    in_range = and_(day >= start, day <= end)
+
+    def total(column, condition):
+        return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+    query = (
+        select(User.id, User.username, User.age,
+               total(UsageDaily.screen_seconds, in_range).label('screen_seconds'),
+               total(UsageDaily.break_seconds, in_range).label('break_seconds'),
+               total(UsageDaily.sessions, in_range).label('sessions'),
+               func.count(case((and_(in_range, UsageDaily.screen_seconds > 0), 1))).label('active_days'),
+               total(UsageDaily.screen_seconds, day == today).label('today_seconds'),
+               total(UsageDaily.screen_seconds, and_(day >= week_start, day <= today)).label('week_seconds'),
+               func.max(case((UsageDaily.sessions > 0, day))).label('last_active'))
+        .select_from(FamilyLink)
+        .join(User, User.id == FamilyLink.child_id)
+        .outerjoin(UsageDaily, and_(UsageDaily.user_id == User.id,
+                                    day >= min(start, week_start), day <= max(end, today)))
+        .where(FamilyLink.parent_id == parent_id, FamilyLink.status == APPROVED)
+        .group_by(User.id)
+        .order_by(User.username)
+    )
+    days = (end - start).days + 1
+    with engine.connect() as conn:
+        rows = [dict(row._mapping) for row in conn.execute(query)]
+    recommended = get_table().evaluate(row['age'] for row in rows)['screen_hours']
+    for row, hours in zip(rows, recommended):
+        row['daily_average_seconds'] = row['screen_seconds'] // max(days, 1)
+        row['recommended_seconds'] = int(hours * 3600)
+    return rows
+
+
+def _user_id(username: str) -> int:
+    with engine.connect() as conn:
+        user_id = conn.execute(select(User.id).where(User.username == username)).scalar()
+    if user_id is None:
+        raise ValueError(f"No such user: {username}")
+    return user_id
+
+
+def _hours(seconds: int) -> str:
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage family accounts and show the family dashboard")
+    parser.add_argument("command", choices=["link", "unlink", "dashboard"])
+    parser.add_argument("parent", help="parent username")
+    parser.add_argument("child", nargs="?", help="child username (link/unlink)")
+    parser.add_argument("--days", type=int, default=30, help="dashboard range ending today")
+    args = parser.parse_args(argv)
+
+    ensure_schema()
+    try:
+        parent_id = _user_id(args.parent)
+        if args.command in ("link", "unlink"):
+            if not args.child:
+                parser.error(f"{args.command} needs a child username")
+            child_id = _user_id(args.child)
+            changed = link(parent_id, child_id) if args.command == "link" else unlink(parent_id, child_id)
+            print(f"{args.command.capitalize()}ed {args.child}" if changed else "Nothing to change")
+            return 0
+    except ValueError as e:
+        print(e)
+        return 1
+
+    end = date.today()
+    for row in dashboard(parent_id, end - timedelta(days=args.days - 1), end):
+        print(f"{row['username']:<20} today {_hours(row['today_seconds'])} of {_hours(row['recommended_seconds'])}  "
+              f"7 days {_hours(row['week_seconds'])}  "
+              f"{args.days}-day average {_hours(row['daily_average_seconds'])}  "
+              f"last active {row['last_active'] or 'never'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+# heartbeats.py - Merge usage heartbeats into spans before they reach the database
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+
+class HeartbeatPipeline:
+    """Ingestion stage in front of the usage store.
+
+    Every tracker sends a heartbeat ("app X has focus at time t") about once
+    every ``duration`` seconds, and each heartbeat stands for that much time:
+    it covers t to t + duration, cut short if the source's next heartbeat
+    arrives sooner. Consecutive heartbeats from the same source for the same
+    app that arrive within ``pulsetime`` seconds of the span's end extend one
+    open span; anything else closes it and opens a new one. Closed spans are
+    buffered and handed to ``store`` in batches, either when ``batch_size``
+    spans are waiting or ``flush_interval`` seconds have passed. If the
+    store fails, the batch is kept and retried after another
+    ``flush_interval``; at most ``max_pending`` spans are held, and the
+    oldest are discarded beyond that.
+    """
+
+    def __init__(self, store: Callable[[List[Dict]], None], pulsetime: float = 10.0,
+                 batch_size: int = 500, flush_interval: float = 5.0, duration: float = 1.0,
+                 max_pending: int = 50000):
+        self.store = store
+        self.pulsetime = pulsetime
+        self.duration = duration
+        self.max_pending = max(max_pending, batch_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._open: Dict[tuple, list] = {}  # (user_id, source) -> [app, start, end]
+        # The store has been failing for a while once this fills: the oldest spans fall off the front
+        self.pending: Deque[Dict] = deque(maxlen=self.max_pending)
+        self._last_flush = time.monotonic()
+        self._retry_at = 0.0
+
+        self.received = 0
+        self.merged = 0
+        self.dropped = 0
+        self.rows_written = 0
+        self.batches = 0
+        self.errors = 0
+        self.discarded = 0
+        self._started = None
+        self._write_ms = deque(maxlen=256)
+
+    def heartbeat(self, app: str, timestamp: Optional[float] = None, source: str = "window",
+                  user_id: Optional[int] = None):
+        """Feed one heartbeat; ``timestamp`` is epoch seconds (default: now)"""
+        ts = time.time() if timestamp is None else timestamp
+        self.received += 1
+        if self._started is None:
+            self._started = time.monotonic()
+
+        key = (user_id, source)
+        end = ts + self.duration
+        span = self._open.get(key)
+        if span is not None and span[0] == app and span[1] <= ts <= span[2] + self.pulsetime:
+            if end > span[2]:
+                span[2] = end
+            self.merged += 1
+        else:
+            if span is not None:
+                # The old app had focus until this heartbeat at the latest
+                if span[1] <= ts < span[2]:
+                    span[2] = ts
+                self._close(key, span)
+            self._open[key] = [app, ts, end]
+
+        now = time.monotonic()
+        if now >= self._retry_at and (len(self.pending) >= self.batch_size or
+                                      now - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def close(self, source: str = "window", user_id: Optional[int] = None):
+        """End the open span for a source, e.g. when tracking pauses"""
+        span = self._open.pop((user_id, source), None)
+        if span is not None:
+            self._close((user_id, source), span)
+
+    def _close(self, key, span):
+        app, start, end = span
+        if end <= start:
+            # Nothing left once cut short by the next heartbeat
+            self.dropped += 1
+            return
+        if len(self.pending) == self.max_pending:
+            self.discarded += 1
+        self.pending.append({
+            "user_id": key[0],
+            "app": app,
+            "start_time": datetime.fromtimestamp(start),
+            "end_time": datetime.fromtimestamp(end),
+        })
+
+    def flush(self, close: bool = False) -> bool:
+        """Write buffered spans; with ``close`` every open span is ended first. False if the store failed"""
+        if close:
+            for key in list(self._open):
+                self._close(key, self._open.pop(key))
+        self._last_flush = time.monotonic()
+        if not self.pending:
+            return True
+
+        batch = list(self.pending)
+        started = time.perf_counter()
+        try:
+            self.store(batch)
+        except Exception as e:
+            # Keep the batch so a later flush retries it; the deque caps how far it can grow
+            self.errors += 1
+            self._retry_at = self._last_flush + self.flush_interval
+            print(f"Error writing {len(batch)} usage spans, will retry: {e}")
+            return False
+        self._retry_at = 0.0
+        self._write_ms.append((time.perf_counter() - started) * 1000)
+        self.rows_written += len(batch)
+        self.batches += 1
+        self.pending.clear()
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """Throughput and write-latency counters for logging and benchmarks"""
+        elapsed = time.monotonic() - self._started if self._started is not None else 0.0
+        latencies = sorted(self._write_ms)
+        return {
+            "received": self.received,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "rows_written": self.rows_written,
+            "pending": len(self.pending),
+            "open_spans": len(self._open),
+            "batches": self.batches,
+            "errors": self.errors,
+            "discarded": self.discarded,
+            "heartbeats_per_sec": self.received / elapsed if elapsed > 0 else 0.0,
+            "merge_ratio": self.received / max(self.rows_written + len(self.pending), 1),
+            "write_ms_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+            "write_ms_p99": latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+            "write_ms_max": latencies[-1] if latencies else 0.0,
+        }
@@ -0,0 +1,208 @@
+# idle.py - Detect when nobody is at the machine so the session timer can pause
+import ctypes
+import ctypes.util
+import os
+import re
+import time
+from typing import Optional, Sequence
+
+
+class IdleSource:
+    """Reports how long the user has been away from the keyboard and mouse"""
+
+    name = "base"
+
+    def idle_seconds(self, now: float) -> Optional[float]:
+        """Seconds since the last input, or None if it can't be determined"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class X11IdleSource(IdleSource):
+    """Idle time from the X11 MIT-SCREEN-SAVER extension (libXss)"""
+
+    name = "x11"
+
+    class _XScreenSaverInfo(ctypes.Structure):
+        _fields_ = [
+            ("window", ctypes.c_ulong),
+            ("state", ctypes.c_int),
+            ("kind", ctypes.c_int),
+            ("til_or_since", ctypes.c_ulong),
+            ("idle", ctypes.c_ulong),
+            ("event_mask", ctypes.c_ulong),
+        ]
+
+    def __init__(self):
+        xlib_path = ctypes.util.find_library("X11")
+        xss_path = ctypes.util.find_library("Xss")
+        if not xlib_path or not xss_path or not os.environ.get("DISPLAY"):
+            raise OSError("X11 screensaver extension not available")
+
+        self._xlib = ctypes.CDLL(xlib_path)
+        self._xss = ctypes.CDLL(xss_path)
+        self._xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self._xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self._xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(self._XScreenSaverInfo)
+        self._xss.XScreenSaverQueryInfo.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(self._XScreenSaverInfo)]
+
+        self._display = self._xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("Cannot open X display")
+        self._root = self._xlib.XDefaultRootWindow(self._display)
+        # Allocated once and reused for every query
+        self._info = self._xss.XScreenSaverAllocInfo()
+
+    def idle_seconds(self, now):
+        if not self._xss.XScreenSaverQueryInfo(self._display, self._root, self._info):
+            return None
+        return self._info.contents.idle / 1000.0
+
+    def close(self):
+        if self._display:
+            self._xlib.XFree(self._info)
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+class InputInterruptSource(IdleSource):
+    """Idle time inferred from keyboard/mouse interrupt counters in /proc/interrupts.
+
+    Works without a display server; any change in the summed counters of
+    matching IRQ lines counts as user activity. Lines are matched by name on
+    every read, since rows move when IRQs are added or removed. A matching
+    line doesn't prove the keyboard uses it (USB input arrives on the
+    xhci_hcd line, shared with every other USB device), so
+    create_idle_source() only uses this source after ``probe`` has seen
+    the counters move.
+    """
+
+    name = "interrupts"
+
+    DEFAULT_DEVICES = ("i8042", "i2c_hid", "hid", "keyboard", "mouse", "touchpad")
+
+    def __init__(self, path: str = "/proc/interrupts", devices: Sequence[str] = DEFAULT_DEVICES):
+        self.path = path
+        self._pattern = re.compile("|".join(re.escape(d) for d in devices), re.IGNORECASE)
+        self._last_total = None
+        self._last_activity = time.monotonic()
+        if self._input_total() is None:
+            raise OSError("No keyboard/mouse interrupts found")
+
+    def _input_total(self) -> Optional[int]:
+        """Summed counters of the IRQ lines whose name matches, or None if none do"""
+        with open(self.path, "rb") as f:
+            lines = f.read().decode("ascii", "replace").splitlines()
+        total = None
+        for line in lines[1:]:
+            irq, _, rest = line.partition(":")
+            if not irq.strip().isdigit():
+                continue
+            fields = rest.split()
+            count = 0
+            for i, field in enumerate(fields):
+                if not field.isdigit():
+                    break
+                count += int(field)
+            else:
+                continue
+            # Match on the chip/device names after the per-CPU counts only
+            if self._pattern.search(" ".join(fields[i:])):
+                total = (total or 0) + count
+        return total
+
+    def probe(self, seconds: float, poll: float = 0.1) -> bool:
+        """Watch for up to ``seconds``; True as soon as a matching counter moves"""
+        start = self._input_total()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            time.sleep(poll)
+            if self._input_total() != start:
+                return True
+        return False
+
+    def idle_seconds(self, now):
+        total = self._input_total()
+        if total != self._last_total:
+            self._last_total = total
+            self._last_activity = now
+        return now - self._last_activity
+
+
+class FakeIdleSource(IdleSource):
+    """Scripted idle source for tests and benchmarks"""
+
+    name = "fake"
+
+    def __init__(self):
+        self._last_activity = time.monotonic()
+
+    def mark_activity(self, now: Optional[float] = None):
+        self._last_activity = time.monotonic() if now is None else now
+
+    def idle_seconds(self, now):
+        return now - self._last_activity
+
+
+def create_idle_source(probe_seconds: float = 2.0) -> Optional[IdleSource]:
+    """Return the best idle source available on this machine, if any
+
+    The interrupt fallback is only returned if its counters moved during a
+    ``probe_seconds`` window (the login click or typing usually does it);
+    a line that never changes would auto-pause someone who is typing.
+    """
+    try:
+        return X11IdleSource()
+    except (OSError, AttributeError):
+        pass
+    try:
+        source = InputInterruptSource()
+    except OSError:
+        return None
+    return source if source.probe(probe_seconds) else None
+
+
+class IdleDetector:
+    """Turns idle-time samples into debounced idle/active transitions.
+
+    The user becomes idle once input has stopped for ``idle_after`` seconds
+    and active again only when idle time drops below ``active_below``; both
+    must hold for ``confirm_samples`` consecutive samples so a single
+    spurious reading doesn't flip the state.
+    """
+
+    IDLE = "idle"
+    ACTIVE = "active"
+
+    def __init__(self, source: IdleSource, idle_after: float = 300.0,
+                 active_below: float = 10.0, confirm_samples: int = 2):
+        self.source = source
+        self.idle_after = idle_after
+        self.active_below = active_below
+        self.confirm_samples = confirm_samples
+        self.is_idle = False
+        self.last_idle_seconds = 0.0
+        self._streak = 0
+
+    def sample(self, now: Optional[float] = None) -> Optional[str]:
+        """Take one sample; returns IDLE or ACTIVE on a state change, else None"""
+        now = time.monotonic() if now is None else now
+        idle = self.source.idle_seconds(now)
+        if idle is None:
+            return None
+        self.last_idle_seconds = idle
+
+        crossing = idle < self.active_below if self.is_idle else idle >= self.idle_after
+        self._streak = self._streak + 1 if crossing else 0
+        if self._streak < self.confirm_samples:
+            return None
+
+        self._streak = 0
+        self.is_idle = not self.is_idle
+        return self.IDLE if self.is_idle else self.ACTIVE
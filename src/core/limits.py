@@ -0,0 +1,390 @@
+# limits.py - Screen-time limit rules evaluated against the live session timer
+"""
+Rules come from the user's ``limits`` preference, or from the age-based
+recommendation when there is none:
+
+    {"type": "daily_cap", "minutes": 120, "warn_at": [0.75, 0.9]}
+    {"type": "bedtime", "start": "21:00", "end": "07:00", "warn_minutes": 15}
+    {"type": "app_cap", "app": "firefox", "minutes": 60}
+    {"type": "break_cadence", "every_minutes": 45, "break_minutes": 15}
+
+Every rule compiles to thresholds on one of a few counters: screen seconds
+today, screen seconds since the last break, focus seconds per capped app
+and the time of day. LimitPlan keeps each counter's thresholds sorted.
+LimitsEngine re-arms the plan only when the timer state or the focused app
+changes, working out when the earliest pending threshold will be crossed,
+so tick() is a single comparison until that moment.
+"""
+import math
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+SCREEN = "screen"  # screen seconds today
+CONTINUOUS = "continuous"  # screen seconds since the last break
+CLOCK = "clock"  # seconds since local midnight
+APP_PREFIX = "app:"  # focus seconds today for one application
+
+WARNING = "warning"
+LIMIT = "limit"
+
+DAY_SECONDS = 24 * 3600
+CADENCE_HORIZON = 12 * 3600  # break reminders are compiled this far ahead
+
+
+def parse_clock(text: str) -> int:
+    """"21:30" -> seconds since midnight"""
+    hours, _, minutes = str(text).partition(":")
+    hours, minutes = int(hours), int(minutes or 0)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time of day: {text}")
+    return hours * 3600 + minutes * 60
+
+
+def format_duration(seconds: float) -> str:
+    minutes = max(1, int(round(seconds / 60)))
+    if minutes >= 60 and minutes % 60 == 0:
+        hours = minutes // 60
+        return f"{hours} hour{'s' if hours != 1 else ''}"
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
+
+
+class Threshold:
+    """A point on a counter where an alert fires
+
+    ``message`` may contain {left}, filled in with the time remaining to
+    ``limit`` when the alert fires. A threshold that is already behind
+    the counter when the plan is armed is only announced while the
+    counter is below ``until``.
+    """
+
+    __slots__ = ("at", "level", "message", "rule", "limit", "until")
+
+    def __init__(self, at: float, level: str, message: str, rule: str,
+                 limit: Optional[float] = None, until: float = math.inf):
+        self.at = at
+        self.level = level
+        self.message = message
+        self.rule = rule
+        self.limit = limit
+        self.until = until
+
+    def alert(self, value: float) -> Dict:
+        message = self.message
+        if self.limit is not None:
+            message = message.format(left=format_duration(self.limit - value))
+        return {"rule": self.rule, "level": self.level, "message": message}
+
+
+class Rule:
+    kind = "base"
+
+    def thresholds(self) -> List[Tuple[str, Threshold]]:
+        """(counter, threshold) pairs this rule contributes to the plan"""
+        raise NotImplementedError
+
+
+def _cap_thresholds(counter: str, kind: str, minutes: float, warn_at: Iterable[float],
+                    warning: str, limit: str) -> List[Tuple[str, Threshold]]:
+    cap = minutes * 60
+    result = [(counter, Threshold(cap * fraction, WARNING, warning, kind, limit=cap, until=cap))
+              for fraction in sorted(warn_at) if 0 < fraction < 1]
+    result.append((counter, Threshold(cap, LIMIT, limit, kind)))
+    return result
+
+
+class DailyCap(Rule):
+    kind = "daily_cap"
+
+    def __init__(self, minutes: float, warn_at: Iterable[float] = (0.8,)):
+        self.minutes = float(minutes)
+        self.warn_at = list(warn_at)
+
+    def thresholds(self):
+        return _cap_thresholds(SCREEN, self.kind, self.minutes, self.warn_at,
+                               "{left} of screen time left today",
+                               f"Daily screen time limit of {format_duration(self.minutes * 60)} reached")
+
+
+class AppCap(Rule):
+    kind = "app_cap"
+
+    def __init__(self, app: str, minutes: float, warn_at: Iterable[float] = (0.8,)):
+        self.app = app
+        self.minutes = float(minutes)
+        self.warn_at = list(warn_at)
+
+    def thresholds(self):
+        return _cap_thresholds(APP_PREFIX + self.app, self.kind, self.minutes, self.warn_at,
+                               f"{{left}} left in {self.app} today",
+                               f"Time limit for {self.app} reached")
+
+
+class Bedtime(Rule):
+    kind = "bedtime"
+
+    def __init__(self, start: str, end: str, warn_minutes: float = 15):
+        self.start = parse_clock(start)
+        self.end = parse_clock(end)
+        self.warn = warn_minutes * 60
+
+    def thresholds(self):
+        message = "It's bedtime - time to stop for today"
+        result = []
+        if self.warn > 0:
+            warn_at = self.start - self.warn
+            result.append((CLOCK, Threshold(warn_at % DAY_SECONDS, WARNING, "Bedtime in {left}", self.kind,
+                                            limit=self.start if warn_at >= 0 else self.start + DAY_SECONDS,
+                                            until=self.start if warn_at >= 0 else DAY_SECONDS)))
+        if self.end > self.start:
+            result.append((CLOCK, Threshold(self.start, LIMIT, message, self.kind, until=self.end)))
+        else:
+            # Past midnight: one window to the end of the day, another from midnight
+            result.append((CLOCK, Threshold(self.start, LIMIT, message, self.kind, until=DAY_SECONDS)))
+            if self.end:
+                result.append((CLOCK, Threshold(0, LIMIT, message, self.kind, until=self.end)))
+        return result
+
+
+class BreakCadence(Rule):
+    kind = "break_cadence"
+
+    def __init__(self, every_minutes: float = 45, break_minutes: float = 15):
+        if every_minutes <= 0:
+            raise ValueError("every_minutes must be positive")
+        self.every = every_minutes * 60
+        self.break_seconds = break_minutes * 60
+
+    def thresholds(self):
+        message = ("You've been on screen for {on} - take a break of at least "
+                   + format_duration(self.break_seconds))
+        count = int(CADENCE_HORIZON // self.every) or 1
+        return [(CONTINUOUS, Threshold(self.every * n, LIMIT,
+                                       message.replace("{on}", format_duration(self.every * n)), self.kind))
+                for n in range(1, count + 1)]
+
+
+RULE_TYPES = {cls.kind: cls for cls in (DailyCap, AppCap, Bedtime, BreakCadence)}
+
+
+def rule_from_dict(spec: Dict) -> Rule:
+    spec = dict(spec)
+    kind = spec.pop("type", None)
+    if kind not in RULE_TYPES:
+        raise ValueError(f"Unknown limit rule: {kind}")
+    try:
+        return RULE_TYPES[kind](**spec)
+    except TypeError as e:
+        raise ValueError(f"Invalid {kind} rule: {e}")
+
+
+def default_rules(recommendation) -> List[Rule]:
+    """A daily cap and break cadence from an age-based Recommendation (src/core/recommendations.py)"""
+    break_minutes = recommendation.break_minutes_per_hour
+    rules: List[Rule] = [BreakCadence(60 - break_minutes, break_minutes)] if 0 < break_minutes < 60 else []
+    if recommendation.screen_hours > 0:
+        rules.insert(0, DailyCap(recommendation.screen_hours * 60))
+    return rules
+
+
+class LimitPlan:
+    """Every rule's thresholds, grouped by counter and sorted"""
+
+    def __init__(self, rules: Iterable):
+        self.rules = [rule_from_dict(rule) if isinstance(rule, dict) else rule for rule in rules]
+        grouped: Dict[str, List[Threshold]] = {}
+        for rule in self.rules:
+            for counter, threshold in rule.thresholds():
+                grouped.setdefault(counter, []).append(threshold)
+        self.thresholds = {counter: sorted(items, key=lambda t: t.at) for counter, items in grouped.items()}
+        self.offsets = {counter: [t.at for t in items] for counter, items in self.thresholds.items()}
+        # A pause shorter than every cadence rule's break doesn't reset the continuous counter
+        self.min_break = min((rule.break_seconds for rule in self.rules if isinstance(rule, BreakCadence)),
+                             default=0)
+
+
+def _day_bounds(now: float) -> Tuple[float, float]:
+    start = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start.timestamp(), (start + timedelta(days=1)).timestamp()
+
+
+class LimitsEngine:
+    """Tracks the counters for one user and reports thresholds as they are crossed
+
+    Feed it the overlay's liveState() on every stateChanged, the focused
+    app from the usage sampler and today's stored totals; call tick()
+    as often as you like. Each call returns a list of alert dicts
+    ({"rule", "level", "message"}); when several thresholds on a counter
+    are crossed at once only the furthest one is reported.
+    """
+
+    def __init__(self, rules, clock: Callable[[], float] = time.time):
+        self.plan = rules if isinstance(rules, LimitPlan) else LimitPlan(rules)
+        self.clock = clock
+        self.cursors = {counter: 0 for counter in self.plan.thresholds}
+        self.phase = "stopped"
+        self.main = 0.0  # session screen seconds at main_at
+        self.main_at = 0.0
+        self.saved = 0.0  # screen seconds today from sessions already stored
+        self.session_offset = 0.0  # screen seconds of the current session that belong to an earlier day
+        self.break_anchor = 0.0  # session screen seconds when the last long enough break ended
+        self.break_started = None
+        self.app = None
+        self.app_since = 0.0
+        self.app_seconds: Dict[str, float] = {}
+        self.day_start, self.day_end = _day_bounds(clock())
+        self.next_at = math.inf
+        self.ticks = 0
+        self.evaluations = 0
+        self.alerts = 0
+
+    @property
+    def running(self) -> bool:
+        return self.phase == "running"
+
+    # -- counters -------------------------------------------------------------------
+
+    def _main_now(self, now: float) -> float:
+        return self.main + (now - self.main_at if self.running else 0)
+
+    def _app_counter(self) -> Optional[str]:
+        return APP_PREFIX + self.app if self.app else None
+
+    def value(self, counter: str, now: Optional[float] = None) -> float:
+        now = self.clock() if now is None else now
+        if counter == SCREEN:
+            return self.saved + self._main_now(now) - self.session_offset
+        if counter == CONTINUOUS:
+            return self._main_now(now) - self.break_anchor
+        if counter == CLOCK:
+            moment = datetime.fromtimestamp(now)
+            return moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1e6
+        seconds = self.app_seconds.get(counter, 0.0)
+        if self.running and counter == self._app_counter():
+            seconds += now - self.app_since
+        return seconds
+
+    def _advancing(self, counter: str) -> bool:
+        if counter == CLOCK:
+            return True
+        if counter.startswith(APP_PREFIX):
+            return self.running and counter == self._app_counter()
+        return self.running
+
+    def _fold_app(self, now: float):
+        """Bank the focused app's time before the app or the running state changes"""
+        counter = self._app_counter()
+        if self.running and counter in self.cursors:
+            self.app_seconds[counter] = self.app_seconds.get(counter, 0.0) + now - self.app_since
+        self.app_since = now
+
+    # -- inputs ---------------------------------------------------------------------
+
+    def set_usage(self, screen_seconds: float, app_seconds: Optional[Dict[str, float]] = None,
+                  now: Optional[float] = None) -> List[Dict]:
+        """Today's stored totals: screen seconds of finished sessions and focus seconds per app"""
+        now = self.clock() if now is None else now
+        self._fold_app(now)
+        self.saved = float(screen_seconds)
+        self.app_seconds = {APP_PREFIX + app: float(seconds) for app, seconds in (app_seconds or {}).items()
+                            if APP_PREFIX + app in self.cursors}
+        return self._arm(now, self.cursors)
+
+    def update_state(self, state: Dict, now: Optional[float] = None) -> List[Dict]:
+        """Take a liveState() dict from the session timer"""
+        now = self.clock() if now is None else now
+        self._fold_app(now)
+        phase = state["phase"]
+        main = state["main_ms"] / 1000
+        if phase == "running" and state.get("at"):
+            main += max(0.0, now - state["at"] / 1000)
+        previous = self.phase
+        if phase == "stopped" and main == 0 and self.main:
+            # The session was saved and reset; its time now counts as stored usage
+            self.saved += max(0.0, self._main_now(now) - self.session_offset)
+            self.session_offset = self.break_anchor = 0.0
+        if phase == "break" and previous != "break":
+            self.break_started = now
+        elif phase == "running" and previous == "break":
+            if self.break_started is not None and now - self.break_started >= self.plan.min_break:
+                self.break_anchor = main
+            self.break_started = None
+        self.phase, self.main, self.main_at = phase, main, now
+        return self._arm(now, self.cursors if self.running and previous != "running" else ())
+
+    def set_app(self, app: Optional[str], now: Optional[float] = None) -> List[Dict]:
+        """The application that has focus now (None when unknown)"""
+        if app == self.app:
+            return []
+        now = self.clock() if now is None else now
+        self._fold_app(now)
+        self.app = app
+        counter = self._app_counter()
+        return self._arm(now, (counter,) if self.running and counter in self.cursors else ())
+
+    # -- evaluation -----------------------------------------------------------------
+
+    def tick(self, now: Optional[float] = None) -> List[Dict]:
+        """Alerts for thresholds crossed since the last call; O(1) until one is due"""
+        now = self.clock() if now is None else now
+        self.ticks += 1
+        if now < self.next_at:
+            return []
+        if now >= self.day_end:
+            self._new_day(now)
+            return self._arm(now, self.cursors)
+        self.evaluations += 1
+        alerts = []
+        for counter, cursor in self.cursors.items():
+            thresholds = self.plan.thresholds[counter]
+            if cursor == len(thresholds):
+                continue
+            value = self.value(counter, now)
+            crossed = cursor
+            while crossed < len(thresholds) and thresholds[crossed].at <= value:
+                crossed += 1
+            if crossed > cursor:
+                self.cursors[counter] = crossed
+                self._report(alerts, thresholds[crossed - 1], value)
+        self._schedule(now)
+        return alerts
+
+    def _report(self, alerts: List[Dict], threshold: Threshold, value: float):
+        if self.running and value < threshold.until:
+            alerts.append(threshold.alert(value))
+            self.alerts += 1
+
+    def _arm(self, now: float, announce: Iterable[str]) -> List[Dict]:
+        """Point each counter at its next threshold; counters in ``announce`` report one already passed"""
+        if now >= self.day_end:
+            self._new_day(now)
+            announce = self.cursors
+        self.evaluations += 1
+        announce = set(announce)
+        alerts = []
+        for counter, offsets in self.plan.offsets.items():
+            value = self.value(counter, now)
+            cursor = self.cursors[counter] = bisect_right(offsets, value)
+            if cursor and counter in announce:
+                self._report(alerts, self.plan.thresholds[counter][cursor - 1], value)
+        self._schedule(now)
+        return alerts
+
+    def _schedule(self, now: float):
+        next_at = self.day_end
+        for counter, cursor in self.cursors.items():
+            thresholds = self.plan.thresholds[counter]
+            if cursor < len(thresholds) and self._advancing(counter):
+                # Every counter advances one second per second while it advances at all
+                next_at = min(next_at, now + thresholds[cursor].at - self.value(counter, now))
+        self.next_at = next_at
+
+    def _new_day(self, now: float):
+        self._fold_app(now)
+        self.day_start, self.day_end = _day_bounds(now)
+        # Screen time since midnight belongs to the new day, the rest of the session to the old one
+        since_midnight = now - self.day_start if self.running else 0.0
+        self.session_offset = max(0.0, self._main_now(now) - since_midnight)
+        self.saved = 0.0
+        self.app_seconds = {}
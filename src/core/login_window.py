@@ -3,6 +3,8 @@ from tkinter import ttk, messagebox
 import tkinter.font as tkFont
 import sys
 import os
+import time
+from collections import deque
 
 # Add the parent directory to the Python path to import auth module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,7 +26,94 @@ except ImportError:
         def hash_password(password):
             return password
 
+class NotificationToast:
+    """Reusable notification bar with a message queue.
+
+    The frame and label are created once and only re-configured. It is
+    overlaid with place() so showing it doesn't re-layout the card, and a
+    single pending after() job decides when the current message is done.
+    """
+    
+    MAX_QUEUED = 5
+    
+    def __init__(self, root, container, colors, font, min_display_ms=800):
+        self.root = root
+        self.colors = colors
+        self.min_display_ms = min_display_ms
+        self.queue = deque(maxlen=self.MAX_QUEUED)
+        self.current = None  # (message, type, duration) on screen
+        self._shown_at = 0.0
+        self._hide_job = None
+        
+        self.frame = tk.Frame(container, bg=colors['info'], height=40)
+        self.label = tk.Label(self.frame,
+                              text="",
+                              font=font,
+                              fg='white',
+                              bg=colors['info'])
+        self.label.pack(expand=True, fill='both', padx=10, pady=8)
+        
+    def show(self, message, type='info', duration=3000):
+        """Show a message now, or queue it behind the one on screen"""
+        toast = (message, type, duration)
+        if self.current is None:
+            self._display(toast)
+        elif toast[:2] == self.current[:2] and not self.queue:
+            # Same message again (e.g. repeated failed logins): just keep it up
+            self._schedule(duration)
+        elif not self.queue or self.queue[-1][:2] != toast[:2]:
+            self.queue.append(toast)
+            # Let the current message finish its minimum time, then move on
+            elapsed = (time.monotonic() - self._shown_at) * 1000
+            self._schedule(max(0, int(self.min_display_ms - elapsed)))
+            
+    def hide(self):
+        """Hide the bar and drop anything still queued"""
+        self.queue.clear()
+        self._cancel()
+        self.current = None
+        self.frame.place_forget()
+        
+    def _display(self, toast):
+        message, type, duration = toast
+        bg_color = {
+            'success': self.colors['success'],
+            'error': self.colors['error'],
+            'warning': self.colors['warning'],
+            'info': self.colors['info']
+        }.get(type, self.colors['info'])
+        
+        self.frame.configure(bg=bg_color)
+        self.label.configure(bg=bg_color, text=message)
+        if self.current is None:
+            self.frame.place(relx=0, rely=0, relwidth=1)
+            self.frame.lift()
+        self.current = toast
+        self._shown_at = time.monotonic()
+        self._schedule(duration)
+        
+    def _schedule(self, delay):
+        self._cancel()
+        self._hide_job = self.root.after(delay, self._advance)
+        
+    def _cancel(self):
+        if self._hide_job is not None:
+            self.root.after_cancel(self._hide_job)
+            self._hide_job = None
+            
+    def _advance(self):
+        self._hide_job = None
+        if self.queue:
+            self._display(self.queue.popleft())
+        else:
+            self.current = None
+            self.frame.place_forget()
+
+
 class ModernMomApp:
+    # Motion events are coalesced into at most one geometry update per frame
+    FRAME_MS = 16
+
     def __init__(self, parent_app=None):
         self.parent_app = parent_app  # Reference to main application
         self.root = tk.Tk()
@@ -40,6 +129,7 @@ class ModernMomApp:
         self._dragging = False
         
         # For window resizing
+        self._resizing = False
         self._resize_edge = None
         self._resize_start_x = 0
         self._resize_start_y = 0
@@ -47,16 +137,26 @@ class ModernMomApp:
         self._resize_start_height = 0
         self.edge_size = 8  # Pixels from edge to trigger resize
         
+        # Cached window geometry, refreshed from <Configure> instead of winfo_* queries
+        self._min_width, self._min_height = self.root.minsize()
+        self._win_x = self.root.winfo_x()
+        self._win_y = self.root.winfo_y()
+        self._win_width = self.root.winfo_width()
+        self._win_height = self.root.winfo_height()
+        self._cursor_edge = ''
+        
+        # Latest requested geometry and the pending per-frame flush
+        self._pending_geometry = None
+        self._geometry_job = None
+        self.geometry_updates = 0  # Number of root.geometry() calls, for profiling
+        self.root.bind('<Configure>', self.on_configure, add='+')
+        
         # Track login status
         self.login_successful = False
         
         # Handle window close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_window_close)
         
-        # Notification system
-        self.notification_frame = None
-        self.notification_label = None
-        
     def setup_window(self):
         self.root.title("Mom App - Login")
         self.root.geometry("450x700")  # Increased height from 640 to 700
@@ -152,52 +252,26 @@ class ModernMomApp:
         self.show_login_form()
         
     def create_notification_area(self):
-        """Create the notification area that slides down from the top"""
+        """Create the notification toast that overlays the top of the window"""
         try:
-            self.notification_frame = tk.Frame(self.main_container, 
-                                             bg=self.colors['info'],
-                                             height=40)
-            
-            self.notification_label = tk.Label(self.notification_frame,
-                                             text="",
-                                             font=self.fonts['notification'],
-                                             fg='white',
-                                             bg=self.colors['info'])
-            self.notification_label.pack(expand=True, fill='both', padx=10, pady=8)
-            
-            # Don't pack initially - will be shown when needed
+            self.toast = NotificationToast(self.root, self.main_container,
+                                           self.colors, self.fonts['notification'])
         except Exception as e:
             print(f"Error creating notification area: {e}")
-            self.notification_frame = None
-            self.notification_label = None
+            self.toast = None
         
     def show_notification(self, message, type='info', duration=3000):
         """Show a notification at the top of the window"""
         # Check if notification area exists
-        if not self.notification_frame or not self.notification_label:
+        if not self.toast:
             print(f"Notification: [{type}] {message}")
             return
-            
-        # Set the background color based on type
-        bg_color = {
-            'success': self.colors['success'],
-            'error': self.colors['error'],
-            'warning': self.colors['warning'],
-            'info': self.colors['info']
-        }.get(type, self.colors['info'])
-        
-        self.notification_frame.configure(bg=bg_color)
-        self.notification_label.configure(bg=bg_color, text=message)
-        
-        # Show the notification
-        self.notification_frame.pack(fill='x', before=self.main_container.winfo_children()[0])
-        
-        # Auto-hide after duration
-        self.root.after(duration, self.hide_notification)
+        self.toast.show(message, type, duration)
         
     def hide_notification(self):
         """Hide the notification"""
-        self.notification_frame.pack_forget()
+        if self.toast:
+            self.toast.hide()
         
     def create_title_bar(self):
         # Custom title bar
@@ -294,19 +368,41 @@ class ModernMomApp:
         icon_label.bind('<B1-Motion>', self.drag_window)
         icon_label.bind('<ButtonRelease-1>', self.stop_drag)
         
+    def on_configure(self, event):
+        """Keep the cached window geometry in sync"""
+        if event.widget is self.root:
+            self._win_x, self._win_y = event.x, event.y
+            self._win_width, self._win_height = event.width, event.height
+        
+    def request_geometry(self, geometry):
+        """Queue a geometry change; only the latest one per frame is applied"""
+        self._pending_geometry = geometry
+        if self._geometry_job is None:
+            self._geometry_job = self.root.after(self.FRAME_MS, self.flush_geometry)
+            
+    def flush_geometry(self):
+        if self._geometry_job is not None:
+            self.root.after_cancel(self._geometry_job)
+            self._geometry_job = None
+        if self._pending_geometry is not None:
+            self.root.geometry(self._pending_geometry)
+            self.geometry_updates += 1
+            self._pending_geometry = None
+        
     def start_drag(self, event):
         self._dragging = True
-        self._drag_start_x = event.x
-        self._drag_start_y = event.y
+        self._drag_start_x = event.x_root - self._win_x
+        self._drag_start_y = event.y_root - self._win_y
         
     def drag_window(self, event):
         if self._dragging:
-            x = self.root.winfo_x() - self._drag_start_x + event.x
-            y = self.root.winfo_y() - self._drag_start_y + event.y
-            self.root.geometry(f"+{x}+{y}")
+            x = event.x_root - self._drag_start_x
+            y = event.y_root - self._drag_start_y
+            self.request_geometry(f"+{x}+{y}")
         
     def stop_drag(self, event):
         self._dragging = False
+        self.flush_geometry()
         
     def minimize_window(self):
         self.root.iconify()
@@ -329,15 +425,18 @@ class ModernMomApp:
         
     def check_resize_cursor(self, event):
         """Change cursor when near window edges"""
-        if hasattr(self, '_resizing') and self._resizing:
+        if self._resizing or self._dragging:
             return
             
-        x, y = event.x, event.y
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        # Child widgets report their own coordinates; hit-test against the window
+        x = event.x_root - self._win_x
+        y = event.y_root - self._win_y
         
         # Determine which edge we're near
-        edge = self.get_edge(x, y, width, height)
+        edge = self.get_edge(x, y, self._win_width, self._win_height)
+        if edge == self._cursor_edge:
+            return  # Cursor already correct, skip the reconfigure
+        self._cursor_edge = edge
         
         # Set appropriate cursor
         cursors = {
@@ -373,29 +472,27 @@ class ModernMomApp:
         
     def start_resize(self, event):
         """Start resizing if on edge"""
-        x, y = event.x, event.y
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        x = event.x_root - self._win_x
+        y = event.y_root - self._win_y
+        width = self._win_width
+        height = self._win_height
         
         self._resize_edge = self.get_edge(x, y, width, height)
         
         if self._resize_edge:
             self._resizing = True
-            self._resize_start_x = self.root.winfo_pointerx()
-            self._resize_start_y = self.root.winfo_pointery()
+            self._resize_start_x = event.x_root
+            self._resize_start_y = event.y_root
             self._resize_start_width = width
             self._resize_start_height = height
-            self._resize_start_root_x = self.root.winfo_x()
-            self._resize_start_root_y = self.root.winfo_y()
+            self._resize_start_root_x = self._win_x
+            self._resize_start_root_y = self._win_y
             
     def do_resize(self, event):
         """Handle window resizing"""
-        if hasattr(self, '_resizing') and self._resizing and self._resize_edge:
-            x = self.root.winfo_pointerx()
-            y = self.root.winfo_pointery()
-            
-            dx = x - self._resize_start_x
-            dy = y - self._resize_start_y
+        if self._resizing and self._resize_edge:
+            dx = event.x_root - self._resize_start_x
+            dy = event.y_root - self._resize_start_y
             
             new_width = self._resize_start_width
             new_height = self._resize_start_height
@@ -404,20 +501,22 @@ class ModernMomApp:
             
             # Calculate new dimensions based on edge
             if 'right' in self._resize_edge:
-                new_width = max(self.root.minsize()[0], self._resize_start_width + dx)
+                new_width = max(self._min_width, self._resize_start_width + dx)
             if 'left' in self._resize_edge:
-                new_width = max(self.root.minsize()[0], self._resize_start_width - dx)
+                new_width = max(self._min_width, self._resize_start_width - dx)
                 new_x = self._resize_start_root_x + (self._resize_start_width - new_width)
             if 'bottom' in self._resize_edge:
-                new_height = max(self.root.minsize()[1], self._resize_start_height + dy)
+                new_height = max(self._min_height, self._resize_start_height + dy)
             if 'top' in self._resize_edge:
-                new_height = max(self.root.minsize()[1], self._resize_start_height - dy)
+                new_height = max(self._min_height, self._resize_start_height - dy)
                 new_y = self._resize_start_root_y + (self._resize_start_height - new_height)
                 
-            self.root.geometry(f"{new_width}x{new_height}+{new_x}+{new_y}")
+            self.request_geometry(f"{new_width}x{new_height}+{new_x}+{new_y}")
             
     def stop_resize(self, event):
         """Stop resizing"""
+        if self._resizing:
+            self.flush_geometry()
         self._resizing = False
         self._resize_edge = None
         
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, BigInteger, Boolean, String, Date, DateTime, Text, ForeignKey, Index
 from datetime import datetime
 import hashlib
 
@@ -26,4 +26,105 @@ class User(Base):
         return self.password_hash == hashlib.sha256(password.encode()).hexdigest()
     
     def __repr__(self):
-        return f'<User {self.username}>'
\ No newline at end of file
+        return f'<User {self.username}>'
+
+
+class SessionRecord(Base):
+    __tablename__ = 'sessions'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'))
+    start_time = Column(DateTime)
+    screen_time = Column(Integer)  # Minutes
+    break_time = Column(Integer)  # Minutes
+
+    def __repr__(self):
+        return f'<SessionRecord user={self.user_id} start={self.start_time}>'
+
+
+class AppUsageSpan(Base):
+    """Run-length encoded focus time: one row per stretch in a single application"""
+    __tablename__ = 'app_usage'
+    __table_args__ = (Index('ix_app_usage_user_start', 'user_id', 'start_time'),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'))
+    app = Column(String(64), nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<AppUsageSpan {self.app} {self.start_time}-{self.end_time}>'
+
+
+
+class FamilyLink(Base):
+    """A parent account that can see a child account's usage, once the link is approved"""
+    __tablename__ = 'family_links'
+    __table_args__ = (Index('ix_family_links_child', 'child_id'),)
+
+    parent_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    child_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    status = Column(String(10), nullable=False, default='pending', server_default='pending')  # pending, approved, declined
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<FamilyLink parent={self.parent_id} child={self.child_id} {self.status}>'
+
+class UsageDaily(Base):
+    """Screen and break seconds per user per calendar day, maintained by src/core/rollups.py"""
+    __tablename__ = 'usage_daily'
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    screen_seconds = Column(Integer, nullable=False, default=0)
+    break_seconds = Column(Integer, nullable=False, default=0)
+    sessions = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<UsageDaily user={self.user_id} day={self.day}>'
+
+
+class UsageHourly(Base):
+    """Screen and break seconds per user per hour of the week (0 = Monday 00:00)"""
+    __tablename__ = 'usage_hourly'
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    week_start = Column(Date, primary_key=True)
+    hour_of_week = Column(Integer, primary_key=True)
+    screen_seconds = Column(Integer, nullable=False, default=0)
+    break_seconds = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<UsageHourly user={self.user_id} week={self.week_start} hour={self.hour_of_week}>'
+
+
+class SyncRecord(Base):
+    """Latest replicated version of one synced item (a session, a preference, a content list).
+
+    ``hlc`` is the hybrid logical clock of the write and ``node`` the device
+    that made it; the higher (hlc, node) pair wins a conflict.
+    """
+    __tablename__ = 'sync_records'
+    __table_args__ = (Index('ix_sync_records_hlc', 'hlc'),)
+
+    collection = Column(String(32), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    hlc = Column(BigInteger, nullable=False)
+    node = Column(String(32), nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    payload = Column(Text)  # JSON; NULL for deletions
+
+    def __repr__(self):
+        return f'<SyncRecord {self.collection}/{self.key} @{self.hlc}>'
+
+
+class SyncState(Base):
+    """Sync bookkeeping: this device's node id, version vectors and capture marks"""
+    __tablename__ = 'sync_state'
+
+    name = Column(String(128), primary_key=True)
+    value = Column(Text, nullable=False)
+
+    def __repr__(self):
+        return f'<SyncState {self.name}>'
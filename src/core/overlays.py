@@ -1,9 +1,10 @@
 import datetime
+import time
 from email.mime import application
-from PyQt5.QtCore import Qt, QTimer, QTime, pyqtSignal, QThread
+from PyQt5.QtCore import Qt, QTimer, QTime, pyqtSignal, QThread, QRect, QSize, QSocketNotifier
 from PyQt5.QtWidgets import QLabel, QWidget, QVBoxLayout, QApplication
 from PyQt5.QtMultimedia import QSound
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtGui import QFont, QColor, QFontMetrics, QPainter, QPixmap
 
 class DraggableOverlay(QWidget):
     def __init__(self, syncOverlay = None):
@@ -41,10 +42,146 @@ class DraggableOverlay(QWidget):
 
         self.setGeometry(rect)
 
+class ClockFace(QWidget):
+    """Clock text painted from cached per-glyph pixmaps.
+
+    Glyphs are rendered once per (font, color, device pixel ratio) and the
+    widget only repaints the cells whose character changed, so a tick costs
+    one or two small pixmap blits instead of a full text layout.
+    """
+
+    GLYPHS = "0123456789:"
+
+    def __init__(self, text="", parent=None):
+        super().__init__(parent)
+        self._text = text
+        self._font = QFont()
+        self._color = QColor('white')
+        self._glyphs = None  # char -> QPixmap for the current key
+        self._glyph_key = None
+        self._cache = {}  # (font key, rgba, dpr) -> glyph dict
+        self._cells = []  # QRect per character of the current text
+
+    def setFont(self, font):
+        self._font = QFont(font)
+        self._refresh()
+
+    def setColor(self, color):
+        self._color = QColor(color)
+        self._refresh()
+
+    def invalidate(self):
+        """Drop every cached glyph set (font or color settings changed)"""
+        self._cache.clear()
+        self._glyphs = None
+        self._glyph_key = None
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        if text == self._text:
+            return
+        old = self._text
+        self._text = text
+        if len(old) != len(text):
+            self._layoutCells()
+            self.update()
+            return
+        for i, (before, after) in enumerate(zip(old, text)):
+            if before != after:
+                self.update(self._cells[i])
+
+    def _refresh(self):
+        self._ensureGlyphs()
+        self._layoutCells()
+        self.updateGeometry()
+        self.update()
+
+    def _ensureGlyphs(self):
+        dpr = self.devicePixelRatioF()
+        key = (self._font.key(), self._color.rgba(), dpr)
+        if key == self._glyph_key and self._glyphs is not None:
+            return
+        glyphs = self._cache.get(key)
+        if glyphs is None:
+            glyphs = self._renderGlyphs(self.GLYPHS, dpr)
+            self._cache[key] = glyphs
+        self._glyphs = glyphs
+        self._glyph_key = key
+
+    def _renderGlyphs(self, chars, dpr):
+        metrics = QFontMetrics(self._font)
+        # Digits share one advance so the clock doesn't jitter as they change
+        digit_width = max(metrics.horizontalAdvance(c) for c in "0123456789")
+        height = metrics.height()
+        glyphs = {}
+        for char in chars:
+            width = digit_width if char.isdigit() else metrics.horizontalAdvance(char)
+            pixmap = QPixmap(int(width * dpr), int(height * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self._font)
+            painter.setPen(self._color)
+            painter.drawText(QRect(0, 0, width, height), Qt.AlignCenter, char)
+            painter.end()
+            glyphs[char] = pixmap
+        return glyphs
+
+    def _glyph(self, char):
+        pixmap = self._glyphs.get(char)
+        if pixmap is None:
+            # Not a clock character; render it on demand into the same set
+            self._glyphs.update(self._renderGlyphs(char, self.devicePixelRatioF()))
+            pixmap = self._glyphs[char]
+        return pixmap
+
+    def _glyphSize(self, char):
+        pixmap = self._glyph(char)
+        dpr = pixmap.devicePixelRatio()
+        return int(pixmap.width() / dpr), int(pixmap.height() / dpr)
+
+    def _layoutCells(self):
+        self._ensureGlyphs()
+        sizes = [self._glyphSize(c) for c in self._text]
+        total = sum(w for w, _ in sizes)
+        x = (self.width() - total) // 2
+        self._cells = []
+        for w, h in sizes:
+            self._cells.append(QRect(x, (self.height() - h) // 2, w, h))
+            x += w
+
+    def sizeHint(self):
+        self._ensureGlyphs()
+        sizes = [self._glyphSize(c) for c in self._text] or [(0, 0)]
+        return QSize(sum(w for w, _ in sizes), max(h for _, h in sizes))
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def resizeEvent(self, event):
+        self._layoutCells()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        self._ensureGlyphs()
+        if len(self._cells) != len(self._text):
+            self._layoutCells()
+        painter = QPainter(self)
+        dirty = event.rect()
+        for char, cell in zip(self._text, self._cells):
+            if dirty.intersects(cell):
+                painter.drawPixmap(cell.topLeft(), self._glyph(char))
+        painter.end()
+
+
 class TimeOverlay(DraggableOverlay):
     breakTimeUpdated = pyqtSignal(str)
     totalBreakTimeUpdated = pyqtSignal(str)
     resetRequested = pyqtSignal()
+    autoPauseChanged = pyqtSignal(bool)
+    stateChanged = pyqtSignal(dict)  # liveState() after every start/pause/break/reset
 
     def __init__(self, shared_settings, user_id=None):
         self.user_id = user_id
@@ -66,8 +203,12 @@ class TimeOverlay(DraggableOverlay):
         self.mainElapsedTime = 0
         self.breakElapsedTime = 0
         self.totalBreakTime = 0
+        self.sessionStartedAt = None  # wall-clock start of the current session
         
         self.opacity = 1.0
+        self.journal = None
+        self.idleDetector = None
+        self.autoPaused = False
         
         self.initUI()
 
@@ -75,48 +216,56 @@ class TimeOverlay(DraggableOverlay):
         self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
 
-        self.timerLabel = QLabel("00:00:00", self)
-        self.timerLabel.setFont(QFont('MODERN WARFARE', 30))
-        self.timerLabel.setStyleSheet("QLabel { color: white; }")
+        self.clockFace = ClockFace("00:00:00", self)
         self.applySettings()
-        self.timerLabel.setAlignment(Qt.AlignCenter)
         
         layout = QVBoxLayout(self)
-        layout.addWidget(self.timerLabel)
+        layout.addWidget(self.clockFace)
         self.setLayout(layout)
         self.setGeometry(100, 100, 200, 100)
         self.show()
 
     def applySettings(self):
-        self.timerLabel.setFont(self.shared_settings['font'])
-        self.timerLabel.setStyleSheet(f"QLabel {{ color: {self.shared_settings['color']}; }}")
+        # Settings may have changed; re-render the glyph cache
+        self.clockFace.invalidate()
+        self.clockFace.setFont(self.shared_settings['font'])
+        self.clockFace.setColor(self.shared_settings['color'])
         self.setWindowOpacity(self.shared_settings['opacity'])
     
     def startTimer(self):
         if not self.running:
+            if self.sessionStartedAt is None:
+                self.sessionStartedAt = datetime.datetime.now()
             self.mainStartTime = QTime.currentTime()
             self.mainTimer.start(1000)
             self.running = True
+            self.checkpoint()
+            self.publishState()
             
     def resetTimer(self):
         # Stop the main and break timers if they are running
         self.mainTimer.stop()
         self.breakTimer.stop()
+        self.save_session()
 
         # Reset all time-tracking variables
         self.mainElapsedTime = 0
         self.breakElapsedTime = 0
         self.totalBreakTime = 0
+        self.sessionStartedAt = None
         self.isBreak = False
         self.running = False
+        self.autoPaused = False
 
         # Update UI elements to reflect the reset
-        self.timerLabel.setText("00:00:00")
+        self.clockFace.setText("00:00:00")
         self.breakTimeUpdated.emit("Current Break: 00:00:00")
         self.totalBreakTimeUpdated.emit("Total Break: 00:00:00")
 
         # Send a signal to other parts of the app to handle the reset
         self.resetRequested.emit()
+        self.checkpoint()
+        self.publishState()
 
 
     def pauseTimer(self):
@@ -125,6 +274,8 @@ class TimeOverlay(DraggableOverlay):
             self.mainTimer.stop()
             self.running = False
             self.startBreak()
+            self.checkpoint()
+            self.publishState()
 
     def startBreak(self):
         if not self.isBreak:
@@ -137,6 +288,8 @@ class TimeOverlay(DraggableOverlay):
             self.mainStartTime = QTime.currentTime()
             self.mainTimer.start(1000)
             self.running = True
+            self.checkpoint()
+            self.publishState()
             
     def endBreak(self):
         if self.isBreak:
@@ -156,7 +309,8 @@ class TimeOverlay(DraggableOverlay):
             current_time = self.mainStartTime.msecsTo(QTime.currentTime())
             total_time = self.mainElapsedTime + current_time
             time_str = QTime(0, 0).addMSecs(total_time).toString("hh:mm:ss")
-            self.timerLabel.setText(time_str)
+            self.clockFace.setText(time_str)
+            self.checkpoint()
 
     def updateBreakDisplay(self):
         if self.isBreak:
@@ -168,6 +322,103 @@ class TimeOverlay(DraggableOverlay):
             self.totalBreakTime += current_break_time
             total_break_time_str = QTime(0, 0).addMSecs(self.totalBreakTime).toString("hh:mm:ss")
             self.totalBreakTimeUpdated.emit("Total Break: " + total_break_time_str)
+            self.checkpoint()
+
+    def enableIdleDetection(self, detector, interval_ms=5000):
+        """Pause the session automatically while the user is away"""
+        self.idleDetector = detector
+        if not hasattr(self, 'idleTimer'):
+            self.idleTimer = QTimer(self)
+            self.idleTimer.timeout.connect(self.sampleIdle)
+        self.idleTimer.start(interval_ms)
+
+    def sampleIdle(self):
+        transition = self.idleDetector.sample()
+        if transition == self.idleDetector.IDLE and self.running:
+            self.pauseTimer()
+            # The idle threshold itself was time away from the screen, not usage
+            away_ms = int(self.idleDetector.last_idle_seconds * 1000)
+            away_ms = min(away_ms, self.mainElapsedTime)
+            self.mainElapsedTime -= away_ms
+            self.breakElapsedTime += away_ms
+            self.totalBreakTime += away_ms
+            self.autoPaused = True
+            self.autoPauseChanged.emit(True)
+            self.publishState()
+        elif transition == self.idleDetector.ACTIVE and self.autoPaused:
+            self.autoPaused = False
+            self.endBreak()
+            self.autoPauseChanged.emit(False)
+            self.publishState()
+
+    def attachJournal(self, journal):
+        """Checkpoint timer state to the given TimerJournal on every tick"""
+        self.journal = journal
+
+    def snapshot(self):
+        """Return the current timer state as a plain dict"""
+        main_elapsed = self.mainElapsedTime
+        if self.running:
+            main_elapsed += self.mainStartTime.msecsTo(QTime.currentTime())
+        return {
+            'main_ms': main_elapsed,
+            'break_ms': self.breakElapsedTime,
+            'total_break_ms': self.totalBreakTime,
+            'running': self.running,
+            'is_break': self.isBreak,
+            'started_at': self.sessionStartedAt.timestamp() if self.sessionStartedAt else None,
+        }
+
+    def liveState(self):
+        """Timer state for remote displays; they extrapolate from 'at' between updates"""
+        state = self.snapshot()
+        if self.isBreak and self.breakStartTime is not None:
+            in_break = self.breakStartTime.msecsTo(QTime.currentTime())
+            state['break_ms'] += in_break
+            state['total_break_ms'] += in_break
+        return {
+            'phase': 'running' if self.running else 'break' if self.isBreak else 'stopped',
+            'main_ms': state['main_ms'],
+            'break_ms': state['break_ms'],
+            'total_break_ms': state['total_break_ms'],
+            'auto_paused': self.autoPaused,
+            'at': int(time.time() * 1000),
+        }
+
+    def publishState(self):
+        self.stateChanged.emit(self.liveState())
+
+    def checkpoint(self):
+        if self.journal:
+            try:
+                self.journal.append(self.snapshot())
+            except OSError as e:
+                print(f"Error writing timer checkpoint: {e}")
+
+    def restoreSnapshot(self, state):
+        """Resume a session recovered from the journal"""
+        self.mainTimer.stop()
+        self.breakTimer.stop()
+        self.mainElapsedTime = state.get('main_ms', 0)
+        self.breakElapsedTime = state.get('break_ms', 0)
+        self.totalBreakTime = state.get('total_break_ms', 0)
+        if state.get('started_at'):
+            self.sessionStartedAt = datetime.datetime.fromtimestamp(state['started_at'])
+        self.running = False
+        self.isBreak = False
+
+        self.clockFace.setText(QTime(0, 0).addMSecs(self.mainElapsedTime).toString("hh:mm:ss"))
+        break_time_str = QTime(0, 0).addMSecs(self.breakElapsedTime).toString("hh:mm:ss")
+        self.breakTimeUpdated.emit("Current Break: " + break_time_str)
+        total_break_time_str = QTime(0, 0).addMSecs(self.totalBreakTime).toString("hh:mm:ss")
+        self.totalBreakTimeUpdated.emit("Total Break: " + total_break_time_str)
+
+        # Time spent while the app was dead is not counted
+        if state.get('is_break'):
+            self.startBreak()
+        elif state.get('running'):
+            self.startTimer()
+        self.publishState()
             
     def startPeriodicNotifications(self, interval_minutes, notificationOverlay):
         self.notificationInterval = interval_minutes * 60000  # Convert minutes to milliseconds
@@ -186,16 +437,156 @@ class TimeOverlay(DraggableOverlay):
                 return round(self.mainElapsedTime / 1000 / 60)
 
     def save_session(self):
+        """Store the session and fold it into the usage rollups in one transaction"""
         from src.core.database import SessionRecord, Session
+        from src.core.rollups import record_session
+        if self.user_id is None or self.sessionStartedAt is None:
+            return
+        # snapshot() rather than get_total_time(), which miscounts while paused
+        screen_time = round(self.snapshot()['main_ms'] / 60000)
+        break_time = self.totalBreakTime // 60000
+        if not screen_time and not break_time:
+            return
+
         db = Session()
-        session = SessionRecord(
-            user_id=self.user_id,
-            start_time=datetime.now(),
-            screen_time=self.get_total_time(),
-            break_time=self.totalBreakTime // 60000
-        )
-        db.add(session)
-        db.commit()
+        try:
+            db.add(SessionRecord(
+                user_id=self.user_id,
+                start_time=self.sessionStartedAt,
+                screen_time=screen_time,
+                break_time=break_time
+            ))
+            record_session(db.connection(), self.user_id, self.sessionStartedAt, screen_time, break_time)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error saving session: {e}")
+        finally:
+            db.close()
+
+class RemoteTimeOverlay(TimeOverlay):
+    """TimeOverlay showing and driving the timer owned by momapp-daemon.
+
+    Commands go over ``client`` and reply with the new state straight away,
+    so callers that read ``running``/``isBreak`` right after startTimer()
+    and friends see the result. Changes made elsewhere (idle auto-pause,
+    another window) and break reminders arrive on the subscribed ``events``
+    connection. Between updates the clock is extrapolated locally.
+    """
+
+    def __init__(self, shared_settings, client, events, user_id=None):
+        self.client = client
+        self.events = events
+        self.remoteState = {}
+        self.stateReceivedAt = time.monotonic()
+        super().__init__(shared_settings, user_id)
+        state = events.subscribe()
+        self.eventNotifier = QSocketNotifier(events.fileno(), QSocketNotifier.Read, self)
+        self.eventNotifier.activated.connect(self.readEvents)
+        self.applyState(state)
+
+    def command(self, name, **args):
+        try:
+            reply = self.client.call(name, **args)
+        except Exception as e:
+            print(f"Error talking to momapp-daemon: {e}")
+            return
+        if 'state' in reply:
+            self.applyState(reply['state'])
+
+    def startTimer(self):
+        self.command('start')
+
+    def resumeTimer(self):
+        self.command('resume')
+
+    def endBreak(self):
+        self.command('resume')
+
+    def pauseTimer(self):
+        self.command('pause')
+
+    def resetTimer(self):
+        self.command('reset')
+        self.resetRequested.emit()
+
+    def startPeriodicNotifications(self, interval_minutes, notificationOverlay):
+        self.syncOverlay = notificationOverlay
+        self.command('set_reminder', minutes=interval_minutes, message=notificationOverlay.notificationMessage)
+        print(f"Notifications will appear every {interval_minutes} minutes.")
+
+    def readEvents(self):
+        try:
+            events = self.events.read_events()
+        except (OSError, ValueError) as e:
+            print(f"Lost connection to momapp-daemon: {e}")
+            self.eventNotifier.setEnabled(False)
+            return
+        for event in events:
+            if event.get('event') == 'state':
+                self.applyState(event['state'])
+            elif event.get('event') == 'reminder' and self.syncOverlay:
+                self.syncOverlay.showNotification(self.syncOverlay.notificationMessage)
+
+    def applyState(self, state):
+        self.remoteState = state
+        self.stateReceivedAt = time.monotonic()
+        self.running = state['phase'] == 'running'
+        self.isBreak = state['phase'] == 'break'
+        self.mainElapsedTime = state['main_ms']
+        self.breakElapsedTime = state['break_ms']
+        self.totalBreakTime = state['total_break_ms']
+        if state['auto_paused'] != self.autoPaused:
+            self.autoPaused = state['auto_paused']
+            self.autoPauseChanged.emit(self.autoPaused)
+
+        for timer, active in ((self.mainTimer, self.running), (self.breakTimer, self.isBreak)):
+            if not active:
+                timer.stop()
+            elif not timer.isActive():
+                timer.start(1000)
+        self.updateMainDisplay()
+        self.updateBreakDisplay()
+        self.stateChanged.emit(dict(state))
+
+    def _sinceUpdate(self):
+        return int((time.monotonic() - self.stateReceivedAt) * 1000)
+
+    def snapshot(self):
+        main_ms = self.mainElapsedTime + (self._sinceUpdate() if self.running else 0)
+        in_break = self._sinceUpdate() if self.isBreak else 0
+        return {
+            'main_ms': main_ms,
+            'break_ms': self.breakElapsedTime + in_break,
+            'total_break_ms': self.totalBreakTime + in_break,
+            'running': self.running,
+            'is_break': self.isBreak,
+            'started_at': None,
+        }
+
+    def liveState(self):
+        state = self.snapshot()
+        return dict(self.remoteState, main_ms=state['main_ms'], break_ms=state['break_ms'],
+                    total_break_ms=state['total_break_ms'], at=int(time.time() * 1000))
+
+    def updateMainDisplay(self):
+        self.clockFace.setText(QTime(0, 0).addMSecs(self.snapshot()['main_ms']).toString("hh:mm:ss"))
+
+    def updateBreakDisplay(self):
+        state = self.snapshot()
+        self.breakTimeUpdated.emit("Current Break: " + QTime(0, 0).addMSecs(state['break_ms']).toString("hh:mm:ss"))
+        self.totalBreakTimeUpdated.emit(
+            "Total Break: " + QTime(0, 0).addMSecs(state['total_break_ms']).toString("hh:mm:ss"))
+
+    def get_total_time(self):
+        return round(self.snapshot()['main_ms'] / 1000 / 60)
+
+    def save_session(self):
+        pass  # the daemon stores sessions
+
+    def checkpoint(self):
+        pass  # the daemon keeps the journal
+
 
 class NotificationOverlay(DraggableOverlay):
     def __init__(self, timeOverlay, shared_settings, sound_file):
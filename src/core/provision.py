@@ -0,0 +1,165 @@
+# provision.py - Bulk user provisioning for classroom and family-center deployments
+"""
+Create or update many accounts at once from a CSV or JSON file.
+
+    python -m src.core.provision users.csv
+    python -m src.core.provision users.jsonl --batch-size 10000 --workers 4
+
+CSV files need a header with ``username``, ``password`` and optionally
+``age``. JSON input may be a list of objects or one object per line
+(``.jsonl``/``.ndjson``). Existing usernames are updated in place, so
+re-running the same file is safe.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, Dict, Any, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy.dialects.sqlite import insert
+
+from src.core.database import engine, ensure_schema
+from src.core.models import User
+
+DEFAULT_AGE = 18
+DEFAULT_BATCH_SIZE = 5000
+
+
+def read_users(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream user records from a CSV, JSON or JSON-lines file"""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if ext == ".csv":
+            yield from csv.DictReader(f)
+        elif ext in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        elif ext == ".json":
+            yield from json.load(f)
+        else:
+            raise ValueError(f"Unsupported file type: {ext}")
+
+
+def _hash_chunk(passwords: List[str]) -> List[str]:
+    # Same scheme as User.set_password
+    return [hashlib.sha256(p.encode()).hexdigest() for p in passwords]
+
+
+def _chunks(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    it = iter(records)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _upsert_statement():
+    stmt = insert(User.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[User.__table__.c.username],
+        set_={
+            "password_hash": stmt.excluded.password_hash,
+            "age": stmt.excluded.age,
+        },
+    )
+
+
+def _write_chunk(stmt, chunk: List[Dict[str, Any]], hashes: List[str]) -> int:
+    now = datetime.now()
+    rows = [
+        {
+            "username": record["username"].strip(),
+            "password_hash": password_hash,
+            "age": int(record.get("age") or DEFAULT_AGE),
+            "created_at": now,
+        }
+        for record, password_hash in zip(chunk, hashes)
+    ]
+    with engine.begin() as conn:
+        conn.execute(stmt, rows)
+    return len(rows)
+
+
+def provision_users(records: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE,
+                    workers: Optional[int] = None, progress: bool = False) -> Dict[str, float]:
+    """Hash and upsert users in batches; returns row count, elapsed time and rows/sec.
+
+    Passwords are hashed in a process pool (``workers=0`` hashes inline)
+    while earlier chunks are being written.
+    """
+    ensure_schema()
+    stmt = _upsert_statement()
+    total = 0
+    started = time.perf_counter()
+
+    if workers == 0:
+        for chunk in _chunks(records, batch_size):
+            total += _write_chunk(stmt, chunk, _hash_chunk([r["password"] for r in chunk]))
+            if progress:
+                _report(total, started)
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            max_in_flight = workers * 2
+            pending = deque()
+            for chunk in _chunks(records, batch_size):
+                pending.append((chunk, pool.submit(_hash_chunk, [r["password"] for r in chunk])))
+                if len(pending) >= max_in_flight:
+                    done_chunk, future = pending.popleft()
+                    total += _write_chunk(stmt, done_chunk, future.result())
+                    if progress:
+                        _report(total, started)
+            while pending:
+                done_chunk, future = pending.popleft()
+                total += _write_chunk(stmt, done_chunk, future.result())
+                if progress:
+                    _report(total, started)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": total,
+        "seconds": elapsed,
+        "rows_per_sec": total / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def _report(total: int, started: float):
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"\r{total} users provisioned ({rate:,.0f} rows/sec)", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Provision user accounts from a CSV or JSON file")
+    parser.add_argument("path", help="CSV, JSON or JSON-lines file with username, password and age")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows per INSERT executemany (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="password hashing processes; 0 hashes inline (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = provision_users(read_users(args.path), args.batch_size, args.workers, progress=True)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"\nProvisioning failed: {e}", file=sys.stderr)
+        return 1
+
+    print(f"\nProvisioned {stats['rows']} users in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
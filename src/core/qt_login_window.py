@@ -0,0 +1,333 @@
+from PyQt5.QtWidgets import (QWidget, QFrame, QLabel, QLineEdit, QPushButton, QVBoxLayout,
+                             QHBoxLayout, QStackedWidget, QSizeGrip, QApplication)
+from PyQt5.QtCore import Qt, QTimer, QEvent
+
+from src.core.auth import authenticate_user, register_user
+
+
+class QtLoginWindow(QWidget):
+    """Borderless login/register card, styled by the #login* rules in dark.qss.
+
+    Qt port of login_window.ModernMomApp so the app only has to bring up one
+    GUI toolkit at startup.
+    """
+
+    def __init__(self, parent_app=None):
+        super().__init__()
+        self.parent_app = parent_app  # Reference to main application
+        self.current_tab = "login"
+        self.login_successful = False
+        self.logged_in_username = None
+        self._drag_position = None
+
+        # One pending hide for the notification bar; restarting it replaces the old one
+        self.notification_timer = QTimer(self)
+        self.notification_timer.setSingleShot(True)
+        self.notification_timer.timeout.connect(self.hide_notification)
+
+        self.setup_window()
+        self.create_widgets()
+        self.switch_tab("login")
+
+    def setup_window(self):
+        self.setObjectName("loginWindow")
+        self.setWindowTitle("Mom App - Login")
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
+        self.setMinimumSize(350, 600)
+        self.resize(450, 700)
+
+        # Center the window
+        screen = QApplication.primaryScreen().availableGeometry()
+        self.move(screen.center().x() - 450 // 2, screen.center().y() - 700 // 2)
+
+    def create_widgets(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        layout.addWidget(self.create_title_bar())
+
+        # Notification bar (hidden until there's something to say)
+        self.notification_label = QLabel("", self)
+        self.notification_label.setObjectName("loginNotification")
+        self.notification_label.setAlignment(Qt.AlignCenter)
+        self.notification_label.hide()
+        layout.addWidget(self.notification_label)
+
+        content = QVBoxLayout()
+        content.setContentsMargins(40, 0, 40, 40)
+        layout.addLayout(content, 1)
+
+        self.card = QFrame(self)
+        self.card.setObjectName("loginCard")
+        content.addWidget(self.card)
+
+        card_layout = QVBoxLayout(self.card)
+        card_layout.setContentsMargins(30, 30, 30, 30)
+        card_layout.setSpacing(0)
+
+        self.create_title_section(card_layout)
+        self.create_tab_section(card_layout)
+
+        self.forms = QStackedWidget(self.card)
+        self.forms.setObjectName("loginForms")
+        self.forms.addWidget(self.create_login_form())
+        self.forms.addWidget(self.create_register_form())
+        card_layout.addWidget(self.forms)
+        card_layout.addStretch(1)
+
+        grip_row = QHBoxLayout()
+        grip_row.addStretch(1)
+        grip_row.addWidget(QSizeGrip(self), 0, Qt.AlignBottom | Qt.AlignRight)
+        layout.addLayout(grip_row)
+
+    def create_title_bar(self):
+        self.title_bar = QFrame(self)
+        self.title_bar.setObjectName("loginTitleBar")
+        self.title_bar.setFixedHeight(32)
+        self.title_bar.installEventFilter(self)
+
+        bar_layout = QHBoxLayout(self.title_bar)
+        bar_layout.setContentsMargins(10, 0, 0, 0)
+        bar_layout.setSpacing(8)
+
+        icon_label = QLabel("👨‍👩‍👧‍👦", self.title_bar)
+        icon_label.setObjectName("loginTitleIcon")
+        title_label = QLabel("Mom App - Login", self.title_bar)
+        title_label.setObjectName("loginTitleText")
+        # Let presses on the labels fall through to the draggable title bar
+        icon_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        title_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        bar_layout.addWidget(icon_label)
+        bar_layout.addWidget(title_label)
+        bar_layout.addStretch(1)
+
+        minimize_btn = QPushButton("—", self.title_bar)
+        minimize_btn.setObjectName("loginMinimizeButton")
+        minimize_btn.setCursor(Qt.PointingHandCursor)
+        minimize_btn.clicked.connect(self.showMinimized)
+        bar_layout.addWidget(minimize_btn)
+
+        close_btn = QPushButton("✕", self.title_bar)
+        close_btn.setObjectName("loginCloseButton")
+        close_btn.setCursor(Qt.PointingHandCursor)
+        close_btn.clicked.connect(self.close)
+        bar_layout.addWidget(close_btn)
+
+        return self.title_bar
+
+    def create_title_section(self, card_layout):
+        title_label = QLabel("Mom App", self.card)
+        title_label.setObjectName("loginTitle")
+        title_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(title_label)
+
+        subtitle_label = QLabel("Your family's digital companion", self.card)
+        subtitle_label.setObjectName("loginSubtitle")
+        subtitle_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(subtitle_label)
+        card_layout.addSpacing(20)
+
+    def create_tab_section(self, card_layout):
+        tab_container = QFrame(self.card)
+        tab_container.setObjectName("loginTabs")
+        tab_layout = QHBoxLayout(tab_container)
+        tab_layout.setContentsMargins(2, 2, 2, 2)
+        tab_layout.setSpacing(2)
+
+        self.login_tab_btn = QPushButton("Login", tab_container)
+        self.register_tab_btn = QPushButton("Register", tab_container)
+        for btn, tab in ((self.login_tab_btn, "login"), (self.register_tab_btn, "register")):
+            btn.setObjectName("loginTab")
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.clicked.connect(lambda checked=False, t=tab: self.switch_tab(t))
+            tab_layout.addWidget(btn)
+
+        card_layout.addWidget(tab_container)
+        card_layout.addSpacing(30)
+
+    def create_input_field(self, parent_layout, label_text, var_name, password=False):
+        label = QLabel(label_text, self.card)
+        label.setObjectName("loginFieldLabel")
+        parent_layout.addWidget(label)
+
+        entry = QLineEdit(self.card)
+        entry.setObjectName("loginField")
+        if password:
+            entry.setEchoMode(QLineEdit.Password)
+        parent_layout.addWidget(entry)
+        parent_layout.addSpacing(15)
+
+        # Store reference to entry widget
+        setattr(self, f"{var_name}_entry", entry)
+        return entry
+
+    def create_primary_button(self, text, handler):
+        button = QPushButton(text, self.card)
+        button.setObjectName("loginPrimaryButton")
+        button.setCursor(Qt.PointingHandCursor)
+        button.clicked.connect(handler)
+        return button
+
+    def create_login_form(self):
+        form = QWidget(self.card)
+        form.setObjectName("loginForm")
+        form_layout = QVBoxLayout(form)
+        form_layout.setContentsMargins(0, 0, 0, 0)
+        form_layout.setSpacing(5)
+
+        self.create_input_field(form_layout, "Username", "login_username")
+        password = self.create_input_field(form_layout, "Password", "login_password", password=True)
+        password.returnPressed.connect(self.handle_login)
+
+        form_layout.addSpacing(5)
+        form_layout.addWidget(self.create_primary_button("Sign In", self.handle_login))
+
+        forgot_btn = QPushButton("Forgot your password?", form)
+        forgot_btn.setObjectName("loginLinkButton")
+        forgot_btn.setCursor(Qt.PointingHandCursor)
+        forgot_btn.clicked.connect(self.forgot_password)
+        form_layout.addSpacing(10)
+        form_layout.addWidget(forgot_btn, 0, Qt.AlignHCenter)
+        form_layout.addStretch(1)
+        return form
+
+    def create_register_form(self):
+        form = QWidget(self.card)
+        form.setObjectName("loginForm")
+        form_layout = QVBoxLayout(form)
+        form_layout.setContentsMargins(0, 0, 0, 0)
+        form_layout.setSpacing(5)
+
+        self.create_input_field(form_layout, "Username", "reg_username")
+        self.create_input_field(form_layout, "Password", "reg_password", password=True)
+        self.create_input_field(form_layout, "Confirm Password", "confirm_password", password=True)
+        age = self.create_input_field(form_layout, "Age", "age")
+        age.setMaximumWidth(120)
+
+        form_layout.addSpacing(5)
+        form_layout.addWidget(self.create_primary_button("Create Account", self.handle_register))
+        form_layout.addStretch(1)
+        return form
+
+    def set_style_property(self, widget, name, value):
+        """Set a dynamic property used by dark.qss and re-polish the widget"""
+        widget.setProperty(name, value)
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
+
+    def switch_tab(self, tab):
+        self.current_tab = tab
+        self.set_style_property(self.login_tab_btn, "active", tab == "login")
+        self.set_style_property(self.register_tab_btn, "active", tab != "login")
+        self.forms.setCurrentIndex(0 if tab == "login" else 1)
+
+    def show_notification(self, message, type='info', duration=3000):
+        """Show a notification at the top of the window"""
+        self.notification_label.setText(message)
+        self.set_style_property(self.notification_label, "kind", type)
+        self.notification_label.show()
+        self.notification_timer.start(duration)
+
+    def hide_notification(self):
+        self.notification_label.hide()
+
+    def eventFilter(self, obj, event):
+        # Make the title bar drag the frameless window
+        if obj is self.title_bar:
+            if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+                self._drag_position = event.globalPos() - self.frameGeometry().topLeft()
+                return True
+            if event.type() == QEvent.MouseMove and self._drag_position is not None:
+                self.move(event.globalPos() - self._drag_position)
+                return True
+            if event.type() == QEvent.MouseButtonRelease:
+                self._drag_position = None
+                return True
+        return super().eventFilter(obj, event)
+
+    def handle_login(self):
+        username = self.login_username_entry.text().strip()
+        password = self.login_password_entry.text().strip()
+
+        if not username or not password:
+            self.show_notification("Please fill in all fields", 'error')
+            return
+
+        try:
+            if authenticate_user(username, password):
+                self.show_notification(f"Welcome back, {username}! 👋", 'success')
+                self.login_successful = True
+                self.logged_in_username = username
+
+                # Wait a moment for notification to be seen, then close
+                QTimer.singleShot(1500, self.close_and_proceed)
+            else:
+                self.show_notification("Invalid username or password", 'error')
+                # Clear password field for security
+                self.login_password_entry.clear()
+
+        except Exception as e:
+            self.show_notification(f"Authentication error: {str(e)}", 'error')
+            print(f"Login error: {e}")
+
+    def close_and_proceed(self):
+        """Close login window and proceed to main app"""
+        self.hide()
+        self.deleteLater()
+        if self.parent_app:
+            self.parent_app.on_login_success(self.logged_in_username)
+
+    def handle_register(self):
+        username = self.reg_username_entry.text().strip()
+        password = self.reg_password_entry.text().strip()
+        confirm_password = self.confirm_password_entry.text().strip()
+        age = self.age_entry.text().strip()
+
+        if not all([username, password, confirm_password, age]):
+            self.show_notification("Please fill in all fields", 'error')
+            return
+
+        if password != confirm_password:
+            self.show_notification("Passwords do not match", 'error')
+            return
+
+        try:
+            age_int = int(age)
+            if age_int < 13 or age_int > 120:
+                self.show_notification("Please enter a valid age (13-120)", 'error')
+                return
+        except ValueError:
+            self.show_notification("Please enter a valid age", 'error')
+            return
+
+        try:
+            if register_user(username, password, age=age_int):
+                self.show_notification("Account created successfully! 🎉", 'success')
+
+                def back_to_login():
+                    self.switch_tab('login')
+                    self.clear_register_form()
+                    self.login_username_entry.setText(username)
+                QTimer.singleShot(1500, back_to_login)
+            else:
+                self.show_notification("Username already exists", 'error')
+
+        except Exception as e:
+            self.show_notification(f"Registration error: {str(e)}", 'error')
+            print(f"Registration error: {e}")
+
+    def clear_register_form(self):
+        self.reg_username_entry.clear()
+        self.reg_password_entry.clear()
+        self.confirm_password_entry.clear()
+        self.age_entry.clear()
+
+    def forgot_password(self):
+        self.show_notification("Password recovery coming soon!", 'info')
+
+    def closeEvent(self, event):
+        """Closing the card without logging in exits the application"""
+        event.accept()
+        if not self.login_successful and self.parent_app:
+            self.parent_app.emergency_shutdown()
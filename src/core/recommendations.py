@@ -0,0 +1,107 @@
+# recommendations.py - Age-based screen time, brightness and break recommendations
+"""
+The recommendations live in resources/recommendations.json as a versioned
+table of age bands, loaded once per process. ``lookup`` answers for one
+age; ``evaluate`` answers for a whole array of ages at once with a single
+searchsorted, which is what reports and the family dashboard use.
+
+    table = get_table()
+    table.lookup(8).screen_hours                   # 2
+    table.evaluate([1, 4, 12, 40])["brightness"]   # array([50, 60, 70, 80])
+    recommend_users([3, 4, 5])                     # {user_id: Recommendation}
+"""
+import json
+import os
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RECOMMENDATIONS_FILE = os.path.join(PROJECT_ROOT, "resources", "recommendations.json")
+
+FIELDS = ("screen_hours", "brightness", "break_minutes_per_hour")
+
+
+class Recommendation:
+    """One age band's recommendations, tagged with the table version it came from"""
+
+    __slots__ = ("min_age", "screen_hours", "brightness", "break_minutes_per_hour", "version")
+
+    def __init__(self, min_age, screen_hours, brightness, break_minutes_per_hour, version):
+        self.min_age = min_age
+        self.screen_hours = screen_hours
+        self.brightness = brightness
+        self.break_minutes_per_hour = break_minutes_per_hour
+        self.version = version
+
+    def break_minutes(self, total_minutes: int) -> int:
+        """Break owed after ``total_minutes`` on screen: the per-hour allowance for each full hour"""
+        return (total_minutes // 60) * self.break_minutes_per_hour
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f'<Recommendation {self.min_age}+ v{self.version}>'
+
+
+class RecommendationTable:
+    def __init__(self, version, bands: List[Dict]):
+        if not bands:
+            raise ValueError("Recommendation table has no age bands")
+        bands = sorted(bands, key=lambda band: band["min_age"])
+        self.version = version
+        self.bands = [Recommendation(band["min_age"], *(band[name] for name in FIELDS), version)
+                      for band in bands]
+        self.min_age_list = [band.min_age for band in self.bands]
+        self.min_ages = np.array(self.min_age_list, dtype=np.float64)
+        self.columns = {name: np.array([getattr(band, name) for band in self.bands]) for name in FIELDS}
+
+    @classmethod
+    def load(cls, path: str = RECOMMENDATIONS_FILE) -> "RecommendationTable":
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(data["version"], data["bands"])
+
+    def band_index(self, ages) -> np.ndarray:
+        # Ages below the first band fall into it
+        index = np.searchsorted(self.min_ages, np.asarray(ages, dtype=np.float64), side="right") - 1
+        return np.maximum(index, 0)
+
+    def lookup(self, age) -> Recommendation:
+        return self.bands[max(bisect_right(self.min_age_list, age) - 1, 0)]
+
+    def evaluate(self, ages: Iterable) -> Dict[str, np.ndarray]:
+        """Every field for every age, as arrays in the order of ``ages``"""
+        index = self.band_index(np.fromiter(ages, dtype=np.float64))
+        result = {name: column[index] for name, column in self.columns.items()}
+        result["band"] = index
+        return result
+
+
+@lru_cache(maxsize=1)
+def get_table() -> RecommendationTable:
+    return RecommendationTable.load()
+
+
+def lookup(age) -> Recommendation:
+    return get_table().lookup(age)
+
+
+def recommend_users(user_ids: Optional[Iterable[int]] = None) -> Dict[int, Recommendation]:
+    """Recommendations for the given users (default: everyone), from one query for their ages"""
+    from sqlalchemy import select
+
+    from src.core.database import engine
+    from src.core.models import User
+
+    query = select(User.id, User.age)
+    if user_ids is not None:
+        query = query.where(User.id.in_(list(user_ids)))
+    with engine.connect() as conn:
+        rows = conn.execute(query).all()
+    table = get_table()
+    bands = table.band_index([age for _, age in rows])
+    return {user_id: table.bands[band] for (user_id, _), band in zip(rows, bands)}
@@ -0,0 +1,237 @@
+# rollups.py - Daily and hour-of-week usage totals, kept in step with the sessions table
+"""
+Dashboard queries read the usage_daily and usage_hourly tables instead of
+scanning every session. TimeOverlay.save_session folds each new session in
+with record_session(); the command line rebuilds or verifies the tables.
+
+    python -m src.core.rollups backfill
+    python -m src.core.rollups backfill --user 42
+    python -m src.core.rollups check
+
+A session's wall-clock span (screen time followed by break time, starting
+at start_time) is split across the hours it covers, with screen and break
+seconds shared out in proportion so bucket totals always add up exactly.
+"""
+import argparse
+import os
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.core.database import engine, ensure_schema
+from src.core.models import SessionRecord, UsageDaily, UsageHourly
+
+HOURS_PER_WEEK = 7 * 24
+
+
+def split_session(start: datetime, screen_seconds: int,
+                  break_seconds: int) -> List[Tuple[datetime, int, int]]:
+    """(hour, screen_seconds, break_seconds) for each clock hour the session covers"""
+    total = screen_seconds + break_seconds
+    if total <= 0:
+        return []
+
+    end = start + timedelta(seconds=total)
+    buckets = []
+    cursor = start
+    done_screen = done_break = 0
+    while cursor < end:
+        hour = cursor.replace(minute=0, second=0, microsecond=0)
+        seg_end = min(hour + timedelta(hours=1), end)
+        elapsed = (seg_end - start).total_seconds()
+        # Cumulative rounding: the last bucket always lands on the exact total
+        screen = round(screen_seconds * elapsed / total) - done_screen
+        brk = round(break_seconds * elapsed / total) - done_break
+        done_screen += screen
+        done_break += brk
+        buckets.append((hour, screen, brk))
+        cursor = seg_end
+    return buckets
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def session_deltas(rows: Iterable[Tuple[int, datetime, int, int]]):
+    """Rollup increments for (user_id, start_time, screen_minutes, break_minutes) rows"""
+    daily = defaultdict(lambda: [0, 0, 0])
+    hourly = defaultdict(lambda: [0, 0])
+    for user_id, start, screen_minutes, break_minutes in rows:
+        if start is None:
+            continue
+        daily[(user_id, start.date())][2] += 1
+        for hour, screen, brk in split_session(start, (screen_minutes or 0) * 60, (break_minutes or 0) * 60):
+            day_totals = daily[(user_id, hour.date())]
+            day_totals[0] += screen
+            day_totals[1] += brk
+            hour_totals = hourly[(user_id, week_start(hour.date()), hour.weekday() * 24 + hour.hour)]
+            hour_totals[0] += screen
+            hour_totals[1] += brk
+    return daily, hourly
+
+
+def apply_deltas(conn, daily, hourly):
+    """Add increments to the rollup tables with one upsert executemany per table"""
+    if daily:
+        stmt = insert(UsageDaily.__table__)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id', 'day'],
+            set_={
+                'screen_seconds': UsageDaily.__table__.c.screen_seconds + stmt.excluded.screen_seconds,
+                'break_seconds': UsageDaily.__table__.c.break_seconds + stmt.excluded.break_seconds,
+                'sessions': UsageDaily.__table__.c.sessions + stmt.excluded.sessions,
+            },
+        ), [
+            {'user_id': user_id, 'day': day, 'screen_seconds': s, 'break_seconds': b, 'sessions': n}
+            for (user_id, day), (s, b, n) in daily.items()
+        ])
+    if hourly:
+        stmt = insert(UsageHourly.__table__)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id', 'week_start', 'hour_of_week'],
+            set_={
+                'screen_seconds': UsageHourly.__table__.c.screen_seconds + stmt.excluded.screen_seconds,
+                'break_seconds': UsageHourly.__table__.c.break_seconds + stmt.excluded.break_seconds,
+            },
+        ), [
+            {'user_id': user_id, 'week_start': week, 'hour_of_week': how,
+             'screen_seconds': s, 'break_seconds': b}
+            for (user_id, week, how), (s, b) in hourly.items()
+        ])
+
+
+def record_session(conn, user_id: int, start_time: datetime, screen_minutes: int, break_minutes: int):
+    """Fold one new session into the rollups, in the caller's transaction"""
+    apply_deltas(conn, *session_deltas([(user_id, start_time, screen_minutes, break_minutes)]))
+
+
+def _session_rows(conn, user_id: Optional[int] = None):
+    query = select(SessionRecord.user_id, SessionRecord.start_time,
+                   SessionRecord.screen_time, SessionRecord.break_time)
+    if user_id is not None:
+        query = query.where(SessionRecord.user_id == user_id)
+    return conn.execute(query.execution_options(yield_per=5000))
+
+
+def rebuild(conn, user_id: Optional[int] = None) -> int:
+    """Recompute the rollups from the sessions table; returns sessions counted"""
+    for model in (UsageDaily, UsageHourly):
+        stmt = delete(model)
+        if user_id is not None:
+            stmt = stmt.where(model.user_id == user_id)
+        conn.execute(stmt)
+
+    # Stream the rows straight into the aggregation so yield_per bounds what's held in memory
+    daily, hourly = session_deltas(_session_rows(conn, user_id))
+    apply_deltas(conn, daily, hourly)
+    return sum(totals[2] for totals in daily.values())
+
+
+def check(conn, user_id: Optional[int] = None) -> List[str]:
+    """Compare the rollups against a fresh aggregation; returns the mismatches"""
+    daily, hourly = session_deltas(_session_rows(conn, user_id))
+    problems = []
+
+    stored = select(UsageDaily.user_id, UsageDaily.day, UsageDaily.screen_seconds,
+                    UsageDaily.break_seconds, UsageDaily.sessions)
+    if user_id is not None:
+        stored = stored.where(UsageDaily.user_id == user_id)
+    seen = set()
+    for uid, day, screen, brk, sessions in conn.execute(stored):
+        seen.add((uid, day))
+        expected = daily.get((uid, day), [0, 0, 0])
+        if [screen, brk, sessions] != expected:
+            problems.append(f"usage_daily user={uid} day={day}: {[screen, brk, sessions]} != {expected}")
+    for key in daily.keys() - seen:
+        problems.append(f"usage_daily user={key[0]} day={key[1]}: missing")
+
+    stored = select(UsageHourly.user_id, UsageHourly.week_start, UsageHourly.hour_of_week,
+                    UsageHourly.screen_seconds, UsageHourly.break_seconds)
+    if user_id is not None:
+        stored = stored.where(UsageHourly.user_id == user_id)
+    seen = set()
+    for uid, week, how, screen, brk in conn.execute(stored):
+        seen.add((uid, week, how))
+        expected = hourly.get((uid, week, how), [0, 0])
+        if [screen, brk] != expected:
+            problems.append(f"usage_hourly user={uid} week={week} hour={how}: {[screen, brk]} != {expected}")
+    for key in hourly.keys() - seen:
+        problems.append(f"usage_hourly user={key[0]} week={key[1]} hour={key[2]}: missing")
+    return problems
+
+
+def data_version(user_id: int) -> str:
+    """Cheap fingerprint of a user's recorded usage; changes whenever a session is saved"""
+    query = (select(func.count(), func.coalesce(func.sum(UsageDaily.sessions), 0),
+                    func.coalesce(func.sum(UsageDaily.screen_seconds + UsageDaily.break_seconds), 0))
+             .where(UsageDaily.user_id == user_id))
+    with engine.connect() as conn:
+        days, sessions, seconds = conn.execute(query).one()
+    return f"{days}.{sessions}.{seconds}"
+
+
+def daily_usage(user_id: int, start: date, end: date) -> List[Dict]:
+    """Per-day totals for start..end inclusive, read from usage_daily"""
+    query = (select(UsageDaily.day, UsageDaily.screen_seconds, UsageDaily.break_seconds, UsageDaily.sessions)
+             .where(UsageDaily.user_id == user_id, UsageDaily.day >= start, UsageDaily.day <= end)
+             .order_by(UsageDaily.day))
+    with engine.connect() as conn:
+        return [dict(row._mapping) for row in conn.execute(query)]
+
+
+def screen_time(user_id: int, start: date, end: date) -> Dict[str, int]:
+    """Screen/break seconds and session count for start..end inclusive"""
+    query = (select(func.coalesce(func.sum(UsageDaily.screen_seconds), 0),
+                    func.coalesce(func.sum(UsageDaily.break_seconds), 0),
+                    func.coalesce(func.sum(UsageDaily.sessions), 0))
+             .where(UsageDaily.user_id == user_id, UsageDaily.day >= start, UsageDaily.day <= end))
+    with engine.connect() as conn:
+        screen, brk, sessions = conn.execute(query).one()
+    return {'screen_seconds': screen, 'break_seconds': brk, 'sessions': sessions}
+
+
+def hour_of_week_usage(user_id: int, since: Optional[date] = None) -> List[int]:
+    """Screen seconds for each of the 168 hours of the week, summed over weeks since ``since``"""
+    query = (select(UsageHourly.hour_of_week, func.sum(UsageHourly.screen_seconds))
+             .where(UsageHourly.user_id == user_id)
+             .group_by(UsageHourly.hour_of_week))
+    if since is not None:
+        query = query.where(UsageHourly.week_start >= week_start(since))
+    totals = [0] * HOURS_PER_WEEK
+    with engine.connect() as conn:
+        for hour, seconds in conn.execute(query):
+            totals[hour] = seconds
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the usage rollup tables")
+    parser.add_argument("command", choices=["backfill", "check"])
+    parser.add_argument("--user", type=int, help="only this user id (default: everyone)")
+    args = parser.parse_args(argv)
+
+    ensure_schema()
+    if args.command == "backfill":
+        with engine.begin() as conn:
+            count = rebuild(conn, args.user)
+        print(f"Rebuilt rollups from {count} sessions")
+        return 0
+
+    with engine.connect() as conn:
+        problems = check(conn, args.user)
+    for problem in problems:
+        print(problem)
+    print("Rollups consistent" if not problems else f"{len(problems)} rollup rows out of date; "
+          "run 'python -m src.core.rollups backfill'")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
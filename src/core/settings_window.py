@@ -1,16 +1,21 @@
 from PyQt5.QtWidgets import (QWidget, QGridLayout, QTextEdit, QLineEdit, QPushButton, 
                             QHBoxLayout, QLabel, QSlider, QCheckBox, QFontDialog, 
                             QColorDialog, QInputDialog, QMessageBox)
-from PyQt5.QtGui import QFont, QColor
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QFont, QColor, QPixmap
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from datetime import date, timedelta
+
+from src.core import family, recommendations
 
 from src.core.openai_integration import Worker, generate_openai_response
 
 
 class SettingsWindow(QWidget):
-    def __init__(self, overlay, notificationOverlay, shared_settings, user_age):
+    def __init__(self, overlay, notificationOverlay, shared_settings, user_age, chart_service=None, backlight=None):
         super().__init__()
         self.overlay = overlay
+        self.chart_service = chart_service
+        self.backlight = backlight
         self.notificationOverlay = notificationOverlay
         self.shared_settings = shared_settings
         self.user_age = user_age
@@ -20,6 +25,13 @@ class SettingsWindow(QWidget):
         self.overlay.resetRequested.connect(self.onResetRequested)
         self.overlay.breakTimeUpdated.connect(self.updateBreakTimeDisplay)
         self.overlay.totalBreakTimeUpdated.connect(self.updateTotalBreakTimeDisplay)
+        self.overlay.autoPauseChanged.connect(self.onAutoPauseChanged)
+        if self.chart_service:
+            self.chart_service.chartReady.connect(self.onChartReady)
+            self.chart_service.chartFailed.connect(self.onChartFailed)
+        self.brightnessTimer = QTimer(self)
+        self.brightnessTimer.setSingleShot(True)
+        self.brightnessTimer.timeout.connect(self.stepBrightness)
         self.send_welcome_message()
 
     def initUI(self):
@@ -94,6 +106,20 @@ class SettingsWindow(QWidget):
         self.testNotificationBtn.clicked.connect(self.testNotification)
         layout.addWidget(self.testNotificationBtn, 7, 0, 1, 2)
 
+        if self.chart_service:
+            dailyChartBtn = QPushButton("Usage: Last 30 Days", self)
+            dailyChartBtn.clicked.connect(lambda: self.requestChart("daily"))
+            layout.addWidget(dailyChartBtn, 9, 0)
+
+            heatmapChartBtn = QPushButton("Usage: Weekly Pattern", self)
+            heatmapChartBtn.clicked.connect(lambda: self.requestChart("heatmap"))
+            layout.addWidget(heatmapChartBtn, 9, 1)
+
+            self.chartLabel = QLabel(self)
+            self.chartLabel.setAlignment(Qt.AlignCenter)
+            self.chartLabel.hide()
+            layout.addWidget(self.chartLabel, 10, 0, 1, 2)
+
         self.setLayout(layout)
         self.setGeometry(500, 500, 350, 500)
         
@@ -108,6 +134,61 @@ class SettingsWindow(QWidget):
         #if not self.overlay.running and not self.overlay.isBreak:
          #   self.overlay.startTimer()
 
+    def refreshTimerButton(self):
+        if self.overlay.running:
+            self.startStopButton.setText("Pause")
+        elif self.overlay.isBreak:
+            self.startStopButton.setText("Resume")
+        else:
+            self.startStopButton.setText("Start")
+
+    def onAutoPauseChanged(self, paused):
+        if paused:
+            self.chatDisplay.append("System: No activity detected, the timer is paused.\n")
+        self.refreshTimerButton()
+
+    def requestChart(self, chart_type):
+        if self.overlay.user_id is None:
+            return
+        self.chartLabel.setText("Drawing chart...")
+        self.chartLabel.show()
+        self.chart_service.request(self.overlay.user_id, chart_type)
+
+    def onChartReady(self, chart_type, image, fmt):
+        pixmap = QPixmap()
+        if pixmap.loadFromData(image, fmt.upper()):
+            self.chartLabel.setPixmap(pixmap.scaledToWidth(self.width() - 20, Qt.SmoothTransformation))
+            self.chartLabel.show()
+
+    def onChartFailed(self, chart_type, message):
+        self.chartLabel.hide()
+        self.chatDisplay.append(f"System: Couldn't draw the {chart_type} chart ({message}).\n")
+
+    def enableFamilyDashboard(self):
+        """Add the family dashboard button; for accounts with linked children"""
+        familyBtn = QPushButton("Family Dashboard", self)
+        familyBtn.clicked.connect(lambda: self.showFamilyDashboard())
+        self.layout().addWidget(familyBtn, 11, 0, 1, 2)
+
+    def showFamilyDashboard(self, days=30):
+        end = date.today()
+        try:
+            children = family.dashboard(self.overlay.user_id, end - timedelta(days=days - 1), end, today=end)
+        except Exception as e:
+            self.chatDisplay.append(f"System: Couldn't load the family dashboard ({e}).\n")
+            return
+        lines = ["System: Family screen time"]
+        for child in children:
+            lines.append(f"{child['username']}: today {self.formatSeconds(child['today_seconds'])} "
+                         f"of {self.formatSeconds(child['recommended_seconds'])}, "
+                         f"last 7 days {self.formatSeconds(child['week_seconds'])}, "
+                         f"{days}-day average {self.formatSeconds(child['daily_average_seconds'])}")
+        self.chatDisplay.append("\n".join(lines) + "\n")
+
+    @staticmethod
+    def formatSeconds(seconds):
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
     def toggleTimerVisibility(self, state):
         if state == Qt.Checked:
             self.overlay.hide()
@@ -158,14 +239,9 @@ class SettingsWindow(QWidget):
         return self.user_age
     
     def calculate_recommendations(self, user_age):
-        if user_age < 2:
-            return 0, 50  # Recommended screen time in hours and brightness in percentage
-        elif user_age <= 5:
-            return 1, 60
-        elif user_age <= 17:
-            return 2, 70
-        else:
-            return 4, 80
+        # Recommended screen time in hours and brightness in percentage
+        recommendation = recommendations.lookup(user_age)
+        return recommendation.screen_hours, recommendation.brightness
     
     def evaluate_break_time(self):
         # Analyze total time spent and suggest a break
@@ -175,7 +251,7 @@ class SettingsWindow(QWidget):
         self.display_response(break_message)
 
     def calculate_break_time(self, total_time):
-        return (total_time // 60) * 15 
+        return recommendations.lookup(self.user_age).break_minutes(total_time)
      
     def send_welcome_message(self):
         # This is a placeholder function, implement with OpenAI API call
@@ -183,8 +259,24 @@ class SettingsWindow(QWidget):
         age = self.get_user_age()
         if age:
             recommended_time, recommended_brightness = self.calculate_recommendations(age)
-            welcome_message = f"Welcome! Based on your age, here are my recommendations:\nTotal usage time: {recommended_time} hours\nBrightness: {recommended_brightness}%\nBreak Time: 15 minutes per hour."
+            break_minutes = recommendations.lookup(age).break_minutes_per_hour
+            welcome_message = f"Welcome! Based on your age, here are my recommendations:\nTotal usage time: {recommended_time} hours\nBrightness: {recommended_brightness}%\nBreak Time: {break_minutes} minutes per hour."
             self.display_response(welcome_message)
+            self.applyBrightness(recommended_brightness)
+
+    def applyBrightness(self, percent):
+        """Ramp the display to ``percent`` if a backlight controller was given"""
+        if self.backlight:
+            self.stepBrightness(lambda: self.backlight.set_target(percent))
+
+    def stepBrightness(self, step=None):
+        try:
+            wait = (step or self.backlight.step)()
+        except OSError as e:
+            print(f"Error setting brightness: {e}")
+            return
+        if wait is not None:
+            self.brightnessTimer.start(max(1, int(wait * 1000)))
 
     def handleReset(self):
         # Move the AI advice logic here
@@ -0,0 +1,72 @@
+# sync_service.py - Run device sync off the Qt thread
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from src.sync import sources
+from src.sync.server import HttpTransport
+
+
+class SyncService(QObject):
+    """Captures local changes and syncs them with a sync server on a worker thread.
+
+    Sessions are imported straight into the database by the worker. Remote
+    changes to preferences and user content come back through syncFinished
+    so they are merged into the app's in-memory copies on the Qt thread,
+    along with the copies that were captured so local edits made during
+    the sync can be told apart.
+    """
+
+    syncFinished = pyqtSignal(dict, list, dict)  # stats, preference/content changes, captured documents
+    syncFailed = pyqtSignal(str)
+    _finished = pyqtSignal(object, object, object)  # stats, changes, exception
+
+    def __init__(self, url, token=None):
+        super().__init__()
+        self.transport = HttpTransport(url, token)
+        self.replica = sources.open_replica(on_apply=self._onApply)
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="momapp-sync")
+        self.running = False
+        self._documents = []
+        self._captured = {}
+        self._finished.connect(self._onFinished)
+
+    def request(self, username, preferences, user_content):
+        """Start a sync unless one is already running; the dicts are copied first"""
+        if self.running:
+            return
+        self.running = True
+        self._captured = {sources.PREFERENCES: copy.deepcopy(preferences),
+                          sources.USER_CONTENT: copy.deepcopy(user_content)}
+        future = self.pool.submit(self._run, username, copy.deepcopy(preferences), copy.deepcopy(user_content))
+        future.add_done_callback(self._onDone)
+
+    def _onApply(self, conn, changes):
+        # Worker thread, inside the transaction storing the changes
+        sources.import_sessions(conn, changes)
+        self._documents.extend(c for c in changes if c[0] in sources.DOCUMENT_COLLECTIONS)
+
+    def _run(self, username, preferences, user_content):
+        self._documents = []
+        sources.capture_sessions(self.replica)
+        stats = sources.sync_documents(self.replica, self.transport, username, preferences, user_content)
+        return stats, self._documents
+
+    def _onDone(self, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        stats, changes = (None, None) if error else future.result()
+        self._finished.emit(stats, changes, error)
+
+    def _onFinished(self, stats, changes, error):
+        self.running = False
+        if error is not None:
+            self.syncFailed.emit(str(error))
+            return
+        self.syncFinished.emit(stats, changes, self._captured)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.transport.close()
@@ -0,0 +1,112 @@
+# timer_journal.py - Crash-safe checkpointing of TimeOverlay state
+import json
+import os
+import time
+from typing import Optional, Dict, Any
+
+
+class TimerJournal:
+    """Append-only write-ahead journal of timer state.
+
+    Every checkpoint is written and flushed to the OS immediately, so a killed
+    process loses nothing. fsync is batched every ``sync_interval`` seconds,
+    which bounds how much can be lost if the whole machine goes down.
+    """
+
+    CLOSED_MARKER = {"event": "closed"}
+
+    def __init__(self, path: str, sync_interval: float = 5.0, compact_after: int = 1000):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.compact_after = compact_after
+        self._file = None
+        self._records = 0
+        self._last_sync = 0.0
+        self._dirty = False
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._last_sync = time.monotonic()
+
+    def append(self, state: Dict[str, Any]):
+        """Append a checkpoint and fsync if the max-loss window has elapsed"""
+        self._open()
+        record = dict(state, ts=time.time())
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self._records += 1
+        self._dirty = True
+
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+        if self._records >= self.compact_after:
+            self.compact(record)
+
+    def sync(self):
+        """Force buffered checkpoints to stable storage"""
+        if self._file is not None and self._dirty:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def compact(self, last_record: Dict[str, Any]):
+        """Rewrite the journal so it only holds the latest checkpoint"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(last_record, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        os.replace(tmp_path, self.path)
+        self._sync_directory()
+        self._records = 1
+        self._dirty = False
+        self._open()
+
+    def _sync_directory(self):
+        """fsync the journal's directory so the rename in compact() survives a power cut"""
+        if not hasattr(os, "O_DIRECTORY"):
+            return  # Windows: directories can't be opened for fsync
+        fd = os.open(os.path.dirname(self.path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def recover(self) -> Optional[Dict[str, Any]]:
+        """Return the last checkpoint of an unfinished session, if any"""
+        if not os.path.exists(self.path):
+            return None
+
+        last = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    last = json.loads(line)
+                except ValueError:
+                    # Torn write at the tail from a crash; keep the previous record
+                    continue
+
+        if not last or last.get("event") == self.CLOSED_MARKER["event"]:
+            return None
+        return last
+
+    def close(self, discard: bool = True):
+        """Close the journal after a clean shutdown"""
+        if self._file is not None:
+            if not discard:
+                self._file.write(json.dumps(self.CLOSED_MARKER) + "\n")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+        if discard and os.path.exists(self.path):
+            os.remove(self.path)
+        self._records = 0
+        self._dirty = False
@@ -0,0 +1,113 @@
+# client.py - Talk to momapp-daemon over its Unix socket
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence
+
+from src.daemon.protocol import Decoder, encode
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class DaemonError(Exception):
+    pass
+
+
+def default_socket_path(username: str) -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"momapp-{username}.sock")
+
+
+class DaemonClient:
+    """One connection to the daemon, used either for commands or, after subscribe(), for events"""
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.decoder = Decoder()
+        self.pending: List[Dict] = []
+        self.next_id = 1
+
+    def call(self, command: str, **args) -> Dict:
+        """Send a command and wait for its reply"""
+        request_id = self.next_id
+        self.next_id += 1
+        self.sock.sendall(encode(dict(args, id=request_id, cmd=command)))
+        while True:
+            for message in self._receive():
+                if message.get("id") == request_id:
+                    if not message.get("ok"):
+                        raise DaemonError(message.get("error", "Daemon error"))
+                    return message
+                self.pending.append(message)
+
+    def _receive(self) -> List[Dict]:
+        if not self.decoder.read_from(self.sock):
+            raise ConnectionError("Daemon closed the connection")
+        return self.decoder.messages()
+
+    def subscribe(self) -> Dict:
+        """Turn this connection into an event stream; returns the current state"""
+        state = self.call("subscribe")["state"]
+        self.sock.setblocking(False)
+        return state
+
+    def read_events(self) -> List[Dict]:
+        """Events that have arrived on a subscribed connection, without blocking"""
+        events, self.pending = self.pending, []
+        while True:
+            try:
+                events.extend(self._receive())
+            except BlockingIOError:
+                return events
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def close(self):
+        self.sock.close()
+
+
+def spawn_daemon(username: str, path: Optional[str] = None, args: Sequence[str] = ()) -> subprocess.Popen:
+    """Start momapp-daemon detached from this process, in the current data directory"""
+    command = [sys.executable, "-m", "src.daemon.server", "--user", username, *args]
+    if path:
+        command += ["--socket", path]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (PROJECT_ROOT, env.get("PYTHONPATH")) if p)
+    os.makedirs("logs", exist_ok=True)
+    with open("logs/momapp-daemon.log", "ab") as log:
+        # Own session and no terminal: closing the GUI must not take tracking down with it
+        return subprocess.Popen(command, env=env, start_new_session=True, stdin=subprocess.DEVNULL,
+                                stdout=log, stderr=subprocess.STDOUT)
+
+
+def connect(username: str, path: Optional[str] = None, spawn: bool = True, args: Sequence[str] = (),
+            wait: float = 5.0) -> DaemonClient:
+    """Connect to the user's daemon, starting it with ``args`` first if it isn't running"""
+    path = path or default_socket_path(username)
+    try:
+        return DaemonClient(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if not spawn:
+            raise
+    child = spawn_daemon(username, path, args)
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            return DaemonClient(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if child.poll() is not None:
+                raise DaemonError(f"momapp-daemon exited with status {child.returncode}")
+            if time.monotonic() > deadline:
+                raise DaemonError("Timed out waiting for momapp-daemon to start")
+            time.sleep(0.05)
@@ -0,0 +1,161 @@
+# persist.py - Store finished sessions for momapp-daemon from a short-lived child process
+"""
+Importing SQLAlchemy and the models would roughly quadruple the daemon's
+resident memory for the sake of a write that happens a few times a day,
+so the daemon hands each finished session to this script instead:
+
+    echo '{"username": "alice", "start_time": 1760860800.0, "screen_time": 45, "break_time": 10}' \
+        | python src/daemon/persist.py
+
+It writes the session and its rollups in one transaction, like
+TimeOverlay.save_session, and exits non-zero if that fails.
+
+Until a child has exited 0, its session is kept in
+data/<user>_pending_sessions.json, so a session whose write failed, or
+that was still being written when the daemon stopped, is retried when the
+daemon next starts.
+"""
+import json
+import os
+import subprocess
+import sys
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class SessionWriter:
+    """Daemon side: runs this script per session and retries ones that failed"""
+
+    def __init__(self, username: str, path: Optional[str] = None):
+        self.username = username
+        self.path = path or f"data/{username}_pending_sessions.json"
+        self.children: List = []
+        # Every session not yet confirmed stored, by id; mirrored to self.path
+        self.pending: Dict[str, Dict] = self._load()
+        self.failed: List[Dict] = list(self.pending.values())
+
+    def __call__(self, session: Dict) -> bool:
+        """Queue a finished session; True once it is safe on disk, stored or not"""
+        self.reap()
+        session = dict(session, username=self.username, id=uuid.uuid4().hex)
+        self.pending[session["id"]] = session
+        durable = self._write_pending()
+        for pending in self.failed + [session]:
+            self._spawn(pending)
+        self.failed = []
+        return durable
+
+    def retry(self):
+        """Start writers for sessions left over from a failed write or an earlier run"""
+        self.reap()
+        failed, self.failed = self.failed, []
+        for session in failed:
+            self._spawn(session)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r") as f:
+                return {session["id"]: session for session in json.load(f)}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error reading pending sessions: {e}", file=sys.stderr)
+            return {}
+
+    def _write_pending(self) -> bool:
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if not self.pending:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return True
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(list(self.pending.values()), f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            print(f"Error writing pending sessions: {e}", file=sys.stderr)
+            return False
+
+    def _spawn(self, session: Dict):
+        try:
+            child = subprocess.Popen([sys.executable, os.path.abspath(__file__)], stdin=subprocess.PIPE)
+            child.stdin.write(json.dumps(session).encode("utf-8"))
+            child.stdin.close()
+            self.children.append((child, session))
+        except OSError as e:
+            print(f"Error starting session writer: {e}", file=sys.stderr)
+            self.failed.append(session)
+
+    def reap(self):
+        """Collect finished children; sessions that weren't stored are kept for the next save"""
+        running = []
+        stored = False
+        for child, session in self.children:
+            code = child.poll()
+            if code is None:
+                running.append((child, session))
+            elif code != 0:
+                self.failed.append(session)
+            else:
+                stored = self.pending.pop(session["id"], None) is not None or stored
+        self.children = running
+        if stored:
+            self._write_pending()
+
+    def wait(self, timeout: float = 30.0):
+        for child, _ in self.children:
+            try:
+                child.wait(timeout)
+            except subprocess.TimeoutExpired:
+                child.kill()
+        self.reap()
+        if self.failed:
+            print(f"{len(self.failed)} session(s) could not be saved; kept in {self.path} for the next start",
+                  file=sys.stderr)
+
+
+def save(session: Dict):
+    from sqlalchemy import select
+
+    from src.core.database import Session, ensure_schema
+    from src.core.models import SessionRecord, User
+    from src.core.rollups import record_session
+
+    ensure_schema()
+    start = datetime.fromtimestamp(session["start_time"])
+    db = Session()
+    try:
+        user_id = db.execute(select(User.id).where(User.username == session["username"])).scalar()
+        if user_id is None:
+            raise ValueError(f"No such user: {session['username']}")
+        db.add(SessionRecord(user_id=user_id, start_time=start,
+                             screen_time=session["screen_time"], break_time=session["break_time"]))
+        record_session(db.connection(), user_id, start, session["screen_time"], session["break_time"])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    try:
+        save(json.load(sys.stdin))
+    except Exception as e:
+        print(f"Error saving session: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+# server.py - momapp-daemon: headless session tracking behind a Unix socket
+"""
+Owns the session timer, idle auto-pause, break reminders, the crash journal
+and session persistence, so tracking carries on with no window open and
+without Qt loaded. The overlays and settings window connect as clients
+(see src/daemon/client.py and RemoteTimeOverlay) and can come and go.
+
+    momapp-daemon --user alice
+    python -m src.daemon.server --user alice --socket /tmp/momapp-alice.sock
+
+Everything runs on one thread around a selectors loop that sleeps until
+the next client message or the tracker's next deadline. Commands:
+
+    state, start, pause, resume, reset     reply with the timer state
+    set_reminder {minutes, message}        break reminder settings
+    subscribe                              this connection receives events
+    shutdown                               save the session and exit
+"""
+import argparse
+import os
+import selectors
+import signal
+import socket
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.idle import IdleDetector, create_idle_source
+from src.core.timer_journal import TimerJournal
+from src.daemon.client import default_socket_path
+from src.daemon.persist import SessionWriter
+from src.daemon.protocol import Decoder, ProtocolError, encode
+from src.daemon.tracker import Tracker
+
+TIMER_COMMANDS = ("state", "start", "pause", "resume", "reset")
+MAX_BACKLOG_BYTES = 1024 * 1024  # unread events before a subscriber is dropped
+
+
+class Connection:
+    def __init__(self, sock):
+        self.sock = sock
+        self.decoder = Decoder()
+        self.outgoing = bytearray()
+        self.subscribed = False
+        self.closed = False
+
+
+class DaemonServer:
+    def __init__(self, tracker: Tracker, path: str):
+        self.tracker = tracker
+        self.path = path
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}
+        self.running = False
+        self.listener = None
+        # stop() writes here so a signal handler can wake the selector
+        self._wake_read, self._wake_write = socket.socketpair()
+        self._wake_read.setblocking(False)
+        self.selector.register(self._wake_read, selectors.EVENT_READ)
+
+    def listen(self):
+        if os.path.exists(self.path):
+            # A socket file left by a daemon that died; refuse if one is still answering
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+                raise OSError(f"A daemon is already listening on {self.path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.path)
+            finally:
+                probe.close()
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)  # owner-only socket
+        try:
+            self.listener.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        self.listener.listen(16)
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+
+    # -- connections ----------------------------------------------------------------
+
+    def _accept(self):
+        sock, _ = self.listener.accept()
+        sock.setblocking(False)
+        self.connections[sock] = Connection(sock)
+        self.selector.register(sock, selectors.EVENT_READ)
+
+    def _drop(self, conn):
+        if conn.closed:
+            return
+        conn.closed = True
+        self.selector.unregister(conn.sock)
+        del self.connections[conn.sock]
+        conn.sock.close()
+
+    def _send(self, conn, data: bytes):
+        if conn.closed:
+            return
+        if not conn.outgoing:
+            try:
+                sent = conn.sock.send(data)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                self._drop(conn)
+                return
+            data = data[sent:]
+            if not data:
+                return
+            self.selector.modify(conn.sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+        conn.outgoing += data
+        if len(conn.outgoing) > MAX_BACKLOG_BYTES:
+            self._drop(conn)  # a client that stopped reading; it reconnects and asks for the state
+
+    def _flush(self, conn):
+        try:
+            sent = conn.sock.send(conn.outgoing)
+        except BlockingIOError:
+            return
+        except OSError:
+            self._drop(conn)
+            return
+        del conn.outgoing[:sent]
+        if not conn.outgoing:
+            self.selector.modify(conn.sock, selectors.EVENT_READ)
+
+    def _read(self, conn):
+        try:
+            received = conn.decoder.read_from(conn.sock)
+        except BlockingIOError:
+            return
+        except OSError:
+            received = 0
+        if not received:
+            self._drop(conn)
+            return
+        try:
+            messages = conn.decoder.messages()
+        except ProtocolError as e:
+            self._send(conn, encode({"ok": False, "error": str(e)}))
+            self._drop(conn)
+            return
+        for message in messages:
+            self._send(conn, encode(self.handle(conn, message)))
+
+    # -- commands -------------------------------------------------------------------
+
+    def handle(self, conn, message):
+        reply = {"id": message.get("id"), "ok": True}
+        command = message.get("cmd")
+        tracker = self.tracker
+        if command in TIMER_COMMANDS:
+            if command != "state":
+                getattr(tracker, command)()
+            reply["state"] = tracker.state()
+        elif command == "set_reminder":
+            tracker.set_reminder(message.get("minutes"), message.get("message"))
+        elif command == "subscribe":
+            conn.subscribed = True
+            reply["state"] = tracker.state()
+        elif command == "shutdown":
+            self.running = False
+        else:
+            reply = {"id": message.get("id"), "ok": False, "error": f"Unknown command: {command}"}
+        return reply
+
+    def broadcast(self):
+        events, self.tracker.events = self.tracker.events, []
+        if not events:
+            return
+        data = b"".join(encode(event) for event in events)
+        for conn in list(self.connections.values()):
+            if conn.subscribed:
+                self._send(conn, data)
+
+    # -- loop ---------------------------------------------------------------------------
+
+    def serve_forever(self):
+        self.running = True
+        self.tracker.events = []  # clients ask for the state when they connect
+        while self.running:
+            for key, mask in self.selector.select(self.tracker.next_timeout()):
+                if key.fileobj is self.listener:
+                    self._accept()
+                    continue
+                if key.fileobj is self._wake_read:
+                    self._wake_read.recv(64)
+                    continue
+                conn = self.connections.get(key.fileobj)
+                if conn is not None and mask & selectors.EVENT_WRITE:
+                    self._flush(conn)
+                if conn is not None and not conn.closed and mask & selectors.EVENT_READ:
+                    self._read(conn)
+            self.tracker.tick()
+            self.broadcast()
+
+    def stop(self):
+        self.running = False
+        try:
+            self._wake_write.send(b"x")
+        except OSError:
+            pass
+
+    def close(self):
+        for conn in list(self.connections.values()):
+            self._drop(conn)
+        if self.listener is not None:
+            self.selector.unregister(self.listener)
+            self.listener.close()
+            self.listener = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        self.selector.close()
+        self._wake_read.close()
+        self._wake_write.close()
+
+
+def create_tracker(username: str, idle_minutes: float = 5, checkpoint_seconds: float = 5):
+    """Tracker with the same journal, idle detection and persistence the app used in-process"""
+    journal = TimerJournal(f"data/{username}_timer.journal", sync_interval=checkpoint_seconds)
+    source = create_idle_source()
+    detector = IdleDetector(source, idle_after=idle_minutes * 60) if source else None
+    writer = SessionWriter(username)
+    writer.retry()
+    tracker = Tracker(journal=journal, idle_detector=detector, persist=writer)
+    state = journal.recover()
+    if state and (state.get('main_ms') or state.get('total_break_ms')):
+        tracker.restore(state)
+    return tracker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Track MomApp sessions in the background")
+    parser.add_argument("--user", required=True, help="username whose sessions are tracked")
+    parser.add_argument("--socket", help="Unix socket path (default: per-user path in the runtime dir)")
+    parser.add_argument("--idle-minutes", type=float, default=5, help="auto-pause after this long without input")
+    parser.add_argument("--checkpoint-seconds", type=float, default=5,
+                        help="timer progress that may be lost on a power cut")
+    args = parser.parse_args(argv)
+
+    tracker = create_tracker(args.user, args.idle_minutes, args.checkpoint_seconds)
+    server = DaemonServer(tracker, args.socket or default_socket_path(args.user))
+    try:
+        server.listen()
+    except OSError as e:
+        print(f"momapp-daemon: {e}", file=sys.stderr)
+        return 1
+    signal.signal(signal.SIGTERM, lambda *_: server.stop())
+    signal.signal(signal.SIGINT, lambda *_: server.stop())
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+        saved = tracker.close()
+        tracker.persist.wait()
+        # The session is in the database or the pending file by now; otherwise the journal still has it
+        if saved:
+            tracker.discard_journal()
+        else:
+            print("momapp-daemon: keeping the timer journal, the session wasn't saved", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
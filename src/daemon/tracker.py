@@ -0,0 +1,219 @@
+# tracker.py - Session timer state machine without Qt, owned by momapp-daemon
+"""
+The same timer TimeOverlay used to run in its widget: a session runs, is
+paused into a break, resumes, and is saved when it is reset. Time is kept
+as accumulated milliseconds plus the monotonic start of the current run or
+break, so nothing needs to tick to keep it accurate; ``tick`` only drives
+the periodic work (journal checkpoints, idle sampling, reminders) and
+``next_timeout`` says how long the daemon may sleep until then.
+
+Changes and reminders are queued on ``events`` for the server to send.
+"""
+import time
+from typing import Dict, List, Optional
+
+
+class Tracker:
+    def __init__(self, journal=None, idle_detector=None, persist=None, idle_interval: float = 5.0,
+                 checkpoint_interval: float = 1.0, clock=time.monotonic, wall=time.time):
+        self.journal = journal
+        self.idle_detector = idle_detector
+        self.persist = persist  # callable(session dict) -> True once the finished session is safe on disk
+        self.idle_interval = idle_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.clock = clock
+        self.wall = wall
+
+        self.running = False
+        self.is_break = False
+        self.auto_paused = False
+        self.main_ms = 0
+        self.break_ms = 0
+        self.total_break_ms = 0
+        self.started_at = None  # wall-clock epoch seconds
+        self.segment_start = clock()
+
+        self.reminder_interval = None  # seconds
+        self.reminder_message = "Time to take a break!"
+        self.events: List[Dict] = []
+
+        now = clock()
+        self._next_checkpoint = now
+        self._next_idle = now + idle_interval
+        self._next_reminder = None
+
+    # -- timer ------------------------------------------------------------------
+
+    def _elapsed_ms(self, now: float) -> int:
+        return int((now - self.segment_start) * 1000)
+
+    def _close_segment(self, now: float):
+        """Fold the time since segment_start into the totals"""
+        elapsed = self._elapsed_ms(now)
+        if self.running:
+            self.main_ms += elapsed
+        elif self.is_break:
+            self.break_ms += elapsed
+            self.total_break_ms += elapsed
+        self.segment_start = now
+
+    def start(self):
+        """Start the session, or resume it from a break"""
+        now = self.clock()
+        if self.running:
+            return
+        self._close_segment(now)
+        if self.is_break:
+            self.is_break = False
+            self.break_ms = 0
+        if self.started_at is None:
+            self.started_at = self.wall()
+        self.running = True
+        self._changed()
+
+    resume = start
+
+    def pause(self):
+        """Stop counting screen time and start a break"""
+        if not self.running:
+            return
+        self._close_segment(self.clock())
+        self.running = False
+        self.is_break = True
+        self._changed()
+
+    def reset(self):
+        """Save the session and start over"""
+        self._close_segment(self.clock())
+        if not self.save_session():
+            # Keep the session (and its journal) rather than lose it
+            print("Session could not be queued for saving; not resetting")
+            return
+        self.running = self.is_break = self.auto_paused = False
+        self.main_ms = self.break_ms = self.total_break_ms = 0
+        self.started_at = None
+        self._changed()
+
+    def snapshot(self) -> Dict:
+        """Current state in the TimerJournal checkpoint format"""
+        now = self.clock()
+        elapsed = self._elapsed_ms(now)
+        in_main = elapsed if self.running else 0
+        in_break = elapsed if self.is_break else 0
+        return {
+            'main_ms': self.main_ms + in_main,
+            'break_ms': self.break_ms + in_break,
+            'total_break_ms': self.total_break_ms + in_break,
+            'running': self.running,
+            'is_break': self.is_break,
+            'started_at': self.started_at,
+        }
+
+    def state(self) -> Dict:
+        """State for clients, in TimeOverlay.liveState's format"""
+        snapshot = self.snapshot()
+        return {
+            'phase': 'running' if self.running else 'break' if self.is_break else 'stopped',
+            'main_ms': snapshot['main_ms'],
+            'break_ms': snapshot['break_ms'],
+            'total_break_ms': snapshot['total_break_ms'],
+            'auto_paused': self.auto_paused,
+            'at': int(self.wall() * 1000),
+        }
+
+    def restore(self, state: Dict):
+        """Resume a session recovered from the journal; time while the daemon was down isn't counted"""
+        self.main_ms = state.get('main_ms', 0)
+        self.break_ms = state.get('break_ms', 0)
+        self.total_break_ms = state.get('total_break_ms', 0)
+        self.started_at = state.get('started_at')
+        self.running = bool(state.get('running'))
+        self.is_break = bool(state.get('is_break')) and not self.running
+        self.segment_start = self.clock()
+        self._changed()
+
+    def save_session(self) -> bool:
+        """Hand the session to persist; False if it couldn't be put somewhere durable"""
+        if self.persist is None or self.started_at is None:
+            return True
+        screen_time = round(self.main_ms / 60000)
+        break_time = self.total_break_ms // 60000
+        if screen_time or break_time:
+            return self.persist({'start_time': self.started_at, 'screen_time': screen_time,
+                                 'break_time': break_time}) is not False
+        return True
+
+    def close(self) -> bool:
+        """Clean shutdown: store the session; True if the journal is no longer needed"""
+        self._close_segment(self.clock())
+        return self.save_session()
+
+    def discard_journal(self):
+        if self.journal:
+            self.journal.close()
+
+    # -- reminders ----------------------------------------------------------------
+
+    def set_reminder(self, minutes: Optional[float], message: Optional[str] = None):
+        if message:
+            self.reminder_message = message
+        if minutes is not None:
+            self.reminder_interval = minutes * 60 if minutes > 0 else None
+            self._next_reminder = self.clock() + self.reminder_interval if self.reminder_interval else None
+
+    # -- periodic work --------------------------------------------------------------
+
+    def _changed(self):
+        self.checkpoint()
+        self.events.append({'event': 'state', 'state': self.state()})
+
+    def checkpoint(self):
+        self._next_checkpoint = self.clock() + self.checkpoint_interval
+        if self.journal:
+            try:
+                self.journal.append(self.snapshot())
+            except OSError as e:
+                print(f"Error writing timer checkpoint: {e}")
+
+    def next_timeout(self) -> float:
+        """Seconds until tick() has something to do"""
+        deadlines = []
+        if self.running or self.is_break:
+            deadlines.append(self._next_checkpoint)
+        if self.idle_detector is not None:
+            deadlines.append(self._next_idle)
+        if self._next_reminder is not None:
+            deadlines.append(self._next_reminder)
+        if not deadlines:
+            return 3600.0
+        return max(min(deadlines) - self.clock(), 0.0)
+
+    def tick(self):
+        now = self.clock()
+        if (self.running or self.is_break) and now >= self._next_checkpoint:
+            self.checkpoint()
+        if self.idle_detector is not None and now >= self._next_idle:
+            self._next_idle = now + self.idle_interval
+            self.sample_idle(now)
+        if self._next_reminder is not None and now >= self._next_reminder:
+            self._next_reminder = now + self.reminder_interval
+            self.events.append({'event': 'reminder', 'message': self.reminder_message})
+
+    def sample_idle(self, now: float):
+        detector = self.idle_detector
+        transition = detector.sample(now)
+        if transition == detector.IDLE and self.running:
+            self._close_segment(now)
+            # The idle threshold itself was time away from the screen, not usage
+            away_ms = min(int(detector.last_idle_seconds * 1000), self.main_ms)
+            self.main_ms -= away_ms
+            self.break_ms += away_ms
+            self.total_break_ms += away_ms
+            self.running = False
+            self.is_break = True
+            self.auto_paused = True
+            self._changed()
+        elif transition == detector.ACTIVE and self.auto_paused:
+            self.auto_paused = False
+            self.start()
+
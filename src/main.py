@@ -1,3 +1,4 @@
+import copy
 import datetime
 from datetime import datetime  # Add this import
 import json
@@ -5,7 +6,6 @@ import sys
 import os
 import signal  # Add this for process termination
 from PyQt5.QtWidgets import QApplication, QInputDialog, QMessageBox
-from PyQt5.QtGui import QFont
 from PyQt5.QtCore import QFile, QTextStream, QTimer
 
 # Add project root to Python path
@@ -16,9 +16,22 @@ from flask_login import LoginManager
 
 # Import your custom modules
 from src.core.settings_window import SettingsWindow
-from src.core.overlays import TimeOverlay, NotificationOverlay
+from src.core.overlays import TimeOverlay, RemoteTimeOverlay, NotificationOverlay
+from src.core.timer_journal import TimerJournal
+from src.core.idle import IdleDetector, create_idle_source
+from src.core.app_usage import AppUsageSampler, create_window_provider, usage_by_app
+from src.core.backlight import BacklightController, find_backlight
+from src.core import family, limits, recommendations
+from src.core import rollups
+from src.core.chart_service import ChartService
+from src.core.sync_service import SyncService
+from src.api.server import ApiServer
+from src.api.live import LiveServer
+from src.sync import sources as sync_sources
+from src.daemon import client as daemon_client
 
 from src.utils.styles import load_stylesheet
+from src.utils.fonts import get_font, font_fallbacks, CLOCK_FONT_FAMILY
 from src.core.database import Session
 from src.core.models import User
 
@@ -32,7 +45,7 @@ login_manager.login_view = 'login'
 def load_user(user_id):
     db = Session()
     try:
-        return db.query(User).get(int(user_id))
+        return db.get(User, int(user_id))
     finally:
         db.close()
 
@@ -58,7 +71,17 @@ class MainApplication:
         self.notification_overlay = None
         self.settings = None
         self.auto_save_timer = None  # Add timer reference
+        self.app_usage_timer = None
+        self.app_usage_sampler = None
+        self.chart_service = None
+        self.api_server = None
+        self.live_server = None
+        self.sync_service = None
+        self.sync_timer = None
+        self.limits = None
+        self.limits_timer = None
         self.login_window_active = False  # Track if login window is active
+        self.login_window = None
         
         # Load stylesheet
         stylesheet = load_stylesheet()
@@ -70,13 +93,12 @@ class MainApplication:
     def show_login(self):
         """Show the modern login window"""
         try:
-            from src.core.login_window import ModernMomApp
+            from src.core.qt_login_window import QtLoginWindow
             self.login_window_active = True
-            login_app = ModernMomApp(parent_app=self)
-            login_app.run()
+            self.login_window = QtLoginWindow(parent_app=self)
+            self.login_window.show()
             
-            # If we reach here and login window is closed without successful login
-            # The on_window_close method in login_window will handle the exit
+            # Closing the window without a successful login calls emergency_shutdown
             
         except Exception as e:
             print(f"Login error: {e}")
@@ -102,6 +124,7 @@ class MainApplication:
             
             # 1. Store user information
             self.user_data = {
+                'id': user_info.get('id') if user_info else None,
                 'username': username,
                 'login_time': datetime.now(),
                 'is_logged_in': True,
@@ -133,12 +156,14 @@ class MainApplication:
 
     def load_user_preferences(self, username):
         """Load user-specific settings and preferences"""
+        self._preferences_on_disk = {}
         try:
             # Load from file, database, or config
             prefs_file = f"data/{username}_preferences.json"
             if os.path.exists(prefs_file):
                 with open(prefs_file, 'r') as f:
                     self.user_preferences = json.load(f)
+                self._preferences_on_disk = copy.deepcopy(self.user_preferences)
             else:
                 # Set default preferences
                 self.user_preferences = {
@@ -248,16 +273,39 @@ class MainApplication:
                     with open(data_file, 'w') as f:
                         json.dump(self.user_content, f, indent=2)
                     
-                    # Save preferences
+                    # Save preferences, keeping anything the local API changed since we last read the file
                     prefs_file = f"data/{username}_preferences.json"
-                    with open(prefs_file, 'w') as f:
+                    self.merge_preferences_from_disk(prefs_file)
+                    tmp_file = prefs_file + ".tmp"
+                    with open(tmp_file, 'w') as f:
                         json.dump(self.user_preferences, f, indent=2)
+                    os.replace(tmp_file, prefs_file)
+                    self._preferences_on_disk = copy.deepcopy(self.user_preferences)
                     
                     print(f"Auto-saved data for {username}")
                         
         except Exception as e:
             print(f"Error saving user data: {e}")
         
+    def merge_preferences_from_disk(self, prefs_file):
+        """Adopt preferences changed on disk (e.g. PUT through the local API) that we haven't changed ourselves"""
+        base = getattr(self, '_preferences_on_disk', {})
+        try:
+            with open(prefs_file, 'r') as f:
+                on_disk = json.load(f)
+        except (OSError, ValueError):
+            return
+        missing = object()
+        for name in set(on_disk) | set(base):
+            disk_value = on_disk.get(name, missing)
+            base_value = base.get(name, missing)
+            if disk_value == base_value or self.user_preferences.get(name, missing) != base_value:
+                continue
+            if disk_value is missing:
+                self.user_preferences.pop(name, None)
+            else:
+                self.user_preferences[name] = disk_value
+
     def initialize_main_app(self):
         """Initialize the main application after successful login"""
         try:
@@ -266,38 +314,252 @@ class MainApplication:
             shared_settings = {
                 'color': 'white',
                 'opacity': 1.0,
-                'font': QFont('MODERN WARFARE', 30)
+                'font': get_font(CLOCK_FONT_FAMILY, 30)
             }
+            if CLOCK_FONT_FAMILY in font_fallbacks:
+                self.log_user_activity(f"Font {CLOCK_FONT_FAMILY} unavailable, using {font_fallbacks[CLOCK_FONT_FAMILY]}")
             
-            self.overlay = TimeOverlay(shared_settings)
+            daemon = self.connect_daemon()
+            if daemon:
+                self.overlay = RemoteTimeOverlay(shared_settings, *daemon, user_id=self.user_data.get('id'))
+            else:
+                self.overlay = TimeOverlay(shared_settings, user_id=self.user_data.get('id'))
             self.notification_overlay = NotificationOverlay(self.overlay, shared_settings, sound_file)
             self.overlay.syncOverlay = self.notification_overlay
             
+            self.chart_service = ChartService()
+            self.chart_service.warm()
             self.settings = SettingsWindow(
                 self.overlay, 
                 self.notification_overlay, 
                 shared_settings, 
-                self.user_data['age']  # Pass the age from user data
+                self.user_data['age'],  # Pass the age from user data
+                chart_service=self.chart_service,
+                backlight=self.create_backlight()
             )
+            if daemon:
+                self.settings.refreshTimerButton()
+            else:
+                # No daemon: the overlay keeps the journal and watches for idle itself
+                self.restore_timer_session()
+                self.setup_idle_detection()
+            self.setup_family()
+            self.setup_app_usage()
+            self.setup_limits()
+            self.start_local_api()
+            self.start_live_server()
+            self.start_sync()
             self.settings.show()
             
         except Exception as e:
             print(f"Error initializing main app: {e}")
             self.emergency_shutdown()
         
+    def connect_daemon(self):
+        """Attach to (or start) the user's momapp-daemon; returns (commands, events) or None"""
+        if not self.user_preferences.get('tracking_daemon', True) or not hasattr(daemon_client.socket, 'AF_UNIX'):
+            return None
+        username = self.user_data['username']
+        args = ['--idle-minutes', str(self.user_preferences.get('idle_timeout_minutes', 5)),
+                '--checkpoint-seconds', str(self.user_preferences.get('checkpoint_sync_seconds', 5))]
+        try:
+            commands = daemon_client.connect(username, args=args)
+            events = daemon_client.connect(username, spawn=False)
+        except (OSError, daemon_client.DaemonError) as e:
+            print(f"Tracking daemon unavailable, timing in the app: {e}")
+            return None
+        self.log_user_activity(f"Connected to momapp-daemon at {commands.path}")
+        return commands, events
+
+    def create_backlight(self):
+        """Brightness controller for the display, unless the user turned it off or it isn't writable"""
+        if not self.user_preferences.get('apply_brightness', True):
+            return None
+        device = find_backlight()
+        if device is None:
+            print("Backlight control unavailable on this system")
+            return None
+        self.log_user_activity(f"Backlight control using {device.name}")
+        return BacklightController(device, min_interval=self.user_preferences.get('brightness_write_interval', 0.1))
+
+    def restore_timer_session(self):
+        """Attach the crash journal to the timer and resume an interrupted session"""
+        try:
+            username = self.user_data['username']
+            # Seconds of timer progress we accept losing on a power cut
+            sync_seconds = self.user_preferences.get('checkpoint_sync_seconds', 5)
+            journal = TimerJournal(f"data/{username}_timer.journal", sync_interval=sync_seconds)
+
+            state = journal.recover()
+            if state and (state.get('main_ms') or state.get('total_break_ms')):
+                self.overlay.restoreSnapshot(state)
+                self.settings.refreshTimerButton()
+                self.log_user_activity(f"Recovered timer session for {username}")
+
+            self.overlay.attachJournal(journal)
+        except Exception as e:
+            print(f"Error restoring timer session: {e}")
+
+    def setup_idle_detection(self):
+        """Auto-pause the session timer when the user walks away"""
+        source = create_idle_source()
+        if source is None:
+            print("Idle detection unavailable on this system")
+            return
+        idle_minutes = self.user_preferences.get('idle_timeout_minutes', 5)
+        detector = IdleDetector(source, idle_after=idle_minutes * 60)
+        self.overlay.enableIdleDetection(detector)
+        self.log_user_activity(f"Idle detection using {source.name} source")
+
+    def setup_family(self):
+        """Request links to family_members, answer requests from parents and show the dashboard to parents"""
+        user_id = self.user_data.get('id')
+        if user_id is None:
+            return
+        try:
+            requested = family.request_members(user_id, self.user_content.get('family_members', []))
+            if requested:
+                self.log_user_activity(f"Asked {requested} family member account(s) to share their usage")
+            for parent in family.pending_requests(user_id):
+                answer = QMessageBox.question(
+                    None, "Family Request",
+                    f"{parent['username']} would like to see your screen time. Allow this?",
+                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+                family.respond(user_id, parent['id'], answer == QMessageBox.Yes)
+                self.log_user_activity(f"{'Approved' if answer == QMessageBox.Yes else 'Declined'} "
+                                       f"family request from {parent['username']}")
+            if family.children(user_id):
+                self.settings.enableFamilyDashboard()
+        except Exception as e:
+            print(f"Error loading family accounts: {e}")
+
+    def setup_app_usage(self):
+        """Record which application has focus while the session timer runs"""
+        provider = create_window_provider()
+        if provider is None:
+            print("Per-app usage tracking unavailable on this system")
+            return
+        interval = self.user_preferences.get('app_usage_sample_seconds', 5)
+        # A few missed ticks (busy event loop) shouldn't split a span
+        self.app_usage_sampler = AppUsageSampler(provider, user_id=self.user_data.get('id'),
+                                                 max_gap=interval * 3, interval=interval)
+        self.app_usage_timer = QTimer()
+        self.app_usage_timer.timeout.connect(self.sample_app_usage)
+        self.app_usage_timer.start(interval * 1000)
+
+    def setup_limits(self):
+        """Warn at the user's screen-time limits; the age-based recommendation if they set none"""
+        rules = self.user_preferences.get('limits')
+        try:
+            if rules is None:
+                rules = limits.default_rules(recommendations.lookup(self.user_data['age']))
+            self.limits = limits.LimitsEngine(rules)
+        except ValueError as e:
+            print(f"Error in screen-time limits: {e}")
+            return
+        user_id = self.user_data.get('id')
+        if user_id is not None:
+            try:
+                today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                self.show_limit_alerts(self.limits.set_usage(
+                    rollups.screen_time(user_id, today.date(), today.date())['screen_seconds'],
+                    usage_by_app(user_id, today)))
+            except Exception as e:
+                print(f"Error loading today's usage for limits: {e}")
+        self.show_limit_alerts(self.limits.update_state(self.overlay.liveState()))
+        self.overlay.stateChanged.connect(self.on_limits_state)
+        self.limits_timer = QTimer()
+        self.limits_timer.timeout.connect(self.check_limits)
+        self.limits_timer.start(1000)
+
+    def on_limits_state(self, state):
+        self.show_limit_alerts(self.limits.update_state(state))
+
+    def check_limits(self):
+        self.show_limit_alerts(self.limits.tick())
+
+    def show_limit_alerts(self, alerts):
+        for alert in alerts:
+            self.notification_overlay.showNotification(alert['message'])
+            self.log_user_activity(f"Limit {alert['rule']} {alert['level']}: {alert['message']}")
+
+    def start_local_api(self):
+        """Serve usage data to other devices if the user turned it on"""
+        port = self.user_preferences.get('local_api_port')
+        if not port:
+            return
+        try:
+            self.api_server = ApiServer(self.user_preferences.get('local_api_host', '127.0.0.1'), port,
+                                        token=self.user_preferences.get('local_api_token'))
+            self.api_server.start_background()
+            self.log_user_activity(f"Local API listening on port {port}")
+        except (OSError, ValueError) as e:
+            print(f"Error starting local API: {e}")
+
+    def start_live_server(self):
+        """Push timer state to phones/second screens over WebSocket if enabled"""
+        port = self.user_preferences.get('live_port')
+        if not port:
+            return
+        try:
+            self.live_server = LiveServer(self.user_preferences.get('local_api_host', '127.0.0.1'), port,
+                                          token=self.user_preferences.get('local_api_token'))
+            self.live_server.start_background()
+            self.live_server.publish(self.overlay.liveState())
+            self.overlay.stateChanged.connect(self.live_server.publish)
+            self.log_user_activity(f"Live timer feed on ws://localhost:{port}/live")
+        except (OSError, ValueError) as e:
+            print(f"Error starting live server: {e}")
+
+    def start_sync(self):
+        """Sync sessions, preferences and content with the user's sync server, if configured"""
+        url = self.user_preferences.get('sync_server')
+        if not url:
+            return
+        try:
+            self.sync_service = SyncService(url, self.user_preferences.get('sync_token'))
+        except Exception as e:
+            print(f"Error starting sync: {e}")
+            return
+        self.sync_service.syncFinished.connect(self.on_sync_finished)
+        self.sync_service.syncFailed.connect(lambda error: print(f"Sync failed: {error}"))
+        self.sync_timer = QTimer()
+        self.sync_timer.timeout.connect(self.sync_now)
+        self.sync_timer.start(self.user_preferences.get('sync_interval_minutes', 5) * 60000)
+        self.sync_now()
+
+    def sync_now(self):
+        self.sync_service.request(self.user_data['username'], self.user_preferences, self.user_content)
+
+    def on_sync_finished(self, stats, changes, captured):
+        username = self.user_data['username']
+        changed = sync_sources.merge_document(self.user_preferences, sync_sources.PREFERENCES, username, changes,
+                                              base=captured[sync_sources.PREFERENCES])
+        changed |= sync_sources.merge_document(self.user_content, sync_sources.USER_CONTENT, username, changes,
+                                               base=captured[sync_sources.USER_CONTENT])
+        if changed:
+            self.save_user_data()
+        if stats['sent'] or stats['applied']:
+            self.log_user_activity(f"Synced: {stats['sent']} sent, {stats['applied']} received")
+
+    def sample_app_usage(self):
+        try:
+            if self.overlay.running:
+                app = self.app_usage_sampler.sample()
+            else:
+                app = None
+                self.app_usage_sampler.pause()
+            if self.limits:
+                self.show_limit_alerts(self.limits.set_app(app))
+        except Exception as e:
+            print(f"Error sampling app usage: {e}")
+
     def run(self):
         """Run the application"""
         try:
-            # Show login window
+            # Show login window; it runs on the same Qt event loop as the main app
             self.show_login()
-            
-            # Only run the Qt event loop if login was successful
-            # The login window will handle the exit if closed without login
-            if hasattr(self, 'user_data') and self.user_data:
-                return self.app.exec_()
-            else:
-                # If no user data, login was cancelled
-                return 0
+            return self.app.exec_()
                 
         except KeyboardInterrupt:
             print("\nApplication interrupted by user")
@@ -310,6 +572,24 @@ class MainApplication:
             if self.auto_save_timer and self.auto_save_timer.isActive():
                 self.auto_save_timer.stop()
                 self.save_user_data()  # Save one last time before exit
+            if self.app_usage_sampler:
+                try:
+                    self.app_usage_sampler.flush(close=True)
+                except Exception as e:
+                    print(f"Error saving app usage: {e}")
+            if self.overlay:
+                self.overlay.save_session()
+            if self.overlay and self.overlay.journal:
+                self.overlay.journal.close()  # Clean exit, nothing to recover
+            if self.chart_service:
+                self.chart_service.shutdown()
+            if self.api_server:
+                self.api_server.shutdown()
+                self.api_server.server_close()
+            if self.live_server:
+                self.live_server.stop()
+            if self.sync_service:
+                self.sync_service.shutdown()
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,40 @@
+# clock.py - Hybrid logical clock for ordering writes across devices
+"""
+An HLC timestamp is a single integer: wall-clock milliseconds in the high
+bits and a counter in the low COUNTER_BITS. It stays close to real time,
+so "last writer wins" means what a user expects, but never goes backwards
+and always moves past any timestamp it has seen from another device, so
+an edit made after syncing beats the edit it replaced even when the two
+devices' clocks disagree.
+"""
+import threading
+import time
+
+COUNTER_BITS = 16
+
+
+def pack(millis: int, counter: int = 0) -> int:
+    return (millis << COUNTER_BITS) | counter
+
+
+def physical_ms(hlc: int) -> int:
+    return hlc >> COUNTER_BITS
+
+
+class HybridClock:
+    def __init__(self, last: int = 0, wall=time.time):
+        self.last = last
+        self.wall = wall
+        self._lock = threading.Lock()
+
+    def now(self) -> int:
+        """Timestamp for a local write; strictly greater than any issued or observed"""
+        with self._lock:
+            self.last = max(pack(int(self.wall() * 1000)), self.last + 1)
+            return self.last
+
+    def observe(self, remote: int):
+        """Move past a timestamp received from another device"""
+        with self._lock:
+            if remote > self.last:
+                self.last = remote
@@ -0,0 +1,267 @@
+# replica.py - Versioned record store and delta exchange between devices
+"""
+Every synced item is one row in sync_records, stamped with the hybrid
+logical clock (hlc) and node id of its latest write. Each replica keeps a
+version vector, ``{node: highest hlc seen from that node}``, and a sync is
+a series of single round trips to a peer (normally the sync server):
+
+    request:  {"protocol": 1, "node": ..., "vector": <mine>, "changes": [...], "limit": N}
+    response: {"node": ..., "vector": <peer's>, "changes": [...], "more": bool}
+
+The client sends only the records the peer's vector (remembered from the
+previous exchange) doesn't cover, and gets back only the records its own
+vector doesn't cover. Both lists are sorted by hlc and cut at ``limit``,
+so after any page every node's writes up to that point have been seen
+and a sync interrupted halfway resumes where it stopped. Messages are
+zlib-compressed JSON.
+
+Conflicts are resolved per record, last writer wins: the higher
+(hlc, node) pair is kept, which every replica agrees on whatever order
+the writes arrive in. Deletions are kept as tombstones so they replicate
+like any other write.
+"""
+import json
+import threading
+import uuid
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.core.models import SyncRecord, SyncState
+from src.sync.clock import HybridClock
+
+PROTOCOL_VERSION = 1
+PAGE_SIZE = 5000
+MAX_PAGE_SIZE = 20000
+COMPRESS_LEVEL = 6
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024  # decompressed
+KEY_CHUNK = 500  # keys per IN (...) lookup, under SQLite's bound-parameter limit
+
+# A change on the wire: [collection, key, hlc, node, deleted, payload JSON or None]
+Change = List
+
+
+def encode(message: Dict) -> bytes:
+    return zlib.compress(json.dumps(message, separators=(",", ":")).encode("utf-8"), COMPRESS_LEVEL)
+
+
+def decode(data: bytes, max_length: int = MAX_MESSAGE_BYTES) -> Dict:
+    # Bounded, so a small compressed body can't expand into gigabytes
+    decompressor = zlib.decompressobj()
+    raw = decompressor.decompress(data, max_length)
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Sync message larger than {max_length} bytes when decompressed")
+    return json.loads(raw)
+
+
+def get_state(conn, name: str, default=None):
+    value = conn.execute(select(SyncState.value).where(SyncState.name == name)).scalar()
+    return default if value is None else value
+
+
+def set_state(conn, values: Dict[str, str]):
+    if not values:
+        return
+    stmt = insert(SyncState.__table__)
+    conn.execute(stmt.on_conflict_do_update(index_elements=['name'], set_={'value': stmt.excluded.value}),
+                 [{'name': name, 'value': value} for name, value in values.items()])
+
+
+class Replica:
+    """One device's (or the server's) copy of the synced records.
+
+    ``on_apply(conn, changes)`` is called inside the transaction that stores
+    remote changes, with the ones that won, so the caller can update its own
+    tables atomically with the sync state.
+    """
+
+    def __init__(self, engine, node_id: Optional[str] = None, on_apply=None):
+        self.engine = engine
+        self.on_apply = on_apply
+        # Serialises writers: the server handles several devices at once
+        self._lock = threading.RLock()
+        with engine.begin() as conn:
+            stored = get_state(conn, "node_id")
+            self.node_id = node_id or stored or uuid.uuid4().hex[:16]
+            if stored != self.node_id:
+                set_state(conn, {"node_id": self.node_id})
+            self.vector = json.loads(get_state(conn, "vector", "{}"))
+        self.clock = HybridClock(max(self.vector.values(), default=0))
+
+    # -- local writes -----------------------------------------------------------
+
+    def put_many(self, collection: str, items: Iterable[Tuple[str, object]], only_new: bool = False,
+                 state: Optional[Dict[str, str]] = None) -> int:
+        """Record local writes; a value of None deletes the key.
+
+        With ``only_new`` keys that already exist are left alone (used for
+        append-only data such as sessions). ``state`` entries are saved in
+        the same transaction, e.g. a capture high-water mark.
+        """
+        with self._lock:
+            rows = []
+            for key, value in items:
+                rows.append({
+                    'collection': collection, 'key': key, 'hlc': self.clock.now(), 'node': self.node_id,
+                    'deleted': value is None,
+                    'payload': None if value is None else json.dumps(value, sort_keys=True),
+                })
+            if not rows and not state:
+                return 0
+            vector = dict(self.vector)
+            if rows:
+                vector[self.node_id] = rows[-1]['hlc']
+            with self.engine.begin() as conn:
+                if rows:
+                    stmt = insert(SyncRecord.__table__)
+                    if only_new:
+                        stmt = stmt.on_conflict_do_nothing(index_elements=['collection', 'key'])
+                    else:
+                        stmt = stmt.on_conflict_do_update(index_elements=['collection', 'key'], set_={
+                            name: stmt.excluded[name] for name in ('hlc', 'node', 'deleted', 'payload')})
+                    conn.execute(stmt, rows)
+                set_state(conn, dict(state or {}, vector=json.dumps(vector)))
+            self.vector = vector
+            return len(rows)
+
+    def put(self, collection: str, key: str, value) -> int:
+        return self.put_many(collection, [(key, value)])
+
+    def delete(self, collection: str, key: str) -> int:
+        return self.put_many(collection, [(key, None)])
+
+    def get(self, collection: str, key: str):
+        with self.engine.connect() as conn:
+            row = conn.execute(select(SyncRecord.deleted, SyncRecord.payload).where(
+                SyncRecord.collection == collection, SyncRecord.key == key)).first()
+        if row is None or row.deleted:
+            return None
+        return json.loads(row.payload)
+
+    def payloads(self, collection: str, prefix: str = "") -> Dict[str, str]:
+        """Raw JSON payloads of the live keys in ``collection`` starting with ``prefix``"""
+        query = select(SyncRecord.key, SyncRecord.payload).where(
+            SyncRecord.collection == collection, SyncRecord.deleted.is_(False))
+        if prefix:
+            query = query.where(SyncRecord.key.startswith(prefix, autoescape=True))
+        with self.engine.connect() as conn:
+            return dict(conn.execute(query).all())
+
+    # -- delta exchange ---------------------------------------------------------
+
+    def changes_since(self, vector: Dict[str, int], limit: int = PAGE_SIZE) -> List[Change]:
+        """Records not covered by ``vector``, oldest first"""
+        # Every node we hold records from is in self.vector, so the lowest
+        # mark bounds the hlc index scan; nodes ahead of it get their own test
+        marks = {node: vector.get(node, 0) for node in self.vector}
+        if not marks:
+            return []
+        floor = min(marks.values())
+        ahead = {node: hlc for node, hlc in marks.items() if hlc > floor}
+        query = (select(SyncRecord.collection, SyncRecord.key, SyncRecord.hlc, SyncRecord.node,
+                        SyncRecord.deleted, SyncRecord.payload)
+                 .where(SyncRecord.hlc > floor)
+                 .order_by(SyncRecord.hlc, SyncRecord.node)
+                 .limit(limit))
+        if ahead:
+            query = query.where(or_(SyncRecord.node.notin_(list(ahead)),
+                                    *[and_(SyncRecord.node == node, SyncRecord.hlc > hlc)
+                                      for node, hlc in ahead.items()]))
+        with self.engine.connect() as conn:
+            return [list(row) for row in conn.execute(query)]
+
+    def _current_versions(self, conn, changes: List[Change]) -> Dict[Tuple[str, str], Tuple[int, str]]:
+        keys = defaultdict(list)
+        for change in changes:
+            keys[change[0]].append(change[1])
+        versions = {}
+        for collection, names in keys.items():
+            for i in range(0, len(names), KEY_CHUNK):
+                rows = conn.execute(select(SyncRecord.key, SyncRecord.hlc, SyncRecord.node).where(
+                    SyncRecord.collection == collection, SyncRecord.key.in_(names[i:i + KEY_CHUNK])))
+                for key, hlc, node in rows:
+                    versions[(collection, key)] = (hlc, node)
+        return versions
+
+    def apply(self, changes: List[Change], state: Optional[Dict[str, str]] = None) -> List[Change]:
+        """Store remote changes that win against what we have; returns the winners"""
+        with self._lock:
+            vector = dict(self.vector)
+            winners = {}
+            with self.engine.begin() as conn:
+                current = self._current_versions(conn, changes) if changes else {}
+                for change in changes:
+                    collection, key, hlc, node = change[0], change[1], change[2], change[3]
+                    if hlc > vector.get(node, 0):
+                        vector[node] = hlc
+                    ident = (collection, key)
+                    if (hlc, node) > current.get(ident, (-1, "")):
+                        current[ident] = (hlc, node)
+                        winners[ident] = change
+                if winners:
+                    stmt = insert(SyncRecord.__table__)
+                    conn.execute(stmt.on_conflict_do_update(index_elements=['collection', 'key'], set_={
+                        name: stmt.excluded[name] for name in ('hlc', 'node', 'deleted', 'payload')}), [
+                        {'collection': c[0], 'key': c[1], 'hlc': c[2], 'node': c[3],
+                         'deleted': bool(c[4]), 'payload': c[5]}
+                        for c in winners.values()
+                    ])
+                    if self.on_apply:
+                        self.on_apply(conn, list(winners.values()))
+                set_state(conn, dict(state or {}, vector=json.dumps(vector)))
+            self.vector = vector
+            if vector:
+                self.clock.observe(max(vector.values()))
+            return list(winners.values())
+
+    def handle(self, request: Dict) -> Dict:
+        """Server side of one exchange: take the client's changes, return what it lacks"""
+        if request.get("protocol") != PROTOCOL_VERSION:
+            raise ValueError(f"Unsupported sync protocol: {request.get('protocol')}")
+        limit = min(int(request.get("limit") or PAGE_SIZE), MAX_PAGE_SIZE)
+        with self._lock:
+            accepted = self.apply(request.get("changes") or [])
+            changes = self.changes_since(request.get("vector") or {}, limit)
+            return {"node": self.node_id, "vector": self.vector, "changes": changes,
+                    "more": len(changes) >= limit, "accepted": len(accepted)}
+
+    def handle_bytes(self, data: bytes) -> bytes:
+        return encode(self.handle(decode(data)))
+
+    def sync(self, transport, peer: str = "server", limit: int = PAGE_SIZE) -> Dict:
+        """Exchange changes with ``peer`` until neither side has anything new"""
+        peer_key = f"peer:{peer}"
+        with self.engine.connect() as conn:
+            peer_vector = json.loads(get_state(conn, peer_key, "{}"))
+
+        stats = {"round_trips": 0, "sent": 0, "received": 0, "applied": 0, "bytes_sent": 0, "bytes_received": 0}
+        while True:
+            outgoing = self.changes_since(peer_vector, limit)
+            request = encode({"protocol": PROTOCOL_VERSION, "node": self.node_id, "vector": self.vector,
+                              "changes": outgoing, "limit": limit})
+            reply = transport.exchange(request)
+            response = decode(reply)
+            peer_vector = response["vector"]
+            applied = self.apply(response["changes"], state={peer_key: json.dumps(peer_vector)})
+
+            stats["round_trips"] += 1
+            stats["sent"] += len(outgoing)
+            stats["received"] += len(response["changes"])
+            stats["applied"] += len(applied)
+            stats["bytes_sent"] += len(request)
+            stats["bytes_received"] += len(reply)
+            if len(outgoing) < limit and not response["more"]:
+                return stats
+
+
+class LocalTransport:
+    """Talks to a Replica in the same process; used by tests and benchmarks"""
+
+    def __init__(self, replica: Replica):
+        self.replica = replica
+
+    def exchange(self, data: bytes) -> bytes:
+        return self.replica.handle_bytes(data)
@@ -0,0 +1,179 @@
+# server.py - Local sync server: a stand-in for a hosted sync backend
+"""
+Holds its own replica in a separate SQLite file and answers exchanges from
+any number of devices, so sync works on a home network with no external
+service.
+
+    python -m src.sync.server --port 8767 --db sync_server.db
+
+Devices POST a compressed exchange request (see src/sync/replica.py) to
+/sync and get the compressed response back. Set MOMAPP_API_TOKEN to
+require ``Authorization: Bearer <token>``, as with the local API; the
+server serves every user's sessions and preferences, so it refuses to
+bind anything but loopback without one.
+"""
+import argparse
+import http.client
+import os
+import sys
+import threading
+import zlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine
+
+from src.core.models import SyncRecord, SyncState
+from src.sync.replica import Replica
+from src.utils.helpers import is_loopback
+
+DEFAULT_PORT = 8767
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+CONTENT_TYPE = "application/json"
+
+
+def open_store(path: str):
+    """Engine for a standalone replica file, creating the sync tables if needed"""
+    store = create_engine(f"sqlite:///{path}", connect_args={"timeout": 15})
+    SyncRecord.metadata.create_all(store, tables=[SyncRecord.__table__, SyncState.__table__])
+    return store
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MomAppSync/1.0"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def reply(self, status, body=b"", encoding=None):
+        self.send_response(status)
+        self.send_header("Content-Type", CONTENT_TYPE if encoding else "text/plain")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # Nothing is read before the token and size checks; the unread body means the connection can't be reused
+        token = self.server.token
+        if token and self.headers.get("Authorization") != f"Bearer {token}":
+            self.close_connection = True
+            self.reply(HTTPStatus.UNAUTHORIZED, b"Missing or invalid sync token")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_REQUEST_BYTES:
+            self.close_connection = True
+            if length > 0:
+                self.reply(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, b"Request too large")
+            else:
+                self.reply(HTTPStatus.BAD_REQUEST, b"Invalid Content-Length")
+            return
+        body = self.rfile.read(length)
+        if urlsplit(self.path).path.rstrip("/") != "/sync":
+            self.reply(HTTPStatus.NOT_FOUND, b"No such endpoint")
+            return
+        try:
+            response = self.server.replica.handle_bytes(body)
+        except (ValueError, KeyError, TypeError, IndexError, zlib.error) as e:
+            self.reply(HTTPStatus.BAD_REQUEST, f"Bad sync request: {e}".encode("utf-8"))
+            return
+        self.reply(HTTPStatus.OK, response, encoding="deflate")
+
+
+class SyncServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, replica: Replica, host="127.0.0.1", port=DEFAULT_PORT, verbose=False, token=None):
+        token = token or os.environ.get("MOMAPP_API_TOKEN")
+        if not token and not is_loopback(host):
+            raise ValueError(f"A sync token is required to serve on {host}; set MOMAPP_API_TOKEN")
+        super().__init__((host, port), SyncHandler)
+        self.replica = replica
+        self.verbose = verbose
+        self.token = token
+
+    def start_background(self):
+        thread = threading.Thread(target=self.serve_forever, name="momapp-sync", daemon=True)
+        thread.start()
+        return thread
+
+
+class SyncError(Exception):
+    pass
+
+
+class HttpTransport:
+    """Client side: posts exchanges to a SyncServer over one keep-alive connection"""
+
+    def __init__(self, url: str, token: Optional[str] = None, timeout: float = 30.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or DEFAULT_PORT
+        self.path = (parts.path.rstrip("/") or "") + "/sync"
+        self.token = token if token is not None else os.environ.get("MOMAPP_API_TOKEN")
+        self.timeout = timeout
+        self.conn = None
+
+    def exchange(self, data: bytes) -> bytes:
+        headers = {"Content-Type": CONTENT_TYPE, "Content-Encoding": "deflate"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request("POST", self.path, body=data, headers=headers)
+                response = self.conn.getresponse()
+                body = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                # The server may have dropped an idle keep-alive connection; retry once on a fresh one
+                self.close()
+                if attempt:
+                    raise
+        if response.status != HTTPStatus.OK:
+            raise SyncError(f"Sync server returned {response.status}: {body.decode('utf-8', 'replace')}")
+        return body
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve MomApp sync for devices on this network")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: loopback only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default="sync_server.db", help="SQLite file holding the server's replica")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    try:
+        server = SyncServer(Replica(open_store(args.db)), args.host, args.port, args.verbose)
+    except (OSError, ValueError) as e:
+        print(f"Error starting sync server: {e}", file=sys.stderr)
+        return 1
+    print(f"Serving MomApp sync on http://{args.host}:{server.server_address[1]}/sync")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+# sources.py - Map sessions, preferences and user content onto sync records
+"""
+    collection     key                            value
+    sessions       <username>/<start_time ISO>    {"screen_time": min, "break_time": min}
+    preferences    <username>/<preference>        the preference's value
+    user_content   <username>/<section>           the section's list (tasks, notes, ...)
+
+People are identified by username, not user id: ids are assigned per
+database. Sessions never change once saved, so they are captured by id
+high-water mark and only ever added. Preferences and content sections are
+compared with the last synced value and put again only when they differ,
+which makes per-preference (not per-file) last-writer-wins the conflict
+rule. Remote sessions for users not registered on this device stay in the
+replica without being imported.
+
+The first time a device syncs a user it pulls before capturing anything,
+and whatever other devices already hold wins over the local values
+(adopt_remote), so a new device's defaults never overwrite real settings.
+Device-specific preferences (LOCAL_PREFERENCES) are never synced.
+"""
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, insert, select
+
+from src.core import rollups
+from src.core.database import engine
+from src.core.models import SessionRecord, User
+from src.sync.replica import Change, Replica, get_state, set_state
+
+SESSIONS = "sessions"
+PREFERENCES = "preferences"
+USER_CONTENT = "user_content"
+DOCUMENT_COLLECTIONS = (PREFERENCES, USER_CONTENT)
+SESSION_MARK = "capture:sessions"
+CAPTURE_BATCH = 5000
+# Settings that describe this machine rather than the person
+LOCAL_PREFERENCES = frozenset({
+    "local_api_host", "local_api_port", "local_api_token", "live_port", "sync_server", "sync_token", "sync_interval_minutes",
+    "tracking_daemon", "checkpoint_sync_seconds", "app_usage_sample_seconds",
+    "apply_brightness", "brightness_write_interval",
+})
+_MISSING = object()
+
+
+def _syncable(collection: str, name: str) -> bool:
+    return collection != PREFERENCES or name not in LOCAL_PREFERENCES
+
+
+def _seeded_mark(username: str) -> str:
+    return f"seeded:{username}"
+
+
+def is_seeded(replica: Replica, username: str) -> bool:
+    """Whether this device has already pulled the user's documents once"""
+    with replica.engine.connect() as conn:
+        return get_state(conn, _seeded_mark(username)) is not None
+
+
+def mark_seeded(replica: Replica, username: str):
+    with replica.engine.begin() as conn:
+        set_state(conn, {_seeded_mark(username): "1"})
+
+
+def adopt_remote(replica: Replica, collection: str, username: str, document: Dict) -> Dict:
+    """Copy of ``document`` where values the replica already holds win; used before the first capture"""
+    prefix = f"{username}/"
+    merged = dict(document)
+    for key, payload in replica.payloads(collection, prefix).items():
+        name = key[len(prefix):]
+        if _syncable(collection, name):
+            merged[name] = json.loads(payload)
+    return merged
+
+
+def session_key(username: str, start_time: datetime) -> str:
+    return f"{username}/{start_time.isoformat()}"
+
+
+def capture_sessions(replica: Replica) -> int:
+    """Put sessions saved since the last capture; returns how many were new"""
+    with replica.engine.connect() as conn:
+        mark = int(get_state(conn, SESSION_MARK, 0))
+        last_id = conn.execute(select(func.max(SessionRecord.id))).scalar() or 0
+    captured = 0
+    while mark < last_id:
+        query = (select(SessionRecord.id, User.username, SessionRecord.start_time,
+                        SessionRecord.screen_time, SessionRecord.break_time)
+                 .join(User, User.id == SessionRecord.user_id)
+                 .where(SessionRecord.id > mark, SessionRecord.id <= last_id)
+                 .order_by(SessionRecord.id)
+                 .limit(CAPTURE_BATCH))
+        with replica.engine.connect() as conn:
+            rows = conn.execute(query).all()
+        if not rows:
+            break
+        mark = rows[-1].id
+        items = [(session_key(row.username, row.start_time),
+                  {"screen_time": row.screen_time or 0, "break_time": row.break_time or 0})
+                 for row in rows if row.start_time is not None]
+        # Imported sessions come back through here with keys we already hold
+        captured += replica.put_many(SESSIONS, items, only_new=True, state={SESSION_MARK: str(mark)})
+    return captured
+
+
+def capture_document(replica: Replica, collection: str, username: str, document: Dict) -> int:
+    """Put the entries of ``document`` that changed since they were last synced"""
+    prefix = f"{username}/"
+    synced = replica.payloads(collection, prefix)
+    items = []
+    for name, value in document.items():
+        key = prefix + name
+        if _syncable(collection, name) and synced.get(key) != json.dumps(value, sort_keys=True):
+            items.append((key, value))
+    items.extend((key, None) for key in synced
+                 if key[len(prefix):] not in document and _syncable(collection, key[len(prefix):]))
+    return replica.put_many(collection, items)
+
+
+def sync_documents(replica: Replica, transport, username: str, preferences: Dict, user_content: Dict) -> Dict:
+    """Capture the user's preferences and content and sync; pulls first on this device's first sync"""
+    pulled = None
+    if not is_seeded(replica, username):
+        # Take what other devices already have before offering anything
+        pulled = replica.sync(transport)
+        preferences = adopt_remote(replica, PREFERENCES, username, preferences)
+        user_content = adopt_remote(replica, USER_CONTENT, username, user_content)
+        mark_seeded(replica, username)
+    capture_document(replica, PREFERENCES, username, preferences)
+    capture_document(replica, USER_CONTENT, username, user_content)
+    stats = replica.sync(transport)
+    for name, value in (pulled or {}).items():
+        stats[name] += value
+    return stats
+
+
+def import_sessions(conn, changes: List[Change]) -> int:
+    """Replica on_apply hook: add remote sessions to the sessions table and rollups"""
+    sessions = []
+    for collection, key, _, _, deleted, payload in changes:
+        if collection == SESSIONS and not deleted:
+            username, _, start = key.rpartition("/")
+            sessions.append((username, datetime.fromisoformat(start), json.loads(payload)))
+    if not sessions:
+        return 0
+
+    user_ids = dict(conn.execute(select(User.username, User.id).where(
+        User.username.in_({username for username, _, _ in sessions}))).all())
+    existing = set(conn.execute(select(SessionRecord.user_id, SessionRecord.start_time).where(
+        SessionRecord.user_id.in_(user_ids.values()))).all()) if user_ids else set()
+
+    rows = []
+    for username, start, value in sessions:
+        user_id = user_ids.get(username)
+        if user_id is not None and (user_id, start) not in existing:
+            existing.add((user_id, start))
+            rows.append({"user_id": user_id, "start_time": start,
+                         "screen_time": value["screen_time"], "break_time": value["break_time"]})
+    if rows:
+        conn.execute(insert(SessionRecord), rows)
+        rollups.apply_deltas(conn, *rollups.session_deltas(
+            (r["user_id"], r["start_time"], r["screen_time"], r["break_time"]) for r in rows))
+    return len(rows)
+
+
+def merge_document(document: Dict, collection: str, username: str, changes: List[Change],
+                   base: Optional[Dict] = None) -> bool:
+    """Fold remote changes to one user's preferences or content into ``document``
+
+    ``base`` is the copy of the document that was captured for the sync;
+    entries edited locally since then are left alone and go out with the
+    next capture instead of being overwritten.
+    """
+    prefix = f"{username}/"
+    changed = False
+    for change_collection, key, _, _, deleted, payload in changes:
+        if change_collection != collection or not key.startswith(prefix):
+            continue
+        name = key[len(prefix):]
+        if not _syncable(collection, name):
+            continue
+        if base is not None and document.get(name, _MISSING) != base.get(name, _MISSING):
+            continue
+        if deleted:
+            changed |= document.pop(name, None) is not None
+        else:
+            document[name] = json.loads(payload)
+            changed = True
+    return changed
+
+
+def open_replica(on_apply=import_sessions) -> Replica:
+    """The desktop app's replica, stored alongside its data in app.db"""
+    return Replica(engine, on_apply=on_apply)
@@ -0,0 +1,61 @@
+# fonts.py - Resolve and cache application fonts
+import os
+import sys
+
+from PyQt5.QtGui import QFont, QFontDatabase
+
+FONTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                         "resources", "fonts")
+
+CLOCK_FONT_FAMILY = "MODERN WARFARE"
+
+# Tried in order when a requested family isn't installed or bundled
+FALLBACK_FAMILIES = ["DejaVu Sans Mono", "Consolas", "Menlo", "Liberation Mono", "Monospace"]
+
+_bundled_registered = False
+_resolved_families = {}  # requested family (lowercase) -> installed family
+_font_cache = {}  # (requested family, point size) -> QFont
+font_fallbacks = {}  # requested family -> fallback actually used
+
+
+def register_bundled_fonts():
+    """Register every font file in resources/fonts once per process"""
+    global _bundled_registered
+    if _bundled_registered:
+        return
+    _bundled_registered = True
+    if not os.path.isdir(FONTS_DIR):
+        return
+    for name in sorted(os.listdir(FONTS_DIR)):
+        if name.lower().endswith((".ttf", ".otf")):
+            if QFontDatabase.addApplicationFont(os.path.join(FONTS_DIR, name)) == -1:
+                print(f"Could not load bundled font: {name}", file=sys.stderr)
+
+
+def resolve_family(family):
+    """Return an installed family for ``family``, falling back if needed"""
+    key = family.lower()
+    if key in _resolved_families:
+        return _resolved_families[key]
+
+    register_bundled_fonts()
+    installed = {f.lower(): f for f in QFontDatabase().families()}
+    resolved = installed.get(key)
+    if resolved is None:
+        resolved = next((installed[f.lower()] for f in FALLBACK_FAMILIES if f.lower() in installed),
+                        QFont().defaultFamily())
+        font_fallbacks[family] = resolved
+        print(f"Font '{family}' not available, using '{resolved}'", file=sys.stderr)
+
+    _resolved_families[key] = resolved
+    return resolved
+
+
+def get_font(family=CLOCK_FONT_FAMILY, size=30):
+    """Return a QFont for an already-resolved family (copied, safe to modify)"""
+    key = (family.lower(), size)
+    font = _font_cache.get(key)
+    if font is None:
+        font = QFont(resolve_family(family), size)
+        _font_cache[key] = font
+    return QFont(font)
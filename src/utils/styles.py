@@ -1,12 +1,13 @@
 from PyQt5.QtCore import QFile, QTextStream
 
 def load_stylesheet():
-    file = QFile(":/qss/dark.qss")
+    # resources.qrc registers files under their repo path with prefix "/"
+    file = QFile(":/resources/qss/dark.qss")
     if not file.exists():
         print("Stylesheet file not found!")
         return ""
     
-    if file.open(QFile.ReadOnly | QTextStream.Text):
+    if file.open(QFile.ReadOnly | QFile.Text):
         stream = QTextStream(file)
         stylesheet = stream.readAll()
         file.close()